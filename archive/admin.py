@@ -0,0 +1,62 @@
+"""
+Admin configuration for archive application.
+"""
+
+from django.contrib import admin
+from legal_processes.admin_list import LargeTableAdminMixin
+from .models import ArchivedParty, ArchivedProcess
+
+
+class ReadOnlyAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """Archived rows are only changed by the ``archive_processes`` command."""
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedProcess)
+class ArchivedProcessAdmin(ReadOnlyAdmin):
+    """Admin for archived processes."""
+
+    list_display = [
+        'process_number',
+        'status',
+        'action_value',
+        'distribution_date',
+        'archived_at',
+    ]
+
+    search_fields = [
+        'process_number',
+    ]
+
+    date_hierarchy = 'archived_at'
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_lookups()
+
+
+@admin.register(ArchivedParty)
+class ArchivedPartyAdmin(ReadOnlyAdmin):
+    """Admin for archived parties."""
+
+    list_display = [
+        'name',
+        'category',
+        'process',
+        'archived_at',
+    ]
+
+    search_fields = [
+        'name',
+        'process__process_number',
+    ]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('process', 'person')
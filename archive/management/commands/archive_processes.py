@@ -0,0 +1,66 @@
+"""
+Management command to move archived processes out of the live tables.
+"""
+
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from archive.models import ArchivedProcess
+from archive.services import BATCH_SIZE, archive_processes, restore_batch
+
+
+class Command(BaseCommand):
+    """Command to move archived processes and their parties to the archive."""
+
+    help = 'Move processes with status "archived" and their parties to the archive tables'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f'Processes moved per transaction (default: {BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            metavar='DAYS',
+            help='Only move processes not updated in the last DAYS days'
+        )
+        parser.add_argument(
+            '--restore',
+            nargs='+',
+            metavar='PROCESS_NUMBER',
+            help='Move these processes back from the archive instead'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command execution."""
+        if options['restore']:
+            self.restore(options['restore'])
+            return
+
+        updated_before = None
+        if options['older_than'] is not None:
+            updated_before = timezone.now() - datetime.timedelta(days=options['older_than'])
+
+        moved = archive_processes(
+            batch_size=options['batch_size'],
+            updated_before=updated_before,
+            progress=lambda total: self.stdout.write(f'{total} processes archived...'),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Archived {moved} processes'))
+
+    def restore(self, numbers):
+        """Move the given processes back to the live tables."""
+        ids = list(
+            ArchivedProcess.objects.filter(process_number__in=numbers)
+            .values_list('pk', flat=True)
+        )
+        if not ids:
+            raise CommandError('No archived process with these numbers')
+        moved = restore_batch(ids)
+        self.stdout.write(self.style.SUCCESS(f'Restored {moved} processes'))
@@ -0,0 +1,115 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:02
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.deletion
+
+PARTITION_TABLES = '''
+DROP TABLE archive_archivedparty;
+DROP TABLE archive_archivedprocess;
+CREATE TABLE archive_archivedprocess (
+    id bigint NOT NULL,
+    process_number varchar(50) NOT NULL,
+    status varchar(20) NOT NULL,
+    process_type varchar(20) NOT NULL,
+    process_class_ref_id bigint NULL REFERENCES processes_processclass (id),
+    subject_ref_id bigint NULL REFERENCES processes_subject (id),
+    judge_ref_id bigint NULL REFERENCES processes_judge (id),
+    court_ref_id bigint NULL REFERENCES processes_court (id),
+    jurisdiction_ref_id bigint NULL REFERENCES processes_jurisdiction (id),
+    district_ref_id bigint NULL REFERENCES processes_district (id),
+    action_value numeric(15, 2) NOT NULL,
+    distribution_date date NULL,
+    created_at timestamp with time zone NOT NULL,
+    updated_at timestamp with time zone NOT NULL,
+    archived_at timestamp with time zone NOT NULL,
+    PRIMARY KEY (id, archived_at)
+) PARTITION BY RANGE (archived_at);
+CREATE TABLE archive_archivedprocess_default PARTITION OF archive_archivedprocess DEFAULT;
+CREATE INDEX archive_archivedprocess_id ON archive_archivedprocess (id);
+CREATE INDEX archive_archivedprocess_number ON archive_archivedprocess (process_number);
+CREATE INDEX archive_archivedprocess_created_at ON archive_archivedprocess (created_at);
+CREATE TABLE archive_archivedparty (
+    id bigint NOT NULL,
+    name varchar(200) NOT NULL,
+    person_id bigint NOT NULL REFERENCES parties_person (id),
+    category varchar(20) NOT NULL,
+    email varchar(254) NOT NULL,
+    phone varchar(20) NOT NULL,
+    process_id bigint NOT NULL,
+    created_at timestamp with time zone NOT NULL,
+    updated_at timestamp with time zone NOT NULL,
+    archived_at timestamp with time zone NOT NULL,
+    PRIMARY KEY (id, archived_at)
+) PARTITION BY RANGE (archived_at);
+CREATE TABLE archive_archivedparty_default PARTITION OF archive_archivedparty DEFAULT;
+CREATE INDEX archive_archivedparty_id ON archive_archivedparty (id);
+CREATE INDEX archive_archivedparty_person ON archive_archivedparty (person_id);
+CREATE INDEX archive_archivedparty_process ON archive_archivedparty (process_id);
+'''
+
+
+def partition_tables(apps, schema_editor):
+    """Range-partition the archive tables by year of ``archived_at`` (PostgreSQL)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(PARTITION_TABLES)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('parties', '0005_person_document_type'),
+        ('processes', '0004_remove_process_text_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedProcess',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('process_number', models.CharField(db_index=True, max_length=50)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('suspended', 'Suspended'), ('archived', 'Archived')], max_length=20)),
+                ('process_type', models.CharField(choices=[('digital', 'Digital'), ('physical', 'Physical')], max_length=20)),
+                ('action_value', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=15)),
+                ('distribution_date', models.DateField(null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(help_text='When the process was moved to the archive')),
+                ('court_ref', models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_processes', to='processes.court')),
+                ('district_ref', models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_processes', to='processes.district')),
+                ('judge_ref', models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_processes', to='processes.judge')),
+                ('jurisdiction_ref', models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_processes', to='processes.jurisdiction')),
+                ('process_class_ref', models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_processes', to='processes.processclass')),
+                ('subject_ref', models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_processes', to='processes.subject')),
+            ],
+            options={
+                'verbose_name': 'Archived process',
+                'verbose_name_plural': 'Archived processes',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedParty',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=200)),
+                ('category', models.CharField(choices=[('EXEQUENTE', 'Exequente'), ('EXECUTADA', 'Executada'), ('REQUERENTE', 'Requerente'), ('REQUERIDO', 'Requerido'), ('AUTOR', 'Autor'), ('RÉU', 'Réu'), ('TERCEIRO', 'Terceiro')], max_length=20)),
+                ('email', models.EmailField(blank=True, max_length=254)),
+                ('phone', models.CharField(blank=True, max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField()),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_parties', to='parties.person')),
+                ('process', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='parties', to='archive.archivedprocess')),
+            ],
+            options={
+                'verbose_name': 'Archived party',
+                'verbose_name_plural': 'Archived parties',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.RunPython(partition_tables, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:24
+
+from django.db import migrations, models
+
+from processes.cnj import CNJNumber, parse
+
+BATCH_SIZE = 1000
+COLUMNS = [f'cnj_{name}' for name in CNJNumber._fields] + ['cnj_valid']
+
+
+def parse_numbers(apps, schema_editor):
+    """Fill the number parts of the existing rows."""
+    ArchivedProcess = apps.get_model('archive', 'ArchivedProcess')
+    batch = []
+    rows = ArchivedProcess.objects.order_by().only('process_number')
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        parts = parse(row.process_number)
+        for name in CNJNumber._fields:
+            setattr(row, f'cnj_{name}', getattr(parts, name) if parts else None)
+        row.cnj_valid = bool(parts and parts.is_valid)
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            ArchivedProcess.objects.bulk_update(batch, COLUMNS)
+            batch = []
+    ArchivedProcess.objects.bulk_update(batch, COLUMNS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archive', '0001_initial'),
+        ('processes', '0006_cnj_number_parts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedprocess',
+            name='cnj_check_digits',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedprocess',
+            name='cnj_origin',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedprocess',
+            name='cnj_segment',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedprocess',
+            name='cnj_sequence',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedprocess',
+            name='cnj_tribunal',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedprocess',
+            name='cnj_valid',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='archivedprocess',
+            name='cnj_year',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.RunPython(parse_numbers, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='archivedprocess',
+            index=models.Index(fields=['cnj_year', 'cnj_tribunal', 'cnj_segment'], name='archived_process_cnj_year_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:02
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_last_activity(apps, schema_editor):
+    """Archived rows take their last update as last activity."""
+    ArchivedProcess = apps.get_model('archive', 'ArchivedProcess')
+    ArchivedProcess.objects.update(last_activity_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archive', '0002_cnj_number_parts'),
+        ('processes', '0007_last_activity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedprocess',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_last_activity, migrations.RunPython.noop),
+    ]
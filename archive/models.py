@@ -0,0 +1,189 @@
+"""
+Models for archive application.
+
+Archived processes are moved here, with their parties, by the
+``archive_processes`` command. The rows keep their original ids, so
+links and change history stay valid, and the columns mirror the live
+tables so rows can be copied with ``INSERT ... SELECT``. On PostgreSQL
+both tables are partitioned by year of ``archived_at``.
+"""
+
+from decimal import Decimal
+
+from django.db import models
+
+from legal_processes.formatting import format_currency
+from parties.models import Party
+from processes.models import Process, lookup_name
+
+
+class ArchivedProcessQuerySet(models.QuerySet):
+    """QuerySet for archived processes."""
+
+    def with_lookups(self):
+        """Join the lookup tables needed to display the plain names."""
+        return self.select_related(
+            *(f'{field}_ref' for field in Process.LOOKUP_FIELDS)
+        )
+
+
+class ArchivedProcess(models.Model):
+    """
+    A process moved out of the live table.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    process_number = models.CharField(max_length=50, db_index=True)
+    cnj_sequence = models.PositiveIntegerField(null=True)
+    cnj_check_digits = models.PositiveSmallIntegerField(null=True)
+    cnj_year = models.PositiveSmallIntegerField(null=True)
+    cnj_segment = models.PositiveSmallIntegerField(null=True)
+    cnj_tribunal = models.PositiveSmallIntegerField(null=True)
+    cnj_origin = models.PositiveSmallIntegerField(null=True)
+    cnj_valid = models.BooleanField(default=False)
+    status = models.CharField(
+        max_length=20,
+        choices=Process.PROCESS_STATUS_CHOICES,
+    )
+    process_type = models.CharField(
+        max_length=20,
+        choices=Process.PROCESS_TYPE_CHOICES,
+    )
+
+    process_class_ref = models.ForeignKey(
+        'processes.ProcessClass',
+        on_delete=models.PROTECT,
+        null=True,
+        related_name='archived_processes',
+    )
+    subject_ref = models.ForeignKey(
+        'processes.Subject',
+        on_delete=models.PROTECT,
+        null=True,
+        related_name='archived_processes',
+    )
+    judge_ref = models.ForeignKey(
+        'processes.Judge',
+        on_delete=models.PROTECT,
+        null=True,
+        related_name='archived_processes',
+    )
+    court_ref = models.ForeignKey(
+        'processes.Court',
+        on_delete=models.PROTECT,
+        null=True,
+        related_name='archived_processes',
+    )
+    jurisdiction_ref = models.ForeignKey(
+        'processes.Jurisdiction',
+        on_delete=models.PROTECT,
+        null=True,
+        related_name='archived_processes',
+    )
+    district_ref = models.ForeignKey(
+        'processes.District',
+        on_delete=models.PROTECT,
+        null=True,
+        related_name='archived_processes',
+    )
+
+    action_value = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        default=Decimal('0.00'),
+    )
+    distribution_date = models.DateField(null=True)
+
+    # Metadata
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    last_activity_at = models.DateTimeField()
+    archived_at = models.DateTimeField(
+        help_text="When the process was moved to the archive"
+    )
+
+    objects = ArchivedProcessQuerySet.as_manager()
+
+    process_class = lookup_name('process_class')
+    subject = lookup_name('subject')
+    judge = lookup_name('judge')
+    court = lookup_name('court')
+    jurisdiction = lookup_name('jurisdiction')
+    district = lookup_name('district')
+
+    # Rows of the archive are read-only in the site.
+    is_archived = True
+
+    class Meta:
+        verbose_name = "Archived process"
+        verbose_name_plural = "Archived processes"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['cnj_year', 'cnj_tribunal', 'cnj_segment'],
+                name='archived_process_cnj_year_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.process_number} - {self.process_class}"
+
+    @property
+    def formatted_action_value(self):
+        """Return formatted action value."""
+        return format_currency(self.action_value)
+
+
+class ArchivedParty(models.Model):
+    """
+    A party of an archived process.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=200)
+    person = models.ForeignKey(
+        'parties.Person',
+        on_delete=models.PROTECT,
+        related_name='archived_parties',
+    )
+    category = models.CharField(
+        max_length=20,
+        choices=Party.PARTY_CATEGORY_CHOICES,
+    )
+    email = models.EmailField(blank=True)
+    phone = models.CharField(max_length=20, blank=True)
+    process = models.ForeignKey(
+        ArchivedProcess,
+        on_delete=models.CASCADE,
+        related_name='parties',
+        # Partitioned tables cannot be referenced by ``id`` alone.
+        db_constraint=False,
+    )
+
+    # Metadata
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+
+    is_archived = True
+
+    class Meta:
+        verbose_name = "Archived party"
+        verbose_name_plural = "Archived parties"
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name} ({self.category})"
+
+    @property
+    def document(self):
+        """Return the person's document."""
+        return self.person.document
+
+    @property
+    def is_individual(self):
+        """Check if party is an individual (CPF) or company (CNPJ)."""
+        return self.person.is_individual
+
+    @property
+    def formatted_document(self):
+        """Return the person's formatted document."""
+        return self.person.formatted_document
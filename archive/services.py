@@ -0,0 +1,123 @@
+"""
+Moving archived processes between the live tables and the archive.
+
+Processes are moved in batches of ids taken in primary key order; each
+batch is one short transaction that copies the process and party rows
+with ``INSERT ... SELECT`` and removes them from the source table. The
+rows are moved, not deleted: change log and report summaries still
+count them, so no model signals are sent. The change feed gets an
+``archive`` event per process, and ``restore`` events for the rows
+that come back.
+"""
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from feed.models import FeedEvent
+from feed.services import record, record_removed
+
+from legal_processes.partitions import RangePartitions
+from parties.models import Party
+from processes.models import Process
+
+from .models import ArchivedParty, ArchivedProcess
+
+BATCH_SIZE = 1000
+
+# Yearly partitions on ``archived_at`` (PostgreSQL only).
+PARTITIONS = [
+    RangePartitions(ArchivedProcess._meta.db_table, 'archived_at', months=12),
+    RangePartitions(ArchivedParty._meta.db_table, 'archived_at', months=12),
+]
+
+
+def copied_columns(source, target):
+    """Return the columns of ``source`` that ``target`` stores as well."""
+    target_columns = {field.column for field in target._meta.concrete_fields}
+    return [
+        field.column for field in source._meta.concrete_fields
+        if field.column in target_columns
+    ]
+
+
+def _move(source, target, column, ids, extra=None):
+    """Copy the ``source`` rows whose ``column`` is in ``ids`` and delete them."""
+    qn = connection.ops.quote_name
+    columns = ', '.join(qn(name) for name in copied_columns(source, target))
+    extra = extra or {}
+    target_columns = ''.join(f', {qn(name)}' for name in extra)
+    values = ''.join(', %s' for _ in extra)
+    placeholders = ', '.join(['%s'] * len(ids))
+    source_table = qn(source._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {qn(target._meta.db_table)} ({columns}{target_columns}) '
+            f'SELECT {columns}{values} FROM {source_table} '
+            f'WHERE {qn(column)} IN ({placeholders})',
+            [*extra.values(), *ids],
+        )
+        cursor.execute(
+            f'DELETE FROM {source_table} WHERE {qn(column)} IN ({placeholders})',
+            ids,
+        )
+        return cursor.rowcount
+
+
+def archive_batch(ids):
+    """Move the processes ``ids`` and their parties to the archive."""
+    archived_at = timezone.now()
+    with transaction.atomic():
+        _move(Party, ArchivedParty, 'process_id', ids, {'archived_at': archived_at})
+        record_removed(Process, ids, FeedEvent.ARCHIVE)
+        return _move(Process, ArchivedProcess, 'id', ids, {'archived_at': archived_at})
+
+
+def restore_batch(ids):
+    """Move the archived processes ``ids`` and their parties back."""
+    with transaction.atomic():
+        moved = _move(ArchivedProcess, Process, 'id', ids)
+        _move(ArchivedParty, Party, 'process_id', ids)
+        # Back in the live table: delta exports should send it again.
+        Process.objects.filter(pk__in=ids).touch()
+        record(Process, FeedEvent.RESTORE, ids)
+        record(
+            Party, FeedEvent.RESTORE,
+            list(Party.objects.filter(process_id__in=ids).values_list('pk', flat=True)),
+        )
+        return moved
+
+
+def archive_processes(batch_size=BATCH_SIZE, updated_before=None, progress=None):
+    """
+    Move every archived process to the archive, ``batch_size`` at a time.
+
+    Only processes not updated since ``updated_before`` are moved when
+    given. ``progress`` is called with the running total after each
+    batch. Returns the number of processes moved.
+    """
+    for partitions in PARTITIONS:
+        partitions.ensure(ahead=1)
+
+    candidates = Process.objects.filter(status='archived')
+    if updated_before is not None:
+        candidates = candidates.filter(updated_at__lt=updated_before)
+
+    last_id = 0
+    total = 0
+    while True:
+        with transaction.atomic():
+            # Lock the batch so that a concurrent edit cannot un-archive
+            # a process between the selection and the move.
+            ids = list(
+                candidates.select_for_update()
+                .filter(pk__gt=last_id)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            total += archive_batch(ids)
+        last_id = ids[-1]
+        if progress is not None:
+            progress(total)
+    return total
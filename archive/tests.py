@@ -0,0 +1,255 @@
+"""
+Tests for archive application.
+"""
+
+import datetime
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from legal_processes.listing import ChainedResults
+from legal_processes.partitions import RangePartitions
+from parties.models import Party
+from processes.models import Process
+from reports.models import ProcessSummary
+from reports.services import rebuild_summaries
+from .models import ArchivedParty, ArchivedProcess
+from .services import (
+    PARTITIONS, archive_batch, archive_processes, copied_columns, restore_batch,
+)
+
+
+def create_process(number, status='archived'):
+    """Create a process with one party."""
+    process = Process.objects.create( # type: ignore
+        process_number=number,
+        status=status,
+        process_class='Execução de Título Extrajudicial',
+        subject='Locação de Imóvel',
+        judge='Mariana',
+        action_value=Decimal('100.00'),
+    )
+    Party.objects.create( # type: ignore
+        name='Eduardo Amoroso', document='564.406.360-73',
+        category='EXEQUENTE', process=process,
+    )
+    return process
+
+
+class ArchiveProcessesTest(TestCase):
+    """Test cases for moving processes to the archive."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        cls.archived = [
+            create_process(f'100{i}030-81.2016.0.00.0008') for i in range(5)
+        ]
+        cls.active = create_process('987654-32.2023.8.26.0001', status='active')
+
+    def test_archive_moves_processes_and_parties_in_batches(self):
+        """Test archived processes leave the live tables with their parties."""
+        totals = []
+        moved = archive_processes(batch_size=2, progress=totals.append)
+
+        self.assertEqual(moved, 5)
+        self.assertEqual(totals, [2, 4, 5])
+        self.assertEqual(list(Process.objects.all()), [self.active])
+        self.assertEqual(Party.objects.count(), 1)
+        self.assertEqual(
+            sorted(ArchivedProcess.objects.values_list('pk', flat=True)),
+            sorted(process.pk for process in self.archived),
+        )
+        archived = ArchivedProcess.objects.with_lookups().get(pk=self.archived[0].pk)
+        self.assertEqual(archived.judge, 'Mariana')
+        self.assertEqual(archived.process_number, self.archived[0].process_number)
+        self.assertEqual(archived.parties.get().document, '564.406.360-73')
+        self.assertEqual(ArchivedParty.objects.count(), 5)
+
+    def test_restore_moves_process_back(self):
+        """Test a restored process is live again with its parties."""
+        archive_processes()
+        pk = self.archived[0].pk
+        self.assertEqual(restore_batch([pk]), 1)
+
+        process = Process.objects.get(pk=pk)
+        self.assertEqual(process.parties.count(), 1)
+        # Sent again by delta exports.
+        self.assertGreater(process.last_activity_at, process.updated_at)
+        self.assertFalse(ArchivedProcess.objects.filter(pk=pk).exists())
+        self.assertFalse(ArchivedParty.objects.filter(process_id=pk).exists())
+
+    def test_archive_keeps_report_totals(self):
+        """Test archived processes are still counted by a rebuild."""
+        rebuild_summaries()
+        before = ProcessSummary.objects.get(dimension='status', key='archived')
+        archive_processes()
+        rebuild_summaries()
+        after = ProcessSummary.objects.get(dimension='status', key='archived')
+        self.assertEqual(after.process_count, before.process_count)
+
+    def test_command(self):
+        """Test the management command."""
+        out = StringIO()
+        call_command('archive_processes', '--batch-size', '10', stdout=out)
+        self.assertIn('Archived 5 processes', out.getvalue())
+
+        call_command(
+            'archive_processes', '--restore', self.archived[1].process_number,
+            stdout=out,
+        )
+        self.assertIn('Restored 1 processes', out.getvalue())
+        self.assertTrue(Process.objects.filter(pk=self.archived[1].pk).exists())
+
+    def test_archive_mirrors_live_columns(self):
+        """Test every live column has a place in the archive."""
+        for source, target in ((Process, ArchivedProcess), (Party, ArchivedParty)):
+            self.assertEqual(
+                len(copied_columns(source, target)),
+                len(source._meta.concrete_fields),
+            )
+
+
+class ArchivePartitionsTest(TestCase):
+    """Test cases for the yearly partitions of the archive."""
+
+    def test_new_period_takes_rows_from_default_partition(self):
+        """Test a period holding rows in the default partition is still created."""
+        executed = []
+        cursor = mock.MagicMock()
+        cursor.execute.side_effect = lambda sql, params=None: executed.append(sql)
+        # The partition does not exist; the default holds rows of its year.
+        cursor.fetchone.side_effect = [(None,), (True,)]
+        postgresql = mock.MagicMock(vendor='postgresql')
+        postgresql.cursor.return_value.__enter__.return_value = cursor
+        partitions = RangePartitions('archive_archivedprocess', 'archived_at', months=12)
+
+        with mock.patch('legal_processes.partitions.transaction.atomic'):
+            created = partitions.ensure(
+                ahead=0, today=datetime.date(2026, 5, 1), connection=postgresql
+            )
+
+        self.assertEqual(created, ['archive_archivedprocess_p2026'])
+        statements = [sql.split(' PARTITION')[0] for sql in executed[2:]]
+        self.assertEqual(statements, [
+            'SELECT EXISTS (SELECT 1 FROM archive_archivedprocess_default WHERE archived_at >= %s AND archived_at < %s)',
+            'ALTER TABLE archive_archivedprocess DETACH',
+            'ALTER TABLE archive_archivedprocess_default RENAME TO archive_archivedprocess_default_old',
+            'CREATE TABLE archive_archivedprocess_default',
+            'CREATE TABLE archive_archivedprocess_p2026',
+            'INSERT INTO archive_archivedprocess SELECT * FROM archive_archivedprocess_default_old',
+            'DROP TABLE archive_archivedprocess_default_old',
+        ])
+
+    @skipUnless(connection.vendor == 'postgresql', 'partitions need PostgreSQL')
+    def test_archive_into_period_without_partition(self):
+        """Test archiving works when earlier rows of the year sit in the default."""
+        stray, *rest = [
+            create_process(f'100{i}030-81.2016.0.00.0008') for i in range(3)
+        ]
+        names = [partitions.name(partitions.start(timezone.now())) for partitions in PARTITIONS]
+        with connection.cursor() as cursor:
+            for name in names:
+                cursor.execute(f'DROP TABLE IF EXISTS {name}')
+        # Archived before the year had a partition: lands in the default.
+        archive_batch([stray.pk])
+
+        self.assertEqual(archive_processes(), 2)
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM {names[0]}')
+            self.assertEqual(cursor.fetchone()[0], 3)
+            cursor.execute(f'SELECT count(*) FROM {PARTITIONS[0].default}')
+            self.assertEqual(cursor.fetchone()[0], 0)
+        self.assertEqual(ArchivedParty.objects.count(), 3)
+
+
+class ArchiveViewsTest(TestCase):
+    """Test cases for archived processes in the site."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        User.objects.create_superuser(username='admin', password='testpass123')
+        cls.archived = create_process('1004030-81.2016.0.00.0008')
+        cls.active = create_process('987654-32.2023.8.26.0001', status='active')
+        archive_processes()
+
+    def setUp(self):
+        """Log in the test user."""
+        self.client.login(username='admin', password='testpass123')
+
+    def test_list_hides_archive_by_default(self):
+        """Test the list only reads the live table unless asked."""
+        response = self.client.get(reverse('processes:process_list'))
+        self.assertContains(response, self.active.process_number)
+        self.assertNotContains(response, self.archived.process_number)
+
+        response = self.client.get(
+            reverse('processes:process_list'), {'include_archived': '1'}
+        )
+        self.assertContains(response, self.active.process_number)
+        self.assertContains(response, self.archived.process_number)
+        self.assertContains(
+            response,
+            reverse('archive:archived_process_detail', args=[self.archived.pk]),
+        )
+
+    def test_chained_results_pages_across_tables(self):
+        """Test slicing the live rows followed by the archived ones."""
+        results = ChainedResults(
+            Process.objects.order_by('pk'), ArchivedProcess.objects.order_by('pk')
+        )
+        self.assertEqual(results.count(), 2)
+        self.assertEqual(
+            [row.process_number for row in results[0:2]],
+            [self.active.process_number, self.archived.process_number],
+        )
+        self.assertEqual(results[1].pk, self.archived.pk)
+        self.assertEqual(results[2:5], [])
+
+    def test_search_includes_archive(self):
+        """Test searching the archive."""
+        response = self.client.get(
+            reverse('processes:process_list'),
+            {'search': '1004030', 'include_archived': '1'},
+        )
+        self.assertContains(response, self.archived.process_number)
+        self.assertNotContains(response, self.active.process_number)
+
+    def test_party_list_includes_archive(self):
+        """Test archived parties are listed, and searched, only when asked."""
+        url = reverse('parties:party_list')
+        response = self.client.get(url, {'search': '1004030'})
+        self.assertNotContains(response, self.archived.process_number)
+
+        response = self.client.get(url, {'search': '1004030', 'include_archived': '1'})
+        self.assertContains(response, self.archived.process_number)
+        self.assertNotContains(response, self.active.process_number)
+        self.assertContains(
+            response,
+            reverse('archive:archived_process_detail', args=[self.archived.pk]),
+        )
+
+        response = self.client.get(url, {'include_archived': '1'})
+        self.assertEqual(len(response.context['page_obj']), 2)
+        self.assertEqual(
+            [party.is_archived for party in response.context['page_obj']],
+            [False, True],
+        )
+
+    def test_detail_redirects_to_archive(self):
+        """Test the live detail page of an archived process redirects."""
+        url = reverse('archive:archived_process_detail', args=[self.archived.pk])
+        response = self.client.get(
+            reverse('processes:process_detail', args=[self.archived.pk])
+        )
+        self.assertRedirects(response, url)
+
+        response = self.client.get(url)
+        self.assertContains(response, self.archived.process_number)
+        self.assertContains(response, 'Eduardo Amoroso')
@@ -0,0 +1,12 @@
+"""
+URL configuration for archive app.
+"""
+
+from django.urls import path
+from . import views
+
+app_name = 'archive'
+
+urlpatterns = [
+    path('processes/<int:pk>/', views.archived_process_detail, name='archived_process_detail'),
+]
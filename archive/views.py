@@ -0,0 +1,25 @@
+"""
+Views for archive application.
+"""
+
+from django.contrib.auth.decorators import login_required, permission_required
+from django.shortcuts import get_object_or_404, render
+
+from audit.services import ROOT_TYPE, history
+
+from .models import ArchivedProcess
+
+
+@login_required
+@permission_required('processes.view_process', raise_exception=True)
+def archived_process_detail(request, pk):
+    """Display an archived process, read-only."""
+    process = get_object_or_404(ArchivedProcess.objects.with_lookups(), pk=pk)
+
+    context = {
+        'process': process,
+        'parties': process.parties.select_related('person'),
+        'history': history(process, object_type=ROOT_TYPE),
+    }
+
+    return render(request, 'archive/archived_process_detail.html', context)
@@ -0,0 +1,42 @@
+"""
+Admin configuration for audit application.
+"""
+
+from django.contrib import admin
+from legal_processes.admin_list import LargeTableAdminMixin
+from .models import ChangeLog
+
+
+@admin.register(ChangeLog)
+class ChangeLogAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """Read-only admin for the change log."""
+
+    list_display = [
+        'ts',
+        'object_type',
+        'object_id',
+        'username',
+        'source',
+    ]
+
+    list_filter = [
+        'source',
+    ]
+
+    search_fields = [
+        '=object_id',
+        'username',
+    ]
+
+    date_hierarchy = 'ts'
+
+    ordering = ['-ts']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
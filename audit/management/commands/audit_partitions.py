@@ -0,0 +1,46 @@
+"""
+Management command to maintain the monthly change log partitions.
+"""
+
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from audit.partitions import drop_partitions, ensure_partitions, is_partitioned
+
+
+class Command(BaseCommand):
+    """Command to create upcoming and drop expired change log partitions."""
+
+    help = 'Create the next monthly change log partitions and drop expired ones'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--ahead',
+            type=int,
+            default=3,
+            help='Months to create ahead of the current one (default: 3)'
+        )
+        parser.add_argument(
+            '--retain-months',
+            type=int,
+            help='Drop the partitions older than this many months'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command execution."""
+        if not is_partitioned():
+            self.stdout.write('The change log is only partitioned on PostgreSQL.')
+            return
+        created = ensure_partitions(options['ahead'])
+        self.stdout.write(self.style.SUCCESS(f'Partitions ready: {", ".join(created)}'))
+
+        if options['retain_months'] is not None:
+            today = datetime.date.today()
+            months = today.year * 12 + today.month - 1 - options['retain_months']
+            before = datetime.date(months // 12, months % 12 + 1, 1)
+            dropped = drop_partitions(before)
+            self.stdout.write(
+                self.style.SUCCESS(f'Dropped {len(dropped)} partition(s) before {before}')
+            )
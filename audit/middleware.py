@@ -0,0 +1,17 @@
+"""
+Middleware attributing logged changes to the requesting user.
+"""
+
+from .services import attribution
+
+
+class AuditMiddleware:
+    """Attribute the changes made while handling a request to its user."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        source = 'admin' if request.path.startswith('/admin/') else 'web'
+        with attribution(getattr(request, 'user', None), source):
+            return self.get_response(request)
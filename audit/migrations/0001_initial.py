@@ -0,0 +1,79 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:55
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.utils.timezone
+
+PARTITION_TABLE = '''
+DROP TABLE audit_changelog;
+CREATE TABLE audit_changelog (
+    id bigserial NOT NULL,
+    ts timestamp with time zone NOT NULL,
+    object_type varchar(50) NOT NULL,
+    object_id bigint NOT NULL,
+    changes jsonb NOT NULL,
+    user_id integer NULL,
+    username varchar(150) NOT NULL,
+    source varchar(50) NOT NULL,
+    PRIMARY KEY (id, ts)
+) PARTITION BY RANGE (ts);
+CREATE TABLE audit_changelog_default PARTITION OF audit_changelog DEFAULT;
+CREATE INDEX changelog_object_ts_idx ON audit_changelog (object_type, object_id, ts);
+CREATE FUNCTION audit_changelog_append_only() RETURNS trigger AS $$
+BEGIN
+    RAISE EXCEPTION 'audit_changelog is append-only';
+END;
+$$ LANGUAGE plpgsql;
+CREATE TRIGGER audit_changelog_append_only
+    BEFORE UPDATE OR DELETE ON audit_changelog
+    FOR EACH ROW EXECUTE FUNCTION audit_changelog_append_only();
+'''
+
+
+def partition_table(apps, schema_editor):
+    """Range-partition the change log by month and make it append-only (PostgreSQL)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from audit.partitions import ensure_partitions
+    schema_editor.execute(PARTITION_TABLE)
+    ensure_partitions(connection=schema_editor.connection)
+
+
+def unpartition_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'DROP TRIGGER IF EXISTS audit_changelog_append_only ON audit_changelog; '
+        'DROP FUNCTION IF EXISTS audit_changelog_append_only();'
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ts', models.DateTimeField(default=django.utils.timezone.now, help_text='When the transaction committed')),
+                ('object_type', models.CharField(help_text='Model of the changed object (app_label.model)', max_length=50)),
+                ('object_id', models.BigIntegerField(help_text='Primary key of the changed object')),
+                ('changes', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Field-level diff')),
+                ('user_id', models.IntegerField(blank=True, help_text='User who made the change, if any', null=True)),
+                ('username', models.CharField(blank=True, help_text='Username at the time of the change', max_length=150)),
+                ('source', models.CharField(blank=True, help_text='Where the change came from (web, admin, import, ...)', max_length=50)),
+            ],
+            options={
+                'verbose_name': 'Change log entry',
+                'verbose_name_plural': 'Change log',
+                'ordering': ['-ts'],
+                'indexes': [models.Index(fields=['object_type', 'object_id', 'ts'], name='changelog_object_ts_idx')],
+            },
+        ),
+        migrations.RunPython(partition_table, unpartition_table),
+    ]
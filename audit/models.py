@@ -0,0 +1,96 @@
+"""
+Models for audit application.
+"""
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class ChangeLogQuerySet(models.QuerySet):
+    """QuerySet for change log entries."""
+
+    def for_object(self, obj, object_type=None):
+        """Entries about ``obj``, newest first (served by the object index)."""
+        return self.filter(
+            object_type=object_type or obj._meta.label_lower, object_id=obj.pk
+        ).order_by('-ts')
+
+    def update(self, **kwargs):
+        raise TypeError("The change log is append-only.")
+
+    def delete(self):
+        raise TypeError("The change log is append-only.")
+
+
+class ChangeLog(models.Model):
+    """
+    Field-level changes made to one process in one transaction.
+
+    The process and every party of it changed in the same transaction
+    share one entry; ``changes`` maps ``"<app_label>.<model>"`` to
+    ``{pk: {"action": ..., "fields": ...}}``. Created and deleted rows
+    list their values, updated rows ``[old, new]`` pairs of the changed
+    fields only. Bulk operations write one entry per chunk instead, with
+    ``object_type`` ``"batch"`` and the chunk's first row id.
+
+    Rows are only ever inserted. On PostgreSQL the table is partitioned
+    by month of ``ts`` (see ``audit.partitions``); old months are removed
+    by dropping their partition.
+    """
+    ts = models.DateTimeField(
+        default=timezone.now,
+        help_text="When the transaction committed"
+    )
+    object_type = models.CharField(
+        max_length=50,
+        help_text="Model of the changed object (app_label.model)"
+    )
+    object_id = models.BigIntegerField(
+        help_text="Primary key of the changed object"
+    )
+    changes = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        help_text="Field-level diff"
+    )
+
+    # Attribution
+    user_id = models.IntegerField(
+        null=True,
+        blank=True,
+        help_text="User who made the change, if any"
+    )
+    username = models.CharField(
+        max_length=150,
+        blank=True,
+        help_text="Username at the time of the change"
+    )
+    source = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text="Where the change came from (web, admin, import, ...)"
+    )
+
+    objects = ChangeLogQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Change log entry"
+        verbose_name_plural = "Change log"
+        ordering = ['-ts']
+        indexes = [
+            models.Index(
+                fields=['object_type', 'object_id', 'ts'],
+                name='changelog_object_ts_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.object_type} #{self.object_id} at {self.ts:%Y-%m-%d %H:%M}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise TypeError("The change log is append-only.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise TypeError("The change log is append-only.")
@@ -0,0 +1,26 @@
+"""
+Monthly partitions of the change log table (PostgreSQL only).
+
+The table is range-partitioned on ``ts``. Keep a few months created
+ahead with ``ensure_partitions`` (the ``audit_partitions`` command does
+it) so that rows land in their own month, and remove old months by
+dropping their partition.
+"""
+
+from legal_processes.partitions import RangePartitions, is_partitioned  # noqa: F401
+
+CHANGELOG_PARTITIONS = RangePartitions('audit_changelog', 'ts', months=1)
+
+
+def partition_name(month):
+    return CHANGELOG_PARTITIONS.name(month)
+
+
+def ensure_partitions(months_ahead=3, today=None, connection=None):
+    """Create the partitions from this month to ``months_ahead`` months on."""
+    return CHANGELOG_PARTITIONS.ensure(months_ahead, today, connection)
+
+
+def drop_partitions(before, connection=None):
+    """Drop the monthly partitions that end on or before ``before``."""
+    return CHANGELOG_PARTITIONS.drop(before, connection)
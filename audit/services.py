@@ -0,0 +1,241 @@
+"""
+Recording of process and party changes in the change log.
+
+Saves and deletes queue a change; the changes of a transaction are merged
+per process and written right after it commits, as one multi-row INSERT.
+A process and its parties saved together (one imported file, one form
+post) therefore produce a single log entry.
+"""
+
+import contextvars
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.utils import timezone
+
+from legal_processes.transactions import CommitBuffer
+
+from .models import ChangeLog
+
+# Columns never worth logging.
+IGNORED_FIELDS = {
+    'id', 'created_at', 'updated_at', 'last_activity_at',
+    # Derived from the process number, which is logged itself.
+    'cnj_sequence', 'cnj_check_digits', 'cnj_year', 'cnj_segment',
+    'cnj_tribunal', 'cnj_origin', 'cnj_valid',
+}
+
+# Entries are filed under the process a change belongs to.
+ROOT_TYPE = 'processes.process'
+ROOT_IDS = {
+    'processes.process': lambda obj: obj.pk,
+    'parties.party': lambda obj: obj.process_id,
+}
+
+# Bulk operations file one entry per chunk under this type, with the
+# first row id of the chunk as ``object_id``.
+BATCH_TYPE = 'batch'
+
+BATCH_SIZE = 500
+
+_attribution = contextvars.ContextVar('audit_attribution', default=(None, '', ''))
+
+
+@contextmanager
+def attribution(user=None, source=''):
+    """Attribute the changes made inside the block to ``user``/``source``."""
+    if user is not None and user.is_authenticated:
+        value = (user.pk, user.get_username(), source)
+    else:
+        value = (None, '', source)
+    token = _attribution.set(value)
+    try:
+        yield
+    finally:
+        _attribution.reset(token)
+
+
+def logged_fields(model):
+    """Return the attnames of the columns of ``model`` worth logging."""
+    return [
+        field.attname for field in model._meta.concrete_fields
+        if field.attname not in IGNORED_FIELDS
+    ]
+
+
+def snapshot(instance):
+    """Return the loggable column values of ``instance``."""
+    return {
+        attname: getattr(instance, attname)
+        for attname in logged_fields(instance)
+    }
+
+
+def diff(old, new):
+    """Return ``{field: [old, new]}`` for the fields that changed."""
+    return {
+        field: [old.get(field), value]
+        for field, value in new.items()
+        if old.get(field) != value
+    }
+
+
+def record_change(instance, action, fields):
+    """Queue a change of ``instance`` for the current transaction."""
+    if action == 'update' and not fields:
+        return
+    label = instance._meta.label_lower
+    root_id = ROOT_IDS[label](instance)
+    if root_id is None:
+        return
+    _pending.add((root_id, label, instance.pk, action, fields, _attribution.get()))
+
+
+def _merge(entry, action, fields):
+    """Fold a later change of the same row into ``entry``."""
+    if entry is None:
+        return {'action': action, 'fields': fields}
+    if action == 'delete':
+        if entry['action'] == 'create':
+            return None
+        return {'action': action, 'fields': fields}
+    if entry['action'] == 'create':
+        entry['fields'].update({field: new for field, (_, new) in fields.items()})
+        return entry
+    # update after update: keep the first old value and the last new one.
+    merged = entry['fields']
+    for field, (old, new) in fields.items():
+        first_old = merged[field][0] if field in merged else old
+        if first_old == new:
+            merged.pop(field, None)
+        else:
+            merged[field] = [first_old, new]
+    return entry
+
+
+def write_changes(items):
+    """Insert one entry per process (and attribution) for the queued changes."""
+    entries = {}
+    for root_id, label, pk, action, fields, who in items:
+        changes = entries.setdefault((root_id, who), {})
+        rows = changes.setdefault(label, {})
+        merged = _merge(rows.get(str(pk)), action, fields)
+        if merged is None or (merged['action'] == 'update' and not merged['fields']):
+            rows.pop(str(pk), None)
+        else:
+            rows[str(pk)] = merged
+
+    now = timezone.now()
+    ChangeLog.objects.bulk_create(
+        [
+            ChangeLog(
+                ts=now,
+                object_type=ROOT_TYPE,
+                object_id=root_id,
+                changes={label: rows for label, rows in changes.items() if rows},
+                user_id=user_id,
+                username=username,
+                source=source,
+            )
+            for (root_id, (user_id, username, source)), changes in entries.items()
+            if any(changes.values())
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+_pending = CommitBuffer(write_changes)
+
+
+def record_batch(model, rows):
+    """
+    Queue one entry for a chunk of a bulk operation on ``model``.
+
+    ``rows`` maps each primary key to ``{"action": ..., "fields": ...}``.
+    """
+    if rows:
+        _pending_batches.add(
+            (model._meta.label_lower, rows, _attribution.get())
+        )
+
+
+def write_batches(items):
+    """Insert one entry per queued chunk."""
+    now = timezone.now()
+    ChangeLog.objects.bulk_create(
+        [
+            ChangeLog(
+                ts=now,
+                object_type=BATCH_TYPE,
+                object_id=min(rows),
+                changes={label: {str(pk): row for pk, row in rows.items()}},
+                user_id=user_id,
+                username=username,
+                source=source,
+            )
+            for label, rows, (user_id, username, source) in items
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+_pending_batches = CommitBuffer(write_batches)
+
+
+def _display_values(changes):
+    """Map the foreign key ids found in ``changes`` to display names."""
+    wanted = {}
+    for label, rows in changes:
+        model = apps.get_model(label)
+        for row in rows.values():
+            for attname, value in row['fields'].items():
+                field = model._meta.get_field(attname)
+                values = value if row['action'] == 'update' else [value]
+                if field.is_relation and field.many_to_one:
+                    wanted.setdefault(field.related_model, set()).update(
+                        v for v in values if v is not None
+                    )
+    return {
+        related: related._default_manager.in_bulk(ids)
+        for related, ids in wanted.items()
+    }
+
+
+def history(instance, limit=20, object_type=None):
+    """
+    Return the latest change log entries of ``instance`` ready to display.
+
+    ``object_type`` overrides the model label entries are filed under
+    (e.g. an archived copy of a process reads the process entries).
+
+    Each entry carries ``rows``: a list of ``(model name, pk, action,
+    [(field, old, new), ...])`` with foreign keys shown by name.
+    """
+    entries = list(
+        ChangeLog.objects.for_object(instance, object_type)[:limit]
+    )
+    names = _display_values(
+        (label, rows) for entry in entries for label, rows in entry.changes.items()
+    )
+
+    def show(field, value):
+        if value is None or not (field.is_relation and field.many_to_one):
+            return value
+        obj = names.get(field.related_model, {}).get(value)
+        return str(obj) if obj is not None else value
+
+    for entry in entries:
+        entry.rows = []
+        for label, rows in entry.changes.items():
+            model = apps.get_model(label)
+            for pk, row in rows.items():
+                fields = []
+                for attname, value in row['fields'].items():
+                    field = model._meta.get_field(attname)
+                    old, new = value if row['action'] == 'update' else (None, value)
+                    name = field.verbose_name
+                    if field.name.endswith('_ref'):
+                        name = field.related_model._meta.verbose_name
+                    fields.append((name, show(field, old), show(field, new)))
+                entry.rows.append((model._meta.verbose_name, pk, row['action'], fields))
+    return entries
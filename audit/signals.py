@@ -0,0 +1,83 @@
+"""
+Signal handlers that feed the change log.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from parties.models import Party
+from processes.models import Process
+from processes.signals import post_bulk_save, pre_bulk_delete, pre_bulk_update
+
+from .services import diff, logged_fields, record_batch, record_change, snapshot
+
+
+@receiver(pre_save, sender=Process)
+@receiver(pre_save, sender=Party)
+def remember_logged_values(sender, instance, raw=False, **kwargs):
+    """Load the stored values of rows that were not read from the DB."""
+    if raw or instance._state.adding:
+        return
+    fields = logged_fields(sender)
+    loaded = getattr(instance, '_loaded_values', None) or {}
+    if all(field in loaded for field in fields):
+        return
+    stored = sender.objects.filter(pk=instance.pk).values(*fields).first()
+    if stored is not None:
+        instance._loaded_values = {**loaded, **stored}
+
+
+@receiver(post_save, sender=Process)
+@receiver(post_save, sender=Party)
+def log_save(sender, instance, created, raw=False, **kwargs):
+    """Log the values of a new row or the changed fields of an old one."""
+    if raw:
+        return
+    values = snapshot(instance)
+    if created:
+        record_change(instance, 'create', values)
+    else:
+        loaded = getattr(instance, '_loaded_values', None) or {}
+        record_change(instance, 'update', diff(loaded, values))
+
+
+@receiver(post_delete, sender=Process)
+@receiver(post_delete, sender=Party)
+def log_delete(sender, instance, **kwargs):
+    """Log the last values of a deleted row."""
+    record_change(instance, 'delete', snapshot(instance))
+
+
+@receiver(post_bulk_save, sender=Party)
+def log_bulk_save(sender, instances, created, **kwargs):
+    """Log bulk written rows like saved ones, filed under their process."""
+    for instance in instances:
+        values = snapshot(instance)
+        if created:
+            record_change(instance, 'create', values)
+        else:
+            loaded = getattr(instance, '_loaded_values', None) or {}
+            record_change(instance, 'update', diff(loaded, values))
+
+
+@receiver(pre_bulk_delete, sender=Process)
+@receiver(pre_bulk_delete, sender=Party)
+def log_bulk_delete(sender, ids, **kwargs):
+    """Log the last values of a chunk of bulk deleted rows as one entry."""
+    record_batch(sender, {
+        values.pop('pk'): {'action': 'delete', 'fields': values}
+        for values in sender.objects.filter(pk__in=ids).values('pk', *logged_fields(sender))
+    })
+
+
+@receiver(pre_bulk_update, sender=Process)
+def log_bulk_update(sender, ids, values, **kwargs):
+    """Log the changed fields of a chunk of bulk updated rows as one entry."""
+    fields = [field for field in logged_fields(sender) if field in values]
+    rows = {}
+    for old in sender.objects.filter(pk__in=ids).values('pk', *fields):
+        pk = old.pop('pk')
+        changes = diff(old, {field: values[field] for field in fields})
+        if changes:
+            rows[pk] = {'action': 'update', 'fields': changes}
+    record_batch(sender, rows)
@@ -0,0 +1,164 @@
+"""
+Tests for audit application.
+"""
+
+import datetime
+from decimal import Decimal
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.urls import reverse
+from parties.models import Party
+from processes.models import Process
+from .models import ChangeLog
+from .partitions import partition_name
+from .services import attribution, history
+
+
+class ChangeLogTest(TestCase):
+    """Test cases for change recording."""
+
+    def create_process(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                process = Process.objects.create( # type: ignore
+                    process_number='1004030-81.2016.0.00.0008',
+                    process_class='Execução de Título Extrajudicial',
+                    subject='Locação de Imóvel',
+                    judge='Mariana',
+                    action_value=Decimal('5911.72'),
+                )
+                for name, document in (
+                    ('Eduardo Amoroso', '564.406.360-73'),
+                    ('Imobiliária Central', '12.345.678/0001-90'),
+                ):
+                    Party.objects.create( # type: ignore
+                        name=name, document=document,
+                        category='EXEQUENTE', process=process,
+                    )
+        return process
+
+    def test_one_entry_per_transaction(self):
+        """Test a process and its parties saved together share one entry."""
+        process = self.create_process()
+        entries = list(ChangeLog.objects.for_object(process))
+        self.assertEqual(len(entries), 1)
+        changes = entries[0].changes
+        self.assertEqual(len(changes['parties.party']), 2)
+        created = changes['processes.process'][str(process.pk)]
+        self.assertEqual(created['action'], 'create')
+        self.assertEqual(created['fields']['process_number'], '1004030-81.2016.0.00.0008')
+
+    def test_update_logs_changed_fields_only(self):
+        """Test an update stores old and new values of changed fields."""
+        process = self.create_process()
+        process = Process.objects.get(pk=process.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            with attribution(source='test'):
+                process.status = 'archived'
+                process.save()
+                process.save()
+
+        entry = ChangeLog.objects.for_object(process).first()
+        self.assertEqual(entry.source, 'test')
+        self.assertEqual(
+            entry.changes['processes.process'][str(process.pk)],
+            {'action': 'update', 'fields': {'status': ['active', 'archived']}},
+        )
+
+    def test_unchanged_save_is_not_logged(self):
+        """Test saving without changes writes nothing."""
+        process = self.create_process()
+        with self.captureOnCommitCallbacks(execute=True):
+            Process.objects.get(pk=process.pk).save()
+        self.assertEqual(ChangeLog.objects.for_object(process).count(), 1)
+
+    def test_party_delete_is_logged_under_process(self):
+        """Test deleting a party files its last values under the process."""
+        process = self.create_process()
+        party = process.parties.first()
+        pk = party.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            party.delete()
+
+        entry = ChangeLog.objects.for_object(process).first()
+        deleted = entry.changes['parties.party'][str(pk)]
+        self.assertEqual(deleted['action'], 'delete')
+        self.assertEqual(deleted['fields']['name'], party.name)
+
+    def test_append_only(self):
+        """Test entries cannot be changed or removed."""
+        process = self.create_process()
+        entry = ChangeLog.objects.for_object(process).first()
+        with self.assertRaises(TypeError):
+            entry.save()
+        with self.assertRaises(TypeError):
+            entry.delete()
+        with self.assertRaises(TypeError):
+            ChangeLog.objects.all().delete()
+        with self.assertRaises(TypeError):
+            ChangeLog.objects.update(source='x')
+
+    def test_history_shows_lookup_names(self):
+        """Test the history resolves lookup ids to names."""
+        process = self.create_process()
+        process = Process.objects.get(pk=process.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            process.judge = 'Roberto'
+            process.save()
+
+        model_name, pk, action, fields = history(process)[0].rows[0]
+        self.assertEqual(action, 'update')
+        self.assertIn(('judge', 'Mariana', 'Roberto'), fields)
+
+    def test_partition_name(self):
+        """Test monthly partition naming."""
+        self.assertEqual(
+            partition_name(datetime.date(2024, 3, 1)), 'audit_changelog_p2024_03'
+        )
+
+
+class HistoryPanelTest(TestCase):
+    """Test cases for the history panel on the process page."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        User.objects.create_superuser(username='admin', password='testpass123')
+
+    def setUp(self):
+        """Log in the test user."""
+        self.client.login(username='admin', password='testpass123')
+
+    def test_changes_attributed_to_user_and_shown(self):
+        """Test a change made through the site is attributed and displayed."""
+        with self.captureOnCommitCallbacks(execute=True):
+            process = Process.objects.create( # type: ignore
+                process_number='987654-32.2023.8.26.0001',
+                process_class='Procedimento Comum',
+                subject='Contratos',
+                judge='Mariana',
+                action_value=Decimal('10.00'),
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('processes:process_update', args=[process.pk]),
+                {
+                    'process_number': process.process_number,
+                    'process_class': 'Procedimento Comum',
+                    'subject': 'Contratos',
+                    'judge': 'Mariana',
+                    'action_value': '20.00',
+                    'status': 'active',
+                    'process_type': 'digital',
+                },
+            )
+
+        entry = ChangeLog.objects.for_object(process).first()
+        self.assertEqual(entry.username, 'admin')
+        self.assertEqual(entry.source, 'web')
+
+        response = self.client.get(reverse('processes:process_detail', args=[process.pk]))
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn('Histórico', content)
+        self.assertIn('admin', content)
@@ -0,0 +1,22 @@
+"""
+Shared pytest configuration.
+
+Under ``pytest-xdist`` (``pytest -n auto``) pytest-django gives every
+worker its own test database (``test_<name>_gw0``, ``_gw1``, ...), so
+the workers never share rows.
+"""
+
+from django.conf import settings
+
+
+def pytest_configure(config):
+    # Hashing test passwords with PBKDF2 dominates the cost of creating
+    # users and logging in; a fast hasher keeps that out of every test.
+    settings.PASSWORD_HASHERS = [
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ]
+    # The manifest storage needs ``collectstatic`` to have run before any
+    # ``{% static %}``; tests render templates from a fresh checkout.
+    settings.STATICFILES_STORAGE = (
+        'django.contrib.staticfiles.storage.StaticFilesStorage'
+    )
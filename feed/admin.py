@@ -0,0 +1,42 @@
+"""
+Admin configuration for feed application.
+"""
+
+from django.contrib import admin
+
+from legal_processes.admin_list import LargeTableAdminMixin
+
+from .models import FeedEvent
+
+
+@admin.register(FeedEvent)
+class FeedEventAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """Read-only admin for the change feed."""
+
+    list_display = [
+        'seq',
+        'ts',
+        'action',
+        'object_type',
+        'object_id',
+    ]
+
+    list_filter = [
+        'action',
+        'object_type',
+    ]
+
+    search_fields = [
+        '=object_id',
+    ]
+
+    ordering = ['-id']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
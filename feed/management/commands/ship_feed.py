@@ -0,0 +1,127 @@
+"""
+Management command to ship the change feed to a file or a spool directory.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from feed.services import events_since
+
+
+def write_atomically(path, text):
+    """Replace ``path`` with ``text`` so readers never see half of it."""
+    tmp = path.with_name(f'.{path.name}.tmp')
+    with open(tmp, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class FileSink:
+    """Appends one JSON event per line to a file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def send(self, events):
+        with open(self.path, 'a') as f:
+            for event in events:
+                f.write(json.dumps(event, cls=DjangoJSONEncoder) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class SpoolSink:
+    """
+    Local stand-in for a message broker topic.
+
+    Each batch becomes one message file, ``<first seq>-<last seq>.json``,
+    that appears atomically in the directory; consumers process the
+    files in name order and delete them.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def send(self, events):
+        name = f"{events[0]['seq']:020d}-{events[-1]['seq']:020d}.json"
+        write_atomically(
+            self.path / name,
+            json.dumps({'events': events}, cls=DjangoJSONEncoder),
+        )
+
+
+class Command(BaseCommand):
+    """Command to deliver the feed events after the last shipped one."""
+
+    help = 'Ship the change feed to a JSON lines file or a spool directory'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument(
+            '--file',
+            type=str,
+            help='Append the events to this file, one JSON object per line'
+        )
+        target.add_argument(
+            '--spool',
+            type=str,
+            help='Write each batch as a message file in this directory'
+        )
+        parser.add_argument(
+            '--offset-file',
+            type=str,
+            help='Where the last shipped seq is kept (default: <target>.offset)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Events per batch (default: 500)'
+        )
+        parser.add_argument(
+            '--follow',
+            action='store_true',
+            help='Keep running and ship new events as they arrive'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Seconds between polls with --follow (default: 1)'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command execution."""
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+        target = options['file'] or options['spool'].rstrip('/')
+        sink = FileSink(target) if options['file'] else SpoolSink(target)
+        offset_file = Path(options['offset_file'] or f'{target}.offset')
+        since = int(offset_file.read_text()) if offset_file.exists() else 0
+
+        shipped = 0
+        while True:
+            events = events_since(since, options['batch_size'])
+            if events:
+                sink.send([event.as_json() for event in events])
+                # Delivery is at least once: a crash between the two
+                # writes ships this batch again.
+                since = events[-1].seq
+                write_atomically(offset_file, str(since))
+                shipped += len(events)
+                self.stdout.write(f'Shipped up to seq {since} ({shipped} events)')
+            elif not options['follow']:
+                break
+            else:
+                time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Shipped {shipped} events; at seq {since}'))
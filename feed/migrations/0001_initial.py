@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:42
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEvent',
+            fields=[
+                ('seq', models.BigAutoField(help_text='Position in the feed', primary_key=True, serialize=False)),
+                ('ts', models.DateTimeField(default=django.utils.timezone.now, help_text='When the change was made')),
+                ('object_type', models.CharField(help_text='Model of the changed object (app_label.model)', max_length=50)),
+                ('object_id', models.BigIntegerField(help_text='Primary key of the changed object')),
+                ('action', models.CharField(choices=[('create', 'Create'), ('update', 'Update'), ('delete', 'Delete'), ('archive', 'Archive'), ('restore', 'Restore')], help_text='What happened to the object', max_length=10)),
+                ('data', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Row values after the change')),
+            ],
+            options={
+                'verbose_name': 'Feed event',
+                'verbose_name_plural': 'Feed events',
+                'ordering': ['seq'],
+            },
+        ),
+    ]
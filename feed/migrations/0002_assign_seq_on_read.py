@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-19 19:10
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def keep_numbers(apps, schema_editor):
+    """Existing events keep their position, so consumer offsets stay valid."""
+    FeedEvent = apps.get_model('feed', 'FeedEvent')
+    FeedEvent.objects.update(seq=F('id'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feed', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='feedevent',
+            old_name='seq',
+            new_name='id',
+        ),
+        migrations.AlterField(
+            model_name='feedevent',
+            name='id',
+            field=models.BigAutoField(help_text='Insertion order', primary_key=True, serialize=False),
+        ),
+        migrations.AddField(
+            model_name='feedevent',
+            name='seq',
+            field=models.BigIntegerField(blank=True, help_text='Position in the feed, assigned once the event is committed', null=True, unique=True),
+        ),
+        migrations.RunPython(keep_numbers, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name='feedevent',
+            options={'ordering': ['id'], 'verbose_name': 'Feed event', 'verbose_name_plural': 'Feed events'},
+        ),
+        migrations.AddIndex(
+            model_name='feedevent',
+            index=models.Index(condition=models.Q(('seq__isnull', True)), fields=['id'], name='feed_event_unnumbered_idx'),
+        ),
+    ]
@@ -0,0 +1,93 @@
+"""
+Models for feed application.
+"""
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class FeedEvent(models.Model):
+    """
+    One change of a process or party, in commit order.
+
+    Events are inserted in the transaction of the change itself, so a
+    change and its event commit (or roll back) together. ``seq`` is left
+    empty on insert and assigned by the readers to committed events only
+    (``feed.services.assign_seq``), so a consumer that has read up to
+    ``seq`` never sees a smaller one appear later.
+
+    ``data`` holds the row as it is after the change (with the lookup
+    names of a process and the document of a party); deleted and
+    archived rows only carry their ``id``.
+    """
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    ARCHIVE = 'archive'
+    RESTORE = 'restore'
+    ACTION_CHOICES = [
+        (CREATE, 'Create'),
+        (UPDATE, 'Update'),
+        (DELETE, 'Delete'),
+        (ARCHIVE, 'Archive'),
+        (RESTORE, 'Restore'),
+    ]
+
+    id = models.BigAutoField(
+        primary_key=True,
+        help_text="Insertion order"
+    )
+    seq = models.BigIntegerField(
+        null=True,
+        blank=True,
+        unique=True,
+        help_text="Position in the feed, assigned once the event is committed"
+    )
+    ts = models.DateTimeField(
+        default=timezone.now,
+        help_text="When the change was made"
+    )
+    object_type = models.CharField(
+        max_length=50,
+        help_text="Model of the changed object (app_label.model)"
+    )
+    object_id = models.BigIntegerField(
+        help_text="Primary key of the changed object"
+    )
+    action = models.CharField(
+        max_length=10,
+        choices=ACTION_CHOICES,
+        help_text="What happened to the object"
+    )
+    data = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        default=dict,
+        help_text="Row values after the change"
+    )
+
+    class Meta:
+        verbose_name = "Feed event"
+        verbose_name_plural = "Feed events"
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['id'],
+                condition=models.Q(seq__isnull=True),
+                name='feed_event_unnumbered_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"#{self.seq} {self.action} {self.object_type} {self.object_id}"
+
+    def as_json(self):
+        """Return the event as sent to consumers."""
+        return {
+            'seq': self.seq,
+            'ts': self.ts,
+            'type': self.object_type,
+            'id': self.object_id,
+            'action': self.action,
+            'data': self.data,
+        }
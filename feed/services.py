@@ -0,0 +1,159 @@
+"""
+Writing and reading the change feed.
+
+Every change of a process or party adds a ``FeedEvent`` in the same
+transaction (see ``feed.signals``). Created and updated rows are read
+back with one query per statement, joined to the names a consumer
+needs, so events of a bulk operation cost one ``SELECT`` and one
+``INSERT`` per chunk.
+
+Inside ``deferred()`` the events are collected instead, and written
+together when the block ends, still inside its transaction: an import
+saving a process and its parties one by one then costs one ``SELECT``
+per model and one ``INSERT``.
+
+Writers take no lock: events are numbered (``seq``) by the readers, in
+``assign_seq()``, once their transactions have committed.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connection, transaction
+from django.db.models import F, Max, Min, Q
+
+from parties.models import Party
+from processes.models import Process
+
+from .models import FeedEvent
+
+# Key of the advisory lock serializing the readers that number events.
+LOCK_KEY = 7_465_756_800
+
+# Values sent on top of the columns: name -> lookup path.
+EXTRA_VALUES = {
+    Process: {field: F(f'{field}_ref__name') for field in Process.LOOKUP_FIELDS},
+    Party: {'document': F('person__document')},
+}
+
+BATCH_SIZE = 500
+
+# (model, action, ids) entries collected by ``deferred()``, or None.
+_pending = ContextVar('feed_pending', default=None)
+
+
+def assign_seq():
+    """
+    Number the committed events that have no ``seq`` yet, after the others.
+
+    Events get their ``seq`` here rather than on insert, so the feed is in
+    commit order without making writers wait for each other: a row only
+    appears to this ``UPDATE`` once its transaction has committed, and a
+    transaction still open when this runs is numbered by a later call,
+    after everything numbered now. Callers take turns on an advisory lock
+    (PostgreSQL) held until the numbers are committed.
+    """
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s)', [LOCK_KEY])
+        bounds = FeedEvent.objects.aggregate(
+            first=Min('id', filter=Q(seq__isnull=True)), last=Max('seq')
+        )
+        if bounds['first'] is None:
+            return
+        # Numbers follow the insertion order; rows committed meanwhile
+        # below ``first`` are left for the next call.
+        FeedEvent.objects.filter(seq__isnull=True, id__gte=bounds['first']).update(
+            seq=F('id') - bounds['first'] + (bounds['last'] or 0) + 1
+        )
+
+
+def read_rows(model, ids):
+    """Return the rows ``ids`` of ``model`` as feed data, by primary key."""
+    columns = [field.attname for field in model._meta.concrete_fields]
+    rows = model._default_manager.filter(pk__in=ids).order_by().values(
+        *columns, **EXTRA_VALUES.get(model, {})
+    )
+    return {row['id']: row for row in rows}
+
+
+def record(model, action, ids):
+    """Add ``action`` events for the rows ``ids``, read as they are now."""
+    if not _defer(model, action, ids):
+        _write(_read_events(model, action, ids))
+
+
+def record_removed(model, ids, action=FeedEvent.DELETE):
+    """Add ``action`` events for rows that leave the table."""
+    if not _defer(model, action, ids, removed=True):
+        _write(_removed_events(model, action, ids))
+
+
+@contextmanager
+def deferred():
+    """
+    Collect the events recorded in the block and write them at its end.
+
+    Use it inside the transaction of the writes: the rows are read when
+    the block ends, so a row saved twice is sent as it was last saved.
+    Nothing is written if the block raises.
+    """
+    if _pending.get() is not None:
+        yield
+        return
+    token = _pending.set([])
+    try:
+        yield
+        entries = _pending.get()
+    finally:
+        _pending.reset(token)
+    events = []
+    for model, action, ids, removed in entries:
+        if removed:
+            events += _removed_events(model, action, ids)
+        else:
+            events += _read_events(model, action, ids)
+    _write(events)
+
+
+def _defer(model, action, ids, removed=False):
+    entries = _pending.get()
+    if entries is None:
+        return False
+    last = entries[-1] if entries else None
+    if last and last[:2] == (model, action) and last[3] == removed:
+        # Consecutive events of one kind are read with one query.
+        last[2].extend(ids)
+    else:
+        entries.append((model, action, list(ids), removed))
+    return True
+
+
+def _event(model, pk, action, data):
+    return FeedEvent(
+        object_type=model._meta.label_lower, object_id=pk, action=action, data=data
+    )
+
+
+def _read_events(model, action, ids):
+    if not ids:
+        return []
+    rows = read_rows(model, ids)
+    return [_event(model, pk, action, rows[pk]) for pk in ids if pk in rows]
+
+
+def _removed_events(model, action, ids):
+    return [_event(model, pk, action, {'id': pk}) for pk in ids]
+
+
+def _write(events):
+    if not events:
+        return
+    FeedEvent.objects.bulk_create(events, batch_size=BATCH_SIZE)
+
+
+def events_since(since, limit):
+    """The first ``limit`` events after ``since``, in feed order."""
+    assign_seq()
+    return list(FeedEvent.objects.filter(seq__gt=since).order_by('seq')[:limit])
@@ -0,0 +1,52 @@
+"""
+Signal handlers that add the feed events of process and party changes.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from parties.models import Party
+from processes.models import Process
+from processes.signals import post_bulk_save, post_bulk_update, pre_bulk_delete
+
+from .models import FeedEvent
+from .services import record, record_removed
+
+
+@receiver(post_save, sender=Process)
+@receiver(post_save, sender=Party)
+def feed_save(sender, instance, created, raw=False, **kwargs):
+    """Add the event of a saved row."""
+    if raw:
+        return
+    record(sender, FeedEvent.CREATE if created else FeedEvent.UPDATE, [instance.pk])
+
+
+@receiver(post_delete, sender=Process)
+@receiver(post_delete, sender=Party)
+def feed_delete(sender, instance, **kwargs):
+    """Add the event of a deleted row."""
+    record_removed(sender, [instance.pk])
+
+
+@receiver(post_bulk_save, sender=Party)
+def feed_bulk_save(sender, instances, created, **kwargs):
+    """Add the events of rows written with ``bulk_create``/``bulk_update``."""
+    record(
+        sender,
+        FeedEvent.CREATE if created else FeedEvent.UPDATE,
+        [instance.pk for instance in instances],
+    )
+
+
+@receiver(post_bulk_update, sender=Process)
+def feed_bulk_update(sender, ids, **kwargs):
+    """Add the events of a chunk of bulk updated rows."""
+    record(sender, FeedEvent.UPDATE, ids)
+
+
+@receiver(pre_bulk_delete, sender=Process)
+@receiver(pre_bulk_delete, sender=Party)
+def feed_bulk_delete(sender, ids, **kwargs):
+    """Add the events of a chunk of bulk deleted rows."""
+    record_removed(sender, ids)
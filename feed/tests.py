@@ -0,0 +1,290 @@
+"""
+Tests for feed application.
+"""
+
+import json
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import Permission, User
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from archive.services import archive_processes, restore_batch
+from parties.models import Party
+from processes.bulk import bulk_delete, bulk_update
+from processes.models import Process
+
+from .models import FeedEvent
+from .services import assign_seq, deferred, events_since
+
+
+def create_process(number, status='active'):
+    """Create a process with one party."""
+    process = Process.objects.create( # type: ignore
+        process_number=number,
+        status=status,
+        process_class='Execução de Título Extrajudicial',
+        judge='Mariana',
+        action_value=Decimal('100.00'),
+    )
+    Party.objects.create( # type: ignore
+        name='Eduardo Amoroso', document='564.406.360-73',
+        category='EXEQUENTE', process=process,
+    )
+    return process
+
+
+def actions():
+    """Return the feed as (type, id, action) tuples, in order."""
+    return list(FeedEvent.objects.values_list('object_type', 'object_id', 'action'))
+
+
+class FeedRecordTest(TestCase):
+    """Test cases for the events added by changes."""
+
+    def test_save_adds_events_with_row(self):
+        """Test creating and updating rows adds their events with the data."""
+        process = create_process('1004030-81.2016.0.00.0008')
+        party = process.parties.get()
+        process.status = 'suspended'
+        process.save()
+
+        self.assertEqual(actions(), [
+            ('processes.process', process.pk, 'create'),
+            ('parties.party', party.pk, 'create'),
+            ('processes.process', process.pk, 'update'),
+        ])
+        created, _, updated = FeedEvent.objects.all()
+        self.assertEqual(created.data['judge'], 'Mariana')
+        self.assertEqual(created.data['status'], 'active')
+        self.assertEqual(updated.data['status'], 'suspended')
+        self.assertEqual(
+            FeedEvent.objects.get(object_type='parties.party').data['document'],
+            '564.406.360-73',
+        )
+
+    def test_delete_adds_event(self):
+        """Test deleting a party adds an event with its id only."""
+        party = create_process('1004030-81.2016.0.00.0008').parties.get()
+        pk = party.pk
+        party.delete()
+
+        event = FeedEvent.objects.last()
+        self.assertEqual((event.action, event.object_id), ('delete', pk))
+        self.assertEqual(event.data, {'id': pk})
+
+    def test_rolled_back_change_adds_no_event(self):
+        """Test an event commits or rolls back with its change."""
+        try:
+            with transaction.atomic():
+                create_process('1004030-81.2016.0.00.0008')
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertFalse(FeedEvent.objects.exists())
+
+    def test_writers_leave_seq_to_readers(self):
+        """Test events are inserted without a position and numbered on read."""
+        create_process('1004030-81.2016.0.00.0008')
+        self.assertFalse(FeedEvent.objects.filter(seq__isnull=False).exists())
+
+        events = events_since(0, 10)
+        self.assertEqual([event.seq for event in events], [1, 2])
+
+    def test_late_commit_is_numbered_after_read_events(self):
+        """Test an event committed after a read comes after it, whatever its id."""
+        create_process('1004030-81.2016.0.00.0008')
+        create_process('1004031-81.2016.0.00.0008')
+        # The first event stands for a transaction still open during the read.
+        late = FeedEvent.objects.first()
+        late.delete()
+        read = events_since(0, 10)
+        late.save(force_insert=True)
+
+        events = events_since(read[-1].seq, 10)
+        self.assertEqual([event.pk for event in events], [late.pk])
+        self.assertGreater(events[0].seq, read[-1].seq)
+
+    def test_deferred_writes_events_at_end(self):
+        """Test deferred events are written once, with the last saved row."""
+        with self.assertNumQueries(0):
+            with deferred():
+                pass
+        with deferred():
+            process = create_process('1004030-81.2016.0.00.0008')
+            process.status = 'suspended'
+            process.save()
+            self.assertFalse(FeedEvent.objects.exists())
+
+        self.assertEqual(
+            [action for _, _, action in actions()], ['create', 'create', 'update']
+        )
+        self.assertEqual(FeedEvent.objects.first().data['status'], 'suspended')
+
+    def test_bulk_operations_add_events(self):
+        """Test bulk updates and deletes add one event per row."""
+        first = create_process('1004030-81.2016.0.00.0008')
+        second = create_process('1004031-81.2016.0.00.0008')
+        FeedEvent.objects.all().delete()
+
+        bulk_update(Process.objects.all(), {'status': 'archived'}, chunk_size=1)
+        self.assertEqual(actions(), [
+            ('processes.process', first.pk, 'update'),
+            ('processes.process', second.pk, 'update'),
+        ])
+        self.assertEqual(FeedEvent.objects.first().data['status'], 'archived')
+
+        party = first.parties.get()
+        FeedEvent.objects.all().delete()
+        bulk_delete(Process.objects.filter(pk=first.pk))
+        self.assertCountEqual(actions(), [
+            ('parties.party', party.pk, 'delete'),
+            ('processes.process', first.pk, 'delete'),
+        ])
+
+    def test_archive_and_restore_add_events(self):
+        """Test archiving and restoring a process are in the feed."""
+        process = create_process('1004030-81.2016.0.00.0008', status='archived')
+        FeedEvent.objects.all().delete()
+
+        archive_processes()
+        self.assertEqual(actions(), [('processes.process', process.pk, 'archive')])
+
+        restore_batch([process.pk])
+        restored = FeedEvent.objects.filter(action='restore')
+        self.assertEqual(
+            sorted(restored.values_list('object_type', flat=True)),
+            ['parties.party', 'processes.process'],
+        )
+        self.assertEqual(
+            restored.get(object_type='processes.process').data['judge'], 'Mariana'
+        )
+
+    def test_import_adds_events(self):
+        """Test an imported process and its parties are in the feed."""
+        call_command('import_processes', 'sample_data/process1.html', stdout=StringIO())
+        process = Process.objects.get()
+        self.assertEqual(
+            FeedEvent.objects.filter(action='create', object_type='parties.party').count(),
+            process.parties.count(),
+        )
+        self.assertEqual(
+            FeedEvent.objects.get(object_type='processes.process').object_id, process.pk
+        )
+
+
+class FeedEventsViewTest(TestCase):
+    """Test cases for the feed endpoint."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        cls.user = User.objects.create_user(username='consumer', password='x')
+        cls.user.user_permissions.add(Permission.objects.get(codename='view_feedevent'))
+        cls.processes = [
+            create_process(f'100{i}030-81.2016.0.00.0008') for i in range(3)
+        ]
+
+    def setUp(self):
+        """Log in the consumer."""
+        self.client.login(username='consumer', password='x')
+
+    def test_pages_through_events(self):
+        """Test ``next`` and ``more`` page through the feed."""
+        url = reverse('feed:feed_events')
+        first = self.client.get(url, {'limit': 4}).json()
+        self.assertEqual(len(first['events']), 4)
+        self.assertTrue(first['more'])
+        self.assertEqual(first['next'], first['events'][-1]['seq'])
+
+        rest = self.client.get(url, {'since': first['next']}).json()
+        self.assertEqual(len(rest['events']), 2)
+        self.assertFalse(rest['more'])
+        self.assertEqual(rest['events'][0]['seq'], first['next'] + 1)
+        self.assertEqual(rest['events'][-1]['type'], 'parties.party')
+
+        empty = self.client.get(url, {'since': rest['next']}).json()
+        self.assertEqual(empty, {'events': [], 'next': rest['next'], 'more': False})
+
+    @override_settings(FEED_MAX_WAIT=1, FEED_POLL_INTERVAL=0.01)
+    def test_wait_returns_when_time_runs_out(self):
+        """Test a long poll without new events returns empty."""
+        assign_seq()
+        last = FeedEvent.objects.last().seq
+        response = self.client.get(
+            reverse('feed:feed_events'), {'since': last, 'wait': 1}
+        )
+        self.assertEqual(response.json()['events'], [])
+
+    @override_settings(FEED_MAX_WAIT=0)
+    def test_wait_is_off_by_default(self):
+        """Test a request never holds a sync worker unless long polls are on."""
+        assign_seq()
+        last = FeedEvent.objects.last().seq
+        with mock.patch('feed.views.time.sleep') as sleep:
+            response = self.client.get(
+                reverse('feed:feed_events'), {'since': last, 'wait': 25}
+            )
+        self.assertEqual(response.json()['events'], [])
+        sleep.assert_not_called()
+
+    def test_rejects_bad_since(self):
+        """Test a non-numeric ``since`` is a bad request."""
+        response = self.client.get(reverse('feed:feed_events'), {'since': 'x'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_requires_permission(self):
+        """Test users without the permission cannot read the feed."""
+        User.objects.create_user(username='clerk', password='x')
+        self.client.login(username='clerk', password='x')
+        response = self.client.get(reverse('feed:feed_events'))
+        self.assertEqual(response.status_code, 403)
+
+
+class ShipFeedCommandTest(TestCase):
+    """Test cases for the ship_feed command."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        cls.process = create_process('1004030-81.2016.0.00.0008')
+
+    def setUp(self):
+        """Create a target directory."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+
+    def test_file_resumes_from_offset(self):
+        """Test a second run ships only the new events."""
+        target = self.dir / 'feed.jsonl'
+        call_command('ship_feed', file=str(target), stdout=StringIO())
+        self.process.status = 'suspended'
+        self.process.save()
+        call_command('ship_feed', file=str(target), stdout=StringIO())
+
+        events = [json.loads(line) for line in target.read_text().splitlines()]
+        self.assertEqual([event['action'] for event in events], ['create', 'create', 'update'])
+        self.assertEqual(events[-1]['data']['status'], 'suspended')
+        self.assertEqual(
+            (self.dir / 'feed.jsonl.offset').read_text(), str(events[-1]['seq'])
+        )
+
+    def test_spool_writes_one_message_per_batch(self):
+        """Test each batch becomes one file named by its seq range."""
+        spool = self.dir / 'spool'
+        call_command('ship_feed', spool=str(spool), batch_size=1, stdout=StringIO())
+
+        seqs = list(FeedEvent.objects.values_list('seq', flat=True))
+        self.assertEqual(
+            sorted(path.name for path in spool.iterdir()),
+            [f'{seq:020d}-{seq:020d}.json' for seq in seqs],
+        )
+        message = json.loads((spool / f'{seqs[0]:020d}-{seqs[0]:020d}.json').read_text())
+        self.assertEqual(message['events'][0]['id'], self.process.pk)
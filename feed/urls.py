@@ -0,0 +1,13 @@
+"""
+URL configuration for feed app.
+"""
+
+from django.urls import path
+
+from . import views
+
+app_name = 'feed'
+
+urlpatterns = [
+    path('events/', views.feed_events, name='feed_events'),
+]
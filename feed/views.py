@@ -0,0 +1,51 @@
+"""
+Views for feed application.
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required, permission_required
+from django.http import JsonResponse
+
+from .services import events_since
+
+
+def int_param(value, default, maximum):
+    """Parse a non-negative integer parameter, clamped to ``maximum``."""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(0, min(value, maximum))
+
+
+@login_required
+@permission_required('feed.view_feedevent', raise_exception=True)
+def feed_events(request):
+    """
+    Return the events after ``since``, as JSON.
+
+    With ``wait`` (seconds, up to ``FEED_MAX_WAIT``, which is 0 unless
+    the server runs workers that can afford it) the request is held
+    until an event arrives or the time runs out: a long poll. Clients
+    pass the returned ``next`` as ``since`` of their next request.
+    """
+    try:
+        since = max(0, int(request.GET.get('since', 0)))
+    except ValueError:
+        return JsonResponse({'errors': {'since': ['Expected an integer.']}}, status=400)
+    limit = int_param(request.GET.get('limit'), settings.FEED_PAGE_SIZE, settings.FEED_PAGE_SIZE) or 1
+    wait = int_param(request.GET.get('wait'), 0, settings.FEED_MAX_WAIT)
+
+    deadline = time.monotonic() + wait
+    events = events_since(since, limit)
+    while not events and time.monotonic() < deadline:
+        time.sleep(settings.FEED_POLL_INTERVAL)
+        events = events_since(since, limit)
+
+    return JsonResponse({
+        'events': [event.as_json() for event in events],
+        'next': events[-1].seq if events else since,
+        'more': len(events) == limit,
+    })
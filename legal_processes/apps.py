@@ -0,0 +1,24 @@
+from django.apps import AppConfig
+
+
+class LegalProcessesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'legal_processes'
+
+    def ready(self):
+        from django.contrib.auth import get_user_model
+        from django.contrib.auth.models import Group, Permission
+        from django.db.models.signals import m2m_changed, post_delete, post_save
+
+        from . import auth
+
+        User = get_user_model()
+        post_save.connect(auth.user_created, sender=User)
+        for through in (
+            User.groups.through,
+            User.user_permissions.through,
+            Group.permissions.through,
+        ):
+            m2m_changed.connect(auth.user_or_group_changed, sender=through)
+        for model in (Group, Permission):
+            post_delete.connect(auth.permission_deleted, sender=model)
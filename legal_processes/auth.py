@@ -0,0 +1,90 @@
+"""
+Authentication backend that caches each user's resolved permissions.
+
+``ModelBackend`` loads a user's own and group permissions from several
+auth tables the first time a request checks one. Permissions here are
+managed through a few groups and rarely change, so the resolved set is
+kept in a shared cache instead, keyed by the user and two version
+tokens: one per user (bumped when their groups or own permissions
+change) and one global (bumped when any group's permissions change).
+Changing a version makes the old entries unreachable; they expire on
+their own. Without a shared cache (``PERMISSIONS_CACHE = None``) the
+backend behaves like ``ModelBackend``.
+"""
+
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
+
+GLOBAL_VERSION = 'all'
+
+
+def permission_cache():
+    """Return the cache holding resolved permissions, or None."""
+    if settings.PERMISSIONS_CACHE is None:
+        return None
+    return caches[settings.PERMISSIONS_CACHE]
+
+
+def version_key(scope):
+    return f'perms:version:{scope}'
+
+
+def bump_version(scope=GLOBAL_VERSION):
+    """Invalidate the cached permissions of user ``scope`` (or everyone)."""
+    cache = permission_cache()
+    if cache is None:
+        return
+    cache.set(version_key(scope), uuid.uuid4().hex, None)
+
+
+def permissions_key(user):
+    """Return the cache key of the current permissions of ``user``."""
+    user_key, global_key = version_key(user.pk), version_key(GLOBAL_VERSION)
+    versions = permission_cache().get_many([user_key, global_key])
+    return 'perms:{}:{}:{}'.format(
+        user.pk, versions.get(user_key, '0'), versions.get(global_key, '0')
+    )
+
+
+class CachedModelBackend(ModelBackend):
+    """``ModelBackend`` whose permission lookups hit the cache first."""
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if permission_cache() is None:
+            return super().get_all_permissions(user_obj, obj)
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, '_perm_cache'):
+            cache = permission_cache()
+            key = permissions_key(user_obj)
+            perms = cache.get(key)
+            if perms is None:
+                perms = super().get_all_permissions(user_obj)
+                cache.set(key, perms, settings.PERMISSIONS_CACHE_TIMEOUT)
+            user_obj._perm_cache = perms
+        return user_obj._perm_cache
+
+
+def user_created(sender, instance, created, **kwargs):
+    """Never serve a new user the entries of an old one with the same pk."""
+    if created:
+        bump_version(instance.pk)
+
+
+def user_or_group_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """Invalidate after group memberships or permission grants change."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if isinstance(instance, (Group, Permission)):
+        bump_version()
+    else:
+        bump_version(instance.pk)
+
+
+def permission_deleted(sender, instance, **kwargs):
+    """Deleting a group or permission changes what its members hold."""
+    bump_version()
@@ -0,0 +1,38 @@
+"""
+Memory-bounded iteration over large querysets.
+
+Looping over a queryset fills its result cache, so every row stays in
+memory until the loop ends. These helpers keep at most one chunk:
+
+- ``iterate`` / ``iterate_values`` read through ``.iterator()``, a
+  server-side cursor on PostgreSQL, ``chunk_size`` rows per fetch; use
+  them for read-only passes (exports, aggregates, snapshots);
+- ``keyset_chunks`` yields primary keys in ascending chunks, each taken
+  with ``pk > last`` and a ``LIMIT``, so no cursor stays open across
+  chunks; use it when each chunk is written in its own transaction.
+"""
+
+CHUNK_SIZE = 2000
+
+
+def iterate(queryset, chunk_size=CHUNK_SIZE):
+    """Yield the instances of ``queryset`` without caching them."""
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def iterate_values(queryset, *fields, chunk_size=CHUNK_SIZE, flat=False):
+    """Yield ``values_list(*fields)`` tuples (or values when ``flat``)."""
+    return queryset.values_list(*fields, flat=flat).iterator(chunk_size=chunk_size)
+
+
+def keyset_chunks(queryset, chunk_size=CHUNK_SIZE):
+    """Yield the primary keys of ``queryset`` in ascending chunks."""
+    queryset = queryset.order_by('pk').values_list('pk', flat=True)
+    last_id = None
+    while True:
+        chunk = queryset if last_id is None else queryset.filter(pk__gt=last_id)
+        ids = list(chunk[:chunk_size])
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
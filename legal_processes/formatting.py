@@ -0,0 +1,35 @@
+"""
+Display formatting shared by the project's apps.
+"""
+
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.formats import get_format
+
+# Currency symbol used for each supported locale.
+CURRENCY_SYMBOLS = {
+    'pt-br': 'R$',
+    'en-us': 'US$',
+}
+
+
+@lru_cache(maxsize=None)
+def currency_format(locale):
+    """
+    Return ``(symbol, translation table)`` for ``locale``.
+
+    The table turns Python's ``1,234.56`` into the locale's separators in
+    one ``str.translate`` call. Resolved once per locale.
+    """
+    decimal_separator = get_format('DECIMAL_SEPARATOR', locale, use_l10n=True)
+    thousand_separator = get_format('THOUSAND_SEPARATOR', locale, use_l10n=True)
+    table = str.maketrans({',': thousand_separator, '.': decimal_separator})
+    return CURRENCY_SYMBOLS.get(locale, ''), table
+
+
+def format_currency(value, locale=None):
+    """Format ``value`` with two decimals as money in ``locale``."""
+    symbol, table = currency_format(locale or settings.CURRENCY_LOCALE)
+    amount = f"{value:,.2f}".translate(table)
+    return f"{symbol} {amount}" if symbol else amount
@@ -0,0 +1,112 @@
+"""
+Helpers for rendering list pages with many rows.
+"""
+
+import uuid
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+from django.template.loader import get_template, render_to_string
+from django.urls import reverse
+
+
+class RowUrl:
+    """
+    URL of a view taking a single pk, reversed once per page.
+
+    ``reverse`` walks the resolver on every call; a list page needs the
+    same URL for each of its rows with only the pk changing, so the URL
+    is reversed once around a placeholder and completed per row.
+    """
+    PLACEHOLDER = 2147483647
+
+    def __init__(self, viewname):
+        url = reverse(viewname, args=[self.PLACEHOLDER])
+        self.prefix, self.suffix = url.split(str(self.PLACEHOLDER), 1)
+
+    def for_pk(self, pk):
+        return f'{self.prefix}{pk}{self.suffix}'
+
+
+def row_urls(**viewnames):
+    """Return ``{name: RowUrl}`` for the given view names."""
+    return {name: RowUrl(viewname) for name, viewname in viewnames.items()}
+
+
+class ChainedResults:
+    """
+    Several querysets paginated as one list, one after the other.
+
+    Only the querysets a page overlaps are sliced, so listing the live
+    rows followed by the archived ones costs one ``COUNT`` per queryset
+    and at most one query per queryset and page.
+    """
+
+    def __init__(self, *querysets):
+        self.querysets = querysets
+        self._counts = None
+
+    def counts(self):
+        if self._counts is None:
+            self._counts = [queryset.count() for queryset in self.querysets]
+        return self._counts
+
+    def count(self):
+        return sum(self.counts())
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        for queryset in self.querysets:
+            yield from queryset
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        rows = []
+        offset = 0
+        for queryset, count in zip(self.querysets, self.counts()):
+            if stop is not None and stop <= offset:
+                break
+            first = max(start - offset, 0)
+            last = count if stop is None else min(stop - offset, count)
+            if first < last:
+                rows.extend(queryset[first:last])
+            offset += count
+        return rows
+
+
+def stream_rows(request, template_name, context, rows_name, rows,
+                rows_template, chunk_size=100):
+    """
+    Render ``template_name`` as a streaming response.
+
+    The page is rendered with a placeholder in ``context[rows_name]``;
+    everything before the placeholder is sent first. ``rows`` is then
+    read ``chunk_size`` at a time and each chunk is rendered through
+    ``rows_template`` (which loops over ``rows_name``) and sent, followed
+    by the rest of the page. The template should output ``rows_name``
+    where the rows go when ``streaming`` is true.
+    """
+    marker = uuid.uuid4().hex
+    html = render_to_string(
+        template_name, {**context, rows_name: marker, 'streaming': True}, request
+    )
+    head, tail = html.split(marker, 1)
+    template = get_template(rows_template)
+
+    def generate():
+        yield head
+        iterator = rows.iterator(chunk_size=chunk_size)
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            # Let the rows template render its empty state.
+            yield template.render({**context, rows_name: []}, request)
+        while chunk:
+            yield template.render({**context, rows_name: chunk}, request)
+            chunk = list(islice(iterator, chunk_size))
+        yield tail
+
+    return StreamingHttpResponse(generate())
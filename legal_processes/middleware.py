@@ -0,0 +1,96 @@
+"""
+Response compression for requests served without the nginx front end.
+"""
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - Brotli is in requirements.txt
+    brotli = None
+
+re_accepts_br = _lazy_re_compile(r"\bbr\b")
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+)
+
+# Pages may carry CSRF tokens and other secrets next to reflected input;
+# they keep Django's gzip, padded with a random-length filename against
+# BREACH. Brotli has no such padding and is used for the other types.
+GZIP_ONLY_TYPES = ('text/html',)
+
+# Favour speed over ratio for dynamic responses.
+BROTLI_QUALITY = 5
+
+
+def brotli_sequence(sequence):
+    """Compress an iterator of chunks, flushing after each one."""
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for item in sequence:
+        data = compressor.process(item) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress text responses with brotli or gzip, whichever the client
+    accepts (brotli first). HTML is always gzipped, with the BREACH
+    mitigation of ``GZipMiddleware``.
+
+    Controlled by ``RESPONSE_COMPRESSION``. Responses shorter than
+    ``RESPONSE_COMPRESSION_MIN_SIZE`` bytes and binary content (Excel
+    exports, images) are sent as is. Streaming responses are compressed
+    chunk by chunk, so they keep streaming.
+    """
+
+    def process_response(self, request, response):
+        if not settings.RESPONSE_COMPRESSION:
+            return response
+        if not response.streaming and (
+            len(response.content) < settings.RESPONSE_COMPRESSION_MIN_SIZE
+        ):
+            return response
+        content_type = response.get('Content-Type', '')
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        ae = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if (
+            brotli is None
+            or content_type.startswith(GZIP_ONLY_TYPES)
+            or getattr(response, 'is_async', False)
+            or not re_accepts_br.search(ae)
+        ):
+            return super().process_response(request, response)
+
+        if response.has_header('Content-Encoding'):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if response.streaming:
+            response.streaming_content = brotli_sequence(response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            compressed_content = brotli.compress(
+                response.content, quality=BROTLI_QUALITY
+            )
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(response.content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
@@ -0,0 +1,121 @@
+"""
+Range partitions on a timestamp column (PostgreSQL only).
+
+Tables partitioned this way keep a default partition for stray rows and
+one partition per period (month or year) named ``<table>_pYYYY[_MM]``.
+Creating the next periods ahead of time keeps the default partition
+empty, and expired periods are removed with a cheap ``DROP TABLE``.
+
+PostgreSQL refuses to create a period while the default partition holds
+rows of it (written before the period was created, say when the job
+creating them did not run). ``ensure`` then swaps in an empty default
+partition and inserts the old one's rows back through the table, which
+routes them to the new period.
+"""
+
+import datetime
+import re
+
+from django.db import connection as default_connection
+from django.db import transaction
+
+
+def is_partitioned(connection=None):
+    """Tell whether ``connection`` uses the partitioned tables."""
+    connection = connection or default_connection
+    return connection.vendor == 'postgresql'
+
+
+class RangePartitions:
+    """Partitions of ``table`` covering ``months`` months each (1 or 12)."""
+
+    def __init__(self, table, column, months=1):
+        self.table = table
+        self.column = column
+        self.months = months
+        self.default = f'{table}_default'
+        suffix = r'_p(\d{4})' if months == 12 else r'_p(\d{4})_(\d{2})'
+        self._pattern = re.compile(rf'^{table}{suffix}$')
+
+    def start(self, day):
+        """Return the first day of the period containing ``day``."""
+        month = 1 if self.months == 12 else day.month
+        return datetime.date(day.year, month, 1)
+
+    def next(self, start):
+        """Return the first day of the period after ``start``."""
+        months = start.year * 12 + start.month - 1 + self.months
+        return datetime.date(months // 12, months % 12 + 1, 1)
+
+    def name(self, start):
+        """Return the partition name of the period starting on ``start``."""
+        if self.months == 12:
+            return f'{self.table}_p{start.year:04d}'
+        return f'{self.table}_p{start.year:04d}_{start.month:02d}'
+
+    def ensure(self, ahead=3, today=None, connection=None):
+        """Create the partitions from the current period to ``ahead`` periods on."""
+        connection = connection or default_connection
+        if not is_partitioned(connection):
+            return []
+        start = self.start(today or datetime.date.today())
+        created = []
+        for _ in range(ahead + 1):
+            self._create(self.name(start), start, self.next(start), connection)
+            created.append(self.name(start))
+            start = self.next(start)
+        return created
+
+    def _create(self, name, start, end, connection):
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s)', [name])
+            if cursor.fetchone()[0] is not None:
+                return
+            # Writers wait until the period exists, so no row can reach
+            # the default partition between the check and the swap.
+            cursor.execute(f'LOCK TABLE {self.default} IN ACCESS EXCLUSIVE MODE')
+            cursor.execute(
+                f'SELECT EXISTS (SELECT 1 FROM {self.default} '
+                f'WHERE {self.column} >= %s AND {self.column} < %s)',
+                [start, end],
+            )
+            stray = cursor.fetchone()[0]
+            if stray:
+                # Rows are copied rather than deleted: tables may refuse
+                # deletes (the change log is append-only).
+                cursor.execute(f'ALTER TABLE {self.table} DETACH PARTITION {self.default}')
+                cursor.execute(f'ALTER TABLE {self.default} RENAME TO {self.default}_old')
+                cursor.execute(f'CREATE TABLE {self.default} PARTITION OF {self.table} DEFAULT')
+            cursor.execute(
+                f'CREATE TABLE {name} PARTITION OF {self.table} '
+                f'FOR VALUES FROM (%s) TO (%s)',
+                [start, end],
+            )
+            if stray:
+                cursor.execute(f'INSERT INTO {self.table} SELECT * FROM {self.default}_old')
+                cursor.execute(f'DROP TABLE {self.default}_old')
+
+    def drop(self, before, connection=None):
+        """Drop the partitions that end on or before ``before``."""
+        connection = connection or default_connection
+        if not is_partitioned(connection):
+            return []
+        dropped = []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT child.relname FROM pg_inherits '
+                'JOIN pg_class parent ON pg_inherits.inhparent = parent.oid '
+                'JOIN pg_class child ON pg_inherits.inhrelid = child.oid '
+                'WHERE parent.relname = %s',
+                [self.table],
+            )
+            for (name,) in cursor.fetchall():
+                match = self._pattern.match(name)
+                if not match:
+                    continue
+                month = int(match[2]) if self.months != 12 else 1
+                start = datetime.date(int(match[1]), month, 1)
+                if self.next(start) <= before:
+                    cursor.execute(f'DROP TABLE {name}')
+                    dropped.append(name)
+        return sorted(dropped)
@@ -41,15 +41,22 @@ INSTALLED_APPS = [
     'crispy_bootstrap5',
     'processes',
     'parties',
+    'reports',
+    'audit',
+    'archive',
+    'feed',
+    'legal_processes',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'legal_processes.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'audit.middleware.AuditMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -60,8 +67,14 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compile each template once per process, in DEBUG as well.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -85,9 +98,80 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default='postgres'),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5432'),
+        # Seconds a connection is reused across requests (0 closes it after
+        # every request); compare settings with scripts/loadtest.py.
+        'CONN_MAX_AGE': config('CONN_MAX_AGE', default=0, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+# Cache
+# Use a backend shared by all workers (e.g. Redis) in production, so that
+# permission changes reach every process at once.
+CACHE_BACKEND = config(
+    'CACHE_BACKEND',
+    default='django.core.cache.backends.locmem.LocMemCache'
+)
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': config('CACHE_LOCATION', default=''),
     }
 }
 
+# Authentication
+AUTHENTICATION_BACKENDS = ['legal_processes.auth.CachedModelBackend']
+
+# Cache holding each user's resolved permissions (None: not cached), and
+# for how long (seconds) an entry may be served. A per-process cache would
+# keep serving a revoked permission in the workers that did not handle the
+# change, so permissions are only cached in a shared backend.
+PERMISSIONS_CACHE = None if CACHE_BACKEND.endswith('LocMemCache') else 'default'
+PERMISSIONS_CACHE_TIMEOUT = config('PERMISSIONS_CACHE_TIMEOUT', default=300, cast=int)
+
+# List pages cache the HTML of each row, keyed by its pk and updated_at
+# (and, for processes, the lookup names shown, so renames show up in every
+# worker without a shared cache).
+LIST_FRAGMENT_CACHE = config('LIST_FRAGMENT_CACHE', default=True, cast=bool)
+LIST_FRAGMENT_CACHE_ALIAS = 'default'
+LIST_FRAGMENT_CACHE_TIMEOUT = config('LIST_FRAGMENT_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Compress HTML/JSON responses in the app too, for clients that reach
+# gunicorn directly instead of going through nginx.
+RESPONSE_COMPRESSION = config('RESPONSE_COMPRESSION', default=True, cast=bool)
+RESPONSE_COMPRESSION_MIN_SIZE = config('RESPONSE_COMPRESSION_MIN_SIZE', default=1024, cast=int)
+
+# Stream the process detail page: the process block is sent before the
+# parties are read.
+PROCESS_DETAIL_STREAMING = config('PROCESS_DETAIL_STREAMING', default=True, cast=bool)
+
+# Typeahead suggestions: values per kind, and the per-process LRU of hot
+# prefixes (entries, and seconds a cached list may be served).
+SUGGEST_LIMIT = 8
+SUGGEST_CACHE_SIZE = config('SUGGEST_CACHE_SIZE', default=2048, cast=int)
+SUGGEST_CACHE_TIMEOUT = config('SUGGEST_CACHE_TIMEOUT', default=60, cast=int)
+
+# Change feed: events per response, and how long (seconds) a long poll
+# may wait for new events, checking every FEED_POLL_INTERVAL seconds.
+# A waiting request holds its worker: with the default sync workers a few
+# consumers would block the site, so long polls are off (0) unless the
+# feed is served by gthread/ASGI workers or a worker pool of its own.
+FEED_PAGE_SIZE = 500
+FEED_MAX_WAIT = config('FEED_MAX_WAIT', default=0, cast=int)
+FEED_POLL_INTERVAL = 0.5
+
+# Processes per page of the delta API (processes changed since a watermark),
+# and how recent (seconds) a change may be before delta reads return it:
+# longer than any write transaction, which may still commit older stamps.
+CHANGES_PAGE_SIZE = 500
+DELTA_SAFETY_LAG = config('DELTA_SAFETY_LAG', default=300, cast=int)
+
+# Admin change lists of big tables number their pages with the planner's
+# row estimate instead of a count past this many rows (PostgreSQL only).
+ADMIN_ESTIMATED_COUNT_THRESHOLD = config(
+    'ADMIN_ESTIMATED_COUNT_THRESHOLD', default=100000, cast=int
+)
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -117,6 +201,9 @@ USE_I18N = True
 
 USE_TZ = True
 
+# Locale used to format money values (action values are in BRL).
+CURRENCY_LOCALE = 'pt-br'
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
@@ -130,6 +217,12 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Columnar analytics snapshot (see reports/snapshot.py)
+REPORTS_SNAPSHOT_DIR = config(
+    'REPORTS_SNAPSHOT_DIR',
+    default=str(BASE_DIR / 'var' / 'snapshot')
+)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
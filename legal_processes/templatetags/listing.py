@@ -0,0 +1,63 @@
+"""
+Template tags for list pages.
+"""
+
+from django import template
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
+
+register = template.Library()
+
+
+@register.filter
+def for_pk(row_url, pk):
+    """``{{ urls.detail|for_pk:obj.pk }}`` -> URL of ``obj``."""
+    return row_url.for_pk(pk)
+
+
+class RowCacheNode(template.Node):
+    def __init__(self, nodelist, fragment_name, vary_on):
+        self.nodelist = nodelist
+        self.fragment_name = fragment_name
+        self.vary_on = vary_on
+
+    def render(self, context):
+        if not settings.LIST_FRAGMENT_CACHE:
+            return self.nodelist.render(context)
+        key = make_template_fragment_key(
+            self.fragment_name, [var.resolve(context) for var in self.vary_on]
+        )
+        cache = caches[settings.LIST_FRAGMENT_CACHE_ALIAS]
+        value = cache.get(key)
+        if value is None:
+            value = self.nodelist.render(context)
+            cache.set(key, value, settings.LIST_FRAGMENT_CACHE_TIMEOUT)
+        return value
+
+
+@register.tag
+def cache_row(parser, token):
+    """
+    Cache the HTML of one list row::
+
+        {% cache_row 'process_row' process.pk process.updated_at %}
+            ...
+        {% endcache_row %}
+
+    The key is the fragment name plus the given values, which should
+    change whenever anything shown in the row does. Disabled (the row is
+    always rendered) when ``LIST_FRAGMENT_CACHE`` is off.
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' takes a fragment name and at least one value to vary on."
+        )
+    nodelist = parser.parse(('endcache_row',))
+    parser.delete_first_token()
+    return RowCacheNode(
+        nodelist,
+        bits[1].strip('\'"'),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+    )
@@ -0,0 +1,65 @@
+"""
+Helpers to batch side effects until the surrounding transaction commits.
+"""
+
+import threading
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+class CommitBuffer:
+    """
+    Collect items during a transaction and hand them to ``flush`` once.
+
+    Every thread gets its own buffer. The first item added inside a
+    transaction registers a single ``transaction.on_commit`` callback, so
+    a transaction that touches a thousand rows produces one flush instead
+    of a thousand. Outside of an atomic block the flush runs immediately.
+    If the transaction rolls back, the pending items are discarded along
+    with the callback.
+    """
+
+    def __init__(self, flush, using=DEFAULT_DB_ALIAS):
+        self._flush = flush
+        self._using = using
+        self._local = threading.local()
+
+    def add(self, item):
+        """Queue ``item`` for the current transaction."""
+        self.extend([item])
+
+    def extend(self, items):
+        """Queue several items for the current transaction."""
+        items = list(items)
+        if not items:
+            return
+        connection = connections[self._using]
+        if not connection.in_atomic_block:
+            self._flush(items)
+            return
+        pending = getattr(self._local, 'pending', None)
+        if pending is None or not self._is_registered(connection, pending):
+            pending = _Pending(self._flush)
+            self._local.pending = pending
+            transaction.on_commit(pending.run, using=self._using)
+        pending.items.extend(items)
+
+    @staticmethod
+    def _is_registered(connection, pending):
+        """Check that ``pending`` is still waiting for the commit."""
+        if pending.done:
+            return False
+        return any(entry[1] == pending.run for entry in connection.run_on_commit)
+
+
+class _Pending:
+    def __init__(self, flush):
+        self.flush = flush
+        self.items = []
+        self.done = False
+
+    def run(self):
+        self.done = True
+        items, self.items = self.items, []
+        if items:
+            self.flush(items)
@@ -13,6 +13,9 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('processes/', include('processes.urls')),
     path('parties/', include('parties.urls')),
+    path('reports/', include('reports.urls')),
+    path('archive/', include('archive.urls')),
+    path('feed/', include('feed.urls')),
     path('accounts/', include('django.contrib.auth.urls')),
 ]
 
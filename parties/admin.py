@@ -2,14 +2,87 @@
 Admin configuration for parties application.
 """
 
-from django.contrib import admin
-from .models import Party
+from django import forms
+from django.contrib import admin, messages
+from django.db.models import Count
+from django.utils import timezone
+from legal_processes.admin_list import AutocompleteFilter, LargeTableAdminMixin
+from .forms import BasePartyFormSet, PartyDocumentMixin
+from .models import DuplicateCluster, DuplicateMember, Party, Person
+
+
+class PartyAdminForm(PartyDocumentMixin, forms.ModelForm):
+    """Admin form editing the party's document as plain text."""
+
+    document = forms.CharField(max_length=20)
+
+    class Meta:
+        model = Party
+        exclude = ['person']
+
+
+class PartyInlineForm(PartyAdminForm):
+    """One party row of the process admin page."""
+
+    def clean(self):
+        # Duplicated documents are checked by the formset, for every row
+        # at once.
+        return forms.ModelForm.clean(self)
+
+
+class PartyInline(admin.TabularInline):
+    """Parties on the process admin page, saved in bulk."""
+
+    model = Party
+    form = PartyInlineForm
+    formset = BasePartyFormSet
+    fields = [
+        'name',
+        'document',
+        'category',
+        'email',
+        'phone',
+    ]
+    extra = 1
+
+
+@admin.register(Person)
+class PersonAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """Admin configuration for Person model."""
+
+    list_display = [
+        'name',
+        'document',
+        'document_type',
+        'created_at',
+    ]
+
+    list_filter = [
+        'document_type',
+    ]
+
+    search_fields = [
+        'name',
+        'document',
+        'document_digits',
+    ]
+
+    readonly_fields = [
+        'document_digits',
+        'document_type',
+        'created_at',
+        'updated_at',
+    ]
+
+    ordering = ['name']
 
 
 @admin.register(Party)
-class PartyAdmin(admin.ModelAdmin):
+class PartyAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Admin configuration for Party model."""
     
+    form = PartyAdminForm
+
     list_display = [
         'name',
         'document',
@@ -22,13 +95,18 @@ class PartyAdmin(admin.ModelAdmin):
     
     list_filter = [
         'category',
-        'process',
+        'person__document_type',
+        ('process', AutocompleteFilter),
         'created_at',
     ]
+
+    autocomplete_fields = [
+        'process',
+    ]
     
     search_fields = [
         'name',
-        'document',
+        'person__document',
         'process__process_number',
     ]
     
@@ -68,5 +146,94 @@ class PartyAdmin(admin.ModelAdmin):
     ordering = ['name']
     
     def get_queryset(self, request):
-        """Optimize queryset with related process."""
-        return super().get_queryset(request).select_related('process')
+        """Optimize queryset with related process and person."""
+        return super().get_queryset(request).select_related('process', 'person')
+
+
+class DuplicateMemberInline(admin.TabularInline):
+    """People of a duplicate cluster, with their number of parties."""
+
+    model = DuplicateMember
+    fields = ['person', 'document', 'party_count', 'score']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('person').annotate(
+            party_count=Count('person__parties')
+        )
+
+    @admin.display(description='Document')
+    def document(self, obj):
+        return obj.person.formatted_document
+
+    @admin.display(description='Parties')
+    def party_count(self, obj):
+        return obj.party_count
+
+
+@admin.register(DuplicateCluster)
+class DuplicateClusterAdmin(admin.ModelAdmin):
+    """Review of the clusters written by ``find_duplicates``."""
+
+    list_display = [
+        'id',
+        'names',
+        'size',
+        'score',
+        'status',
+        'created_at',
+    ]
+
+    list_filter = [
+        'status',
+    ]
+
+    search_fields = [
+        'people__name',
+        '=people__document_digits',
+    ]
+
+    readonly_fields = [
+        'key',
+        'score',
+        'size',
+        'status',
+        'created_at',
+        'reviewed_at',
+    ]
+
+    inlines = [DuplicateMemberInline]
+
+    actions = ['confirm_selected', 'reject_selected']
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_queryset(self, request):
+        """Read the member names of a page with one query."""
+        return super().get_queryset(request).prefetch_related('people')
+
+    @admin.display(description='People')
+    def names(self, obj):
+        return ' / '.join(sorted({person.name for person in obj.people.all()}))
+
+    def review(self, request, queryset, status):
+        updated = queryset.update(status=status, reviewed_at=timezone.now())
+        self.message_user(
+            request, f'{updated} clusters marked as {status}.', messages.SUCCESS
+        )
+
+    @admin.action(permissions=['change'], description='Confirm selected clusters')
+    def confirm_selected(self, request, queryset):
+        """Mark the clusters as real duplicates."""
+        self.review(request, queryset, DuplicateCluster.CONFIRMED)
+
+    @admin.action(permissions=['change'], description='Reject selected clusters')
+    def reject_selected(self, request, queryset):
+        """Mark the clusters as different people; they are not suggested again."""
+        self.review(request, queryset, DuplicateCluster.REJECTED)
@@ -0,0 +1,196 @@
+"""
+Finding the people and companies recorded more than once.
+
+A ``Person`` is keyed by its document digits, so "ACME LTDA" filed under
+two CNPJs of the same company, or under a mistyped document, ends up as
+two people. Comparing every pair of people is quadratic; candidates are
+blocked first, and only people sharing a block key are compared:
+
+* ``doc``: the CNPJ root (first eight digits: the company, without its
+  branch), or the document digits without leading zeros;
+* ``name``: one band of the MinHash signature of the name's character
+  trigrams. Names whose trigram sets have Jaccard similarity ``s`` share
+  at least one band with probability ``1 - (1 - s**ROWS)**BANDS``: about
+  0.98 at 0.8, 0.4 at 0.5 and 0.06 at 0.3.
+
+Blocks of up to ``MAX_BLOCK`` people are compared pairwise; bigger ones
+(a common name, a company with hundreds of branches) compare each person
+with its ``WINDOW`` next neighbours in name order. Pairs scoring at least
+the threshold are joined into clusters.
+
+Everything here is a pure function of ``(id, name, digits, type)`` rows,
+without database access, so ``find_duplicates`` runs signatures and
+scoring in worker processes.
+"""
+
+import re
+import unicodedata
+import zlib
+from itertools import combinations
+
+import numpy as np
+
+BANDS = 8
+ROWS = 4
+NUM_PERM = BANDS * ROWS
+MAX_BLOCK = 100
+WINDOW = 10
+DEFAULT_THRESHOLD = 0.8
+
+# Document evidence: the same CNPJ root is the same company.
+SAME_ROOT_SCORE = 0.9
+
+# Tokens that do not tell two names apart.
+IGNORED_TOKENS = {
+    'LTDA', 'SA', 'ME', 'EPP', 'EIRELI', 'CIA',
+    'DA', 'DE', 'DO', 'DAS', 'DOS', 'E',
+}
+
+# Universal hashing ``(a * x + b) % PRIME`` of the 32-bit trigram hashes;
+# fixed seeds keep signatures equal across worker processes and runs.
+PRIME = (1 << 61) - 1
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, 1 << 29, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 1 << 29, NUM_PERM, dtype=np.uint64)
+
+
+def normalize_name(name):
+    """Uppercase ASCII words of ``name``, without legal suffixes."""
+    text = unicodedata.normalize('NFKD', name or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c)).upper()
+    # "S.A.", "S/A" and "Ltda." become single words first.
+    text = re.sub(r'[./]', '', text)
+    words = re.findall(r'[A-Z0-9]+', text)
+    return ' '.join(word for word in words if word not in IGNORED_TOKENS)
+
+
+def trigrams(name):
+    """Character trigrams of a normalized name."""
+    if len(name) < 3:
+        return {name} if name else set()
+    return {name[i:i + 3] for i in range(len(name) - 2)}
+
+
+def minhash(shingles):
+    """``NUM_PERM`` MinHash values of a non-empty set of strings."""
+    x = np.fromiter(
+        (zlib.crc32(shingle.encode()) for shingle in shingles),
+        dtype=np.uint64, count=len(shingles),
+    )
+    return ((_A[:, None] * x[None, :] + _B[:, None]) % PRIME).min(axis=1)
+
+
+def document_key(digits, kind):
+    """Block key of a document: the CNPJ root, or the significant digits."""
+    if kind == 'CNPJ':
+        return f'root:{digits[:8]}'
+    return f'doc:{digits.lstrip("0")}' if digits.lstrip('0') else None
+
+
+def block_keys(rows):
+    """
+    Return ``[(record, keys)]`` for ``(id, name, digits, type)`` rows.
+
+    ``record`` is what ``score`` compares; ``keys`` are its block keys.
+    """
+    result = []
+    for pk, name, digits, kind in rows:
+        normalized = normalize_name(name)
+        record = (pk, normalized, digits, kind)
+        keys = []
+        key = document_key(digits, kind)
+        if key:
+            keys.append(key)
+        shingles = trigrams(normalized)
+        if shingles:
+            signature = minhash(shingles)
+            for band in range(BANDS):
+                chunk = signature[band * ROWS:(band + 1) * ROWS]
+                keys.append(f'name:{band}:{zlib.crc32(chunk.tobytes())}')
+        result.append((record, keys))
+    return result
+
+
+def score(a, b):
+    """Likelihood in [0, 1] that records ``a`` and ``b`` are one party."""
+    _, name_a, digits_a, kind_a = a
+    _, name_b, digits_b, kind_b = b
+    if kind_a == kind_b == 'CPF' and digits_a != digits_b:
+        # Two valid CPFs are two people, whatever their names.
+        return 0.0
+    if digits_a.lstrip('0') == digits_b.lstrip('0'):
+        return 1.0
+    shingles_a, shingles_b = trigrams(name_a), trigrams(name_b)
+    union = shingles_a | shingles_b
+    similarity = len(shingles_a & shingles_b) / len(union) if union else 0.0
+    if kind_a == kind_b == 'CNPJ' and digits_a[:8] == digits_b[:8]:
+        return max(similarity, SAME_ROOT_SCORE)
+    return similarity
+
+
+def candidate_pairs(block):
+    """Pairs of records of a block worth scoring."""
+    if len(block) <= MAX_BLOCK:
+        return combinations(block, 2)
+    # Sorted neighbourhood: similar names end up close to each other.
+    block = sorted(block, key=lambda record: record[1])
+    return (
+        (block[i], block[j])
+        for i in range(len(block))
+        for j in range(i + 1, min(i + 1 + WINDOW, len(block)))
+    )
+
+
+def score_blocks(blocks, threshold=DEFAULT_THRESHOLD):
+    """Return ``[(id_a, id_b, score)]`` of the block pairs at ``threshold``."""
+    pairs = []
+    seen = set()
+    for block in blocks:
+        for a, b in candidate_pairs(block):
+            # Similar names share several bands: score them once.
+            pair = (min(a[0], b[0]), max(a[0], b[0]))
+            if pair in seen:
+                continue
+            seen.add(pair)
+            value = score(a, b)
+            if value >= threshold:
+                pairs.append((*pair, value))
+    return pairs
+
+
+def group_blocks(keyed):
+    """Return the blocks with more than one record from ``block_keys`` output."""
+    blocks = {}
+    for record, keys in keyed:
+        for key in keys:
+            blocks.setdefault(key, []).append(record)
+    return [block for block in blocks.values() if len(block) > 1]
+
+
+def clusters(pairs):
+    """
+    Join scored pairs into clusters (connected components).
+
+    Returns ``[(score, {id: score})]``: the best pair score of the
+    cluster and, per member, the best score of its own pairs.
+    """
+    parent = {}
+
+    def find(pk):
+        root = pk
+        while parent.setdefault(root, root) != root:
+            root = parent[root]
+        while parent[pk] != root:
+            parent[pk], pk = root, parent[pk]
+        return root
+
+    best = {}
+    for a, b, value in pairs:
+        parent[find(a)] = find(b)
+        best[a] = max(best.get(a, 0.0), value)
+        best[b] = max(best.get(b, 0.0), value)
+
+    members = {}
+    for pk in best:
+        members.setdefault(find(pk), {})[pk] = best[pk]
+    return [(max(group.values()), group) for group in members.values()]
@@ -0,0 +1,59 @@
+"""
+Test data factories for people and parties (requires ``factory_boy``).
+"""
+
+import factory
+
+from processes.factories import ProcessFactory
+
+from .models import Party, Person, document_digits as digits_of
+
+
+class PersonFactory(factory.django.DjangoModelFactory):
+    """Person with a unique CPF-shaped document."""
+
+    class Meta:
+        model = Person
+        django_get_or_create = ['document_digits']
+
+    name = factory.Sequence(lambda n: f'Pessoa {n}')
+    document = factory.Sequence(
+        lambda n: f'{n // 10**8 % 1000:03d}.{n // 10**5 % 1000:03d}.'
+                  f'{n // 100 % 1000:03d}-{n % 100:02d}'
+    )
+    # Set here too, for people written with ``bulk_create``.
+    document_digits = factory.LazyAttribute(lambda person: digits_of(person.document))
+    document_type = Person.CPF
+
+
+class PartyFactory(factory.django.DjangoModelFactory):
+    """Party of a new process, pointing at a new person."""
+
+    class Meta:
+        model = Party
+
+    process = factory.SubFactory(ProcessFactory)
+    person = factory.SubFactory(PersonFactory)
+    name = factory.LazyAttribute(lambda party: party.person.name)
+    category = 'EXEQUENTE'
+
+    @classmethod
+    def create_bulk(cls, processes, per_process, **kwargs):
+        """
+        Insert ``per_process`` parties (and their people) per process.
+
+        People and parties are written with one multi-row ``INSERT``
+        each; no signals are sent.
+        """
+        people = Person.objects.bulk_create(
+            PersonFactory.build_batch(len(processes) * per_process),
+            batch_size=500,
+        )
+        parties = [
+            cls.build(process=process, person=person, **kwargs)
+            for process, person in zip(
+                (process for process in processes for _ in range(per_process)),
+                people,
+            )
+        ]
+        return Party.objects.bulk_create(parties, batch_size=500)
@@ -3,12 +3,103 @@ Forms for parties application.
 """
 
 from django import forms
-from .models import Party
+from django.db import transaction
+from django.urls import reverse_lazy
+from django.utils import timezone
+from django.utils.html import format_html
+from processes import activity
+from processes.models import Process
+from processes.signals import post_bulk_save
+from .models import Party, PersonCache, document_digits
 
 
-class PartyForm(forms.ModelForm):
+class ProcessSearchInput(forms.Widget):
+    """
+    A process picked by searching its number, instead of a ``<select>``.
+
+    The pk goes in a hidden input; the visible box asks
+    ``processes:process_search`` for numbers starting with what was typed
+    (see ``parties/includes/process_search_script.html``). Rendering
+    reads only the number of the selected process.
+    """
+
+    search_url = reverse_lazy('processes:process_search')
+
+    def format_value(self, value):
+        return '' if value is None else str(value)
+
+    def id_for_label(self, id_):
+        return f'{id_}_search' if id_ else id_
+
+    def render(self, name, value, attrs=None, renderer=None):
+        attrs = self.build_attrs(self.attrs, attrs)
+        input_id = attrs.get('id') or f'id_{name}'
+        value = self.format_value(value)
+        number = ''
+        if value:
+            number = Process.objects.filter(pk=value).values_list(
+                'process_number', flat=True
+            ).first() or ''
+        return format_html(
+            '<input type="hidden" name="{name}" value="{value}" id="{id}">'
+            '<input type="search" class="form-control" id="{id}_search" '
+            'value="{number}" autocomplete="off" list="{id}_options" '
+            'placeholder="Número do processo" data-process-search="{url}" '
+            'data-target="{id}">'
+            '<datalist id="{id}_options"></datalist>',
+            name=name, value=value, id=input_id, number=number,
+            url=self.search_url,
+        )
+
+
+class PartyDocumentMixin:
+    """
+    Edit ``Party.document`` (stored on the person) as a plain form field.
+
+    The model's ``(process, person)`` uniqueness is not validated by a
+    form without a ``person`` field, so ``clean`` checks the document
+    against the other parties of the process instead.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.initial.setdefault('document', self.instance.document)
+
+    def clean(self):
+        """Reject a second party for the same document in one process."""
+        cleaned_data = super().clean()
+        process = cleaned_data.get('process')
+        document = cleaned_data.get('document')
+        if process and document:
+            duplicates = Party.objects.filter(
+                process=process,
+                person__document_digits=document_digits(document),
+            ).exclude(pk=self.instance.pk)
+            if duplicates.exists():
+                raise forms.ValidationError(
+                    "Party with this Process and Document already exists."
+                )
+        return cleaned_data
+
+    def _post_clean(self):
+        super()._post_clean()
+        if 'document' in self.cleaned_data:
+            self.instance.document = self.cleaned_data['document']
+
+
+class PartyForm(PartyDocumentMixin, forms.ModelForm):
     """Form for creating and editing parties."""
-    
+
+    # Stored on the party's person; see ``Party.document``.
+    document = forms.CharField(
+        max_length=20,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'CPF ou CNPJ'
+        })
+    )
+
     class Meta:
         model = Party
         fields = [
@@ -24,10 +115,6 @@ class PartyForm(forms.ModelForm):
                 'class': 'form-control',
                 'placeholder': 'Nome da parte'
             }),
-            'document': forms.TextInput(attrs={
-                'class': 'form-control',
-                'placeholder': 'CPF ou CNPJ'
-            }),
             'category': forms.Select(attrs={'class': 'form-select'}),
             'email': forms.EmailInput(attrs={
                 'class': 'form-control',
@@ -37,22 +124,15 @@ class PartyForm(forms.ModelForm):
                 'class': 'form-control',
                 'placeholder': '(11) 99999-9999'
             }),
-            'process': forms.Select(attrs={
-                'class': 'form-select',
-                'placeholder': 'Selecione o processo'
-            }),
+            'process': ProcessSearchInput(),
         }
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Ordenar processos por número para facilitar a seleção
-        try:
-            from processes.models import Process
-            self.fields['process'].queryset = Process.objects.all().order_by('process_number')
-            self.fields['process'].empty_label = "Selecione um processo"
-        except ImportError:
-            # Fallback caso haja problema de importação
-            pass
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        # The form field has read the process by pk already; the model
+        # field would check that it exists with a second query.
+        exclude.add('process')
+        return exclude
 
     def clean_document(self):
         """Validate document format."""
@@ -76,4 +156,126 @@ class PartyForm(forms.ModelForm):
         email = self.cleaned_data['email']
         if email and '@' not in email:
             raise forms.ValidationError("Por favor, insira um endereço de email válido.")
-        return email 
\ No newline at end of file
+        return email
+
+class ProcessPartyForm(PartyForm):
+    """One party row of the formset on the process form."""
+
+    class Meta(PartyForm.Meta):
+        fields = [
+            'name',
+            'document',
+            'category',
+            'email',
+            'phone',
+        ]
+
+    def clean(self):
+        # Duplicated documents are checked by the formset, for every row
+        # at once.
+        return forms.ModelForm.clean(self)
+
+
+class BasePartyFormSet(forms.BaseInlineFormSet):
+    """
+    Parties of one process, written together.
+
+    Duplicated documents are found in memory (plus one query for the
+    parties of the process outside the formset) and every submit is one
+    ``DELETE``, one ``INSERT`` and one ``UPDATE`` in a single transaction.
+    ``processes.signals.post_bulk_save`` keeps the change log in step.
+    """
+
+    # Columns written for changed parties; ``bulk_update`` does not set
+    # ``updated_at`` by itself.
+    UPDATE_FIELDS = ['name', 'person', 'category', 'email', 'phone', 'updated_at']
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('person')
+
+    def saved_forms(self):
+        """The forms whose party is created or changed."""
+        deleted = set(map(id, self.deleted_forms)) if self.can_delete else set()
+        return [
+            form for form in self.forms
+            if form.has_changed() and id(form) not in deleted
+        ]
+
+    def clean(self):
+        super().clean()
+        if any(self.errors):
+            return
+        kept = [
+            form for form in self.forms
+            if form.has_changed() or form.instance.pk is not None
+        ]
+        if self.can_delete:
+            kept = [form for form in kept if not self._should_delete_form(form)]
+        seen = set(self.other_documents())
+        for form in kept:
+            digits = document_digits(form.cleaned_data.get('document'))
+            if digits in seen:
+                form.add_error(
+                    'document', 'This document is already a party of this process.'
+                )
+            seen.add(digits)
+
+    def other_documents(self):
+        """Document digits of the parties of the process not in the formset."""
+        if self.instance.pk is None:
+            return []
+        return Party.objects.filter(process=self.instance).exclude(
+            pk__in=[form.instance.pk for form in self.initial_forms]
+        ).values_list('person__document_digits', flat=True)
+
+    def save(self, commit=True):
+        """Delete, create and update the parties in bulk."""
+        saved = self.saved_forms()
+        self.new_objects = []
+        self.changed_objects = []
+        self.deleted_objects = [
+            form.instance for form in self.deleted_forms
+            if form.instance.pk is not None
+        ] if self.can_delete else []
+        # The process's ``last_activity_at`` moves once for all the rows.
+        with transaction.atomic(), activity.deferred():
+            if self.deleted_objects:
+                # Few rows: the cascade collector sends ``post_delete``.
+                Party.objects.filter(
+                    pk__in=[party.pk for party in self.deleted_objects]
+                ).delete()
+
+            cache = PersonCache()
+            cache.prefetch({
+                form.cleaned_data['document']: form.cleaned_data['name']
+                for form in saved
+            })
+            now = timezone.now()
+            for form in saved:
+                party = form.instance
+                party.process = self.instance
+                party.resolve_person(cache)
+                if party.pk is None:
+                    self.new_objects.append(party)
+                else:
+                    party.updated_at = now
+                    self.changed_objects.append((party, form.changed_data))
+
+            if self.new_objects:
+                Party.objects.bulk_create(self.new_objects)
+                post_bulk_save.send(sender=Party, instances=self.new_objects, created=True)
+            changed = [party for party, _ in self.changed_objects]
+            if changed:
+                Party.objects.bulk_update(changed, self.UPDATE_FIELDS)
+                post_bulk_save.send(sender=Party, instances=changed, created=False)
+        return self.new_objects + changed
+
+
+PartyFormSet = forms.inlineformset_factory(
+    Process,
+    Party,
+    form=ProcessPartyForm,
+    formset=BasePartyFormSet,
+    extra=3,
+    can_delete=True,
+)
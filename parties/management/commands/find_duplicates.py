@@ -0,0 +1,93 @@
+"""
+Management command to find people and companies recorded more than once.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from django.core.management.base import BaseCommand, CommandError
+
+from legal_processes.chunking import CHUNK_SIZE, iterate_values
+from parties import dedup
+from parties.models import DuplicateCluster, Person
+
+
+def chunked(items, size):
+    """Split ``items`` into lists of ``size``."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class Command(BaseCommand):
+    """Command to write the probable duplicate people to the review table."""
+
+    help = 'Find duplicate and near-duplicate people and write clusters for review'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes computing signatures and scores (default: CPU count)'
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=dedup.DEFAULT_THRESHOLD,
+            help=f'Lowest pair score kept (default: {dedup.DEFAULT_THRESHOLD})'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help=f'People or blocks per worker task (default: {CHUNK_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command execution."""
+        if options['workers'] < 1 or options['chunk_size'] < 1:
+            raise CommandError('--workers and --chunk-size must be at least 1.')
+        if not 0 < options['threshold'] <= 1:
+            raise CommandError('--threshold must be in (0, 1].')
+        size = options['chunk_size']
+
+        rows = iterate_values(
+            Person.objects.order_by(), 'id', 'name', 'document_digits', 'document_type'
+        )
+        if options['workers'] == 1:
+            pairs = self.find_pairs(map, rows, size, options['threshold'])
+        else:
+            # The workers only run the pure functions of ``parties.dedup``;
+            # reading and writing stay in this process.
+            with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+                pairs = self.find_pairs(executor.map, rows, size, options['threshold'])
+
+        found = dedup.clusters(pairs)
+        written = DuplicateCluster.objects.replace_pending(found)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(pairs)} duplicate pairs, {written} clusters written for review'
+        ))
+
+    def find_pairs(self, map_, rows, size, threshold):
+        """Block ``rows`` and score the candidate pairs with ``map_``."""
+        keyed = []
+        for part in map_(dedup.block_keys, chunked(rows, size)):
+            keyed.extend(part)
+        self.stdout.write(f'{len(keyed)} people read')
+        blocks = dedup.group_blocks(keyed)
+        self.stdout.write(f'{len(blocks)} candidate blocks')
+
+        pairs = {}
+        tasks = chunked(blocks, max(1, size // 10))
+        for part in map_(dedup.score_blocks, tasks, repeat(threshold)):
+            for a, b, value in part:
+                pairs[a, b] = max(pairs.get((a, b), 0.0), value)
+        return [(a, b, value) for (a, b), value in pairs.items()]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:02
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parties', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Person',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Canonical name', max_length=200)),
+                ('document', models.CharField(help_text='Document number (CPF, CNPJ, etc.) as first entered', max_length=20, validators=[django.core.validators.RegexValidator(message='Document must contain only numbers, dots, hyphens and slashes', regex='^[\\d\\.\\-/]+$')])),
+                ('document_digits', models.CharField(help_text='Document digits, without formatting', max_length=20, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Person',
+                'verbose_name_plural': 'People',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='party',
+            name='name',
+            field=models.CharField(help_text='Party name as listed in the process', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='party',
+            name='person',
+            field=models.ForeignKey(db_index=False, help_text='Person or company this party refers to', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='parties', to='parties.person'),
+        ),
+    ]
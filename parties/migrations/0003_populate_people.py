@@ -0,0 +1,74 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:02
+
+import re
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def document_digits(document):
+    document = (document or '').strip()
+    return re.sub(r'\D', '', document) or document
+
+
+def populate_people(apps, schema_editor):
+    """Create one person per document and link the parties to it."""
+    Party = apps.get_model('parties', 'Party')
+    Person = apps.get_model('parties', 'Person')
+
+    # First spelling of each document (lowest party id) wins.
+    people = {}
+    spellings = {}
+    stored = (
+        Party.objects.order_by('id')
+        .values_list('document', 'name')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    for document, name in stored:
+        digits = document_digits(document)
+        people.setdefault(digits, (document.strip(), name))
+        spellings.setdefault(digits, set()).add(document)
+
+    Person.objects.bulk_create(
+        [
+            Person(name=name, document=document, document_digits=digits)
+            for digits, (document, name) in people.items()
+        ],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    person_ids = dict(Person.objects.values_list('document_digits', 'id'))
+    for digits, documents in spellings.items():
+        # One UPDATE per distinct document, not per party.
+        Party.objects.filter(document__in=documents).update(
+            person_id=person_ids[digits]
+        )
+
+    # Differently formatted documents in the same process now point at
+    # the same person; keep the oldest party of each pair.
+    seen = set()
+    duplicates = []
+    linked = (
+        Party.objects.order_by('id')
+        .values_list('id', 'process_id', 'person_id')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    for party_id, process_id, person_id in linked:
+        if (process_id, person_id) in seen:
+            duplicates.append(party_id)
+        else:
+            seen.add((process_id, person_id))
+    for start in range(0, len(duplicates), BATCH_SIZE):
+        Party.objects.filter(id__in=duplicates[start:start + BATCH_SIZE]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parties', '0002_person'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_people, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_documents(apps, schema_editor):
+    """Copy the person documents back into the parties."""
+    Party = apps.get_model('parties', 'Party')
+    Person = apps.get_model('parties', 'Person')
+    for person_id, document in Person.objects.values_list('id', 'document'):
+        Party.objects.filter(person_id=person_id).update(document=document)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parties', '0003_populate_people'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='party',
+            unique_together=set(),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, populate_documents),
+        # Give the column a default first, so that unapplying this
+        # migration can re-add it to a table that already has rows.
+        migrations.AlterField(
+            model_name='party',
+            name='document',
+            field=models.CharField(default='', help_text='Document number (CPF, CNPJ, etc.)', max_length=20),
+        ),
+        migrations.RemoveField(
+            model_name='party',
+            name='document',
+        ),
+        migrations.AlterField(
+            model_name='party',
+            name='person',
+            field=models.ForeignKey(db_index=False, help_text='Person or company this party refers to', on_delete=django.db.models.deletion.PROTECT, related_name='parties', to='parties.person'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='party',
+            unique_together={('process', 'person')},
+        ),
+        migrations.AddIndex(
+            model_name='party',
+            index=models.Index(fields=['person', 'process'], include=('category',), name='party_person_process_idx'),
+        ),
+    ]
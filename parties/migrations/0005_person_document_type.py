@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:40
+
+from django.db import migrations, models
+
+
+def populate_document_types(apps, schema_editor):
+    """Classify the people created before the column existed."""
+    Person = apps.get_model('parties', 'Person')
+    Person.objects.filter(document_digits__regex=r'^[0-9]{11}$').update(document_type='CPF')
+    Person.objects.filter(document_digits__regex=r'^[0-9]{14}$').update(document_type='CNPJ')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parties', '0004_party_person_link'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='person',
+            name='document_type',
+            field=models.CharField(choices=[('CPF', 'CPF'), ('CNPJ', 'CNPJ'), ('OTHER', 'Other')], default='OTHER', help_text='Kind of document', max_length=5),
+        ),
+        migrations.RunPython(populate_document_types, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def create_index(apps, schema_editor):
+    """Index ``UPPER(name)`` with ``text_pattern_ops`` for name typeahead (PostgreSQL)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS parties_person_name_prefix_idx '
+        'ON parties_person (UPPER(name) text_pattern_ops)'
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS parties_person_name_prefix_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parties', '0005_person_document_type'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parties', '0006_person_name_prefix_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DuplicateCluster',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='Digest of the member ids', max_length=40, unique=True)),
+                ('score', models.FloatField(help_text='Best score of a pair in the cluster (0 to 1)')),
+                ('size', models.PositiveIntegerField(help_text='Number of people in the cluster')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('rejected', 'Rejected')], db_index=True, default='pending', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('reviewed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Duplicate cluster',
+                'verbose_name_plural': 'Duplicate clusters',
+                'ordering': ['-score', 'id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DuplicateMember',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(help_text="Best score of this person's pairs")),
+                ('cluster', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='members', to='parties.duplicatecluster')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='duplicate_memberships', to='parties.person')),
+            ],
+            options={
+                'verbose_name': 'Duplicate member',
+                'verbose_name_plural': 'Duplicate members',
+                'ordering': ['-score', 'person__name'],
+                'unique_together': {('cluster', 'person')},
+            },
+        ),
+        migrations.AddField(
+            model_name='duplicatecluster',
+            name='people',
+            field=models.ManyToManyField(related_name='duplicate_clusters', through='parties.DuplicateMember', to='parties.person'),
+        ),
+    ]
@@ -2,13 +2,186 @@
 Models for parties application.
 """
 
-from django.db import models
+import hashlib
+import re
+
+from django.db import models, transaction
 from django.core.validators import RegexValidator
 
 
+def document_digits(document):
+    """Return the identity key of a document: its digits only."""
+    document = (document or '').strip()
+    return re.sub(r'\D', '', document) or document
+
+
+def document_type(digits):
+    """Return the ``Person.DOCUMENT_TYPE_CHOICES`` key for ``digits``."""
+    if digits.isdigit():
+        if len(digits) == 11:
+            return Person.CPF
+        if len(digits) == 14:
+            return Person.CNPJ
+    return Person.OTHER
+
+
+class PersonManager(models.Manager):
+    """Manager for the canonical people and companies."""
+
+    def resolve(self, document, name=''):
+        """Return the person for ``document``, creating it if needed."""
+        document = (document or '').strip()
+        person, _ = self.get_or_create(
+            document_digits=document_digits(document),
+            defaults={'document': document, 'name': name},
+        )
+        return person
+
+    def resolve_many(self, documents):
+        """
+        Return ``{digits: person}`` for ``{document: name}``.
+
+        Known people are read with one query and the new ones written
+        with one ``INSERT``.
+        """
+        wanted = {}
+        for document, name in documents.items():
+            document = (document or '').strip()
+            wanted.setdefault(document_digits(document), (document, name))
+        people = {
+            person.document_digits: person
+            for person in self.filter(document_digits__in=wanted)
+        }
+        missing = [
+            # ``bulk_create`` skips ``save()``, which derives these two.
+            Person(
+                document=document,
+                name=name,
+                document_digits=digits,
+                document_type=document_type(digits),
+            )
+            for digits, (document, name) in wanted.items()
+            if digits not in people
+        ]
+        if missing:
+            # A concurrent insert of the same person is read back below.
+            self.bulk_create(missing, ignore_conflicts=True)
+            people.update(
+                (person.document_digits, person)
+                for person in self.filter(
+                    document_digits__in=[person.document_digits for person in missing]
+                )
+            )
+        return people
+
+
+class Person(models.Model):
+    """
+    A person or company, identified by the digits of its CPF/CNPJ.
+
+    The same person appears as a party in many processes; each
+    appearance is a ``Party`` row pointing here. ``document_digits`` and
+    ``document_type`` are derived from ``document`` on save.
+    """
+    CPF = 'CPF'
+    CNPJ = 'CNPJ'
+    OTHER = 'OTHER'
+    DOCUMENT_TYPE_CHOICES = [
+        (CPF, 'CPF'),
+        (CNPJ, 'CNPJ'),
+        (OTHER, 'Other'),
+    ]
+
+    name = models.CharField(
+        max_length=200,
+        help_text="Canonical name"
+    )
+    document = models.CharField(
+        max_length=20,
+        validators=[
+            RegexValidator(
+                regex=r'^[\d\.\-/]+$',
+                message='Document must contain only numbers, dots, hyphens and slashes'
+            )
+        ],
+        help_text="Document number (CPF, CNPJ, etc.) as first entered"
+    )
+    document_digits = models.CharField(
+        max_length=20,
+        unique=True,
+        help_text="Document digits, without formatting"
+    )
+    document_type = models.CharField(
+        max_length=5,
+        choices=DOCUMENT_TYPE_CHOICES,
+        default=OTHER,
+        help_text="Kind of document"
+    )
+
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = PersonManager()
+
+    class Meta:
+        verbose_name = "Person"
+        verbose_name_plural = "People"
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name} - {self.formatted_document}"
+
+    def save(self, *args, **kwargs):
+        self.document_digits = document_digits(self.document)
+        self.document_type = document_type(self.document_digits)
+        super().save(*args, **kwargs)
+
+    @property
+    def is_individual(self):
+        """Check if person is an individual (CPF) or company (CNPJ)."""
+        return self.document_type == self.CPF
+
+    @property
+    def formatted_document(self):
+        """Return formatted document number."""
+        doc = self.document_digits
+        if self.document_type == self.CPF:
+            return f"{doc[:3]}.{doc[3:6]}.{doc[6:9]}-{doc[9:]}"
+        elif self.document_type == self.CNPJ:
+            return f"{doc[:2]}.{doc[2:5]}.{doc[5:8]}/{doc[8:12]}-{doc[12:]}"
+        return self.document
+
+
+class PersonCache:
+    """
+    In-memory ``document digits -> person`` cache for bulk imports.
+
+    Meant to live for one import run, like ``processes.models.LookupCache``.
+    """
+
+    def __init__(self):
+        self._rows = {}
+
+    def prefetch(self, documents):
+        """Resolve every ``{document: name}`` at once (see ``resolve_many``)."""
+        self._rows.update(Person.objects.resolve_many(documents))
+
+    def get(self, document, name=''):
+        """Return the person for ``document``."""
+        key = document_digits(document)
+        if key not in self._rows:
+            self._rows[key] = Person.objects.resolve(document, name)
+        return self._rows[key]
+
+
 class Party(models.Model):
     """
     Model to store party information in legal processes.
+
+    A party links a ``Person`` to a process with the category it has
+    there. ``document`` reads and writes the person's document; the person
+    is resolved (and created if new) when the party is saved.
     """
     PARTY_CATEGORY_CHOICES = [
         ('EXEQUENTE', 'Exequente'),
@@ -23,17 +196,15 @@ class Party(models.Model):
     # Basic information
     name = models.CharField(
         max_length=200,
-        help_text="Party name"
+        help_text="Party name as listed in the process"
     )
-    document = models.CharField(
-        max_length=20,
-        validators=[
-            RegexValidator(
-                regex=r'^[\d\.\-/]+$',
-                message='Document must contain only numbers, dots, hyphens and slashes'
-            )
-        ],
-        help_text="Document number (CPF, CNPJ, etc.)"
+    person = models.ForeignKey(
+        Person,
+        on_delete=models.PROTECT,
+        related_name='parties',
+        # Covered by the (person, process) index below.
+        db_index=False,
+        help_text="Person or company this party refers to"
     )
     category = models.CharField(
         max_length=20,
@@ -64,26 +235,196 @@ class Party(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Live rows; see ``archive.models.ArchivedParty``.
+    is_archived = False
+
     class Meta:
         verbose_name = "Party"
         verbose_name_plural = "Parties"
         ordering = ['name']
-        unique_together = ['process', 'document']
+        unique_together = ['process', 'person']
+        indexes = [
+            # Answers "every process of a document" from the index alone
+            # (the category is stored in it on PostgreSQL).
+            models.Index(
+                fields=['person', 'process'],
+                include=['category'],
+                name='party_person_process_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_category_display()}) - {self.process.process_number}"
 
+    @property
+    def document(self):
+        """Document number of the party's person."""
+        if '_pending_document' in self.__dict__:
+            return self.__dict__['_pending_document']
+        return self.person.document if self.person_id else ''
+
+    @document.setter
+    def document(self, value):
+        self.__dict__['_pending_document'] = (value or '').strip()
+
+    def resolve_person(self, cache=None):
+        """Point ``person`` at the document assigned so far."""
+        if '_pending_document' not in self.__dict__:
+            return
+        document = self.__dict__.pop('_pending_document')
+        if self.person_id and self.person.document_digits == document_digits(document):
+            return
+        if cache:
+            self.person = cache.get(document, self.name)
+        else:
+            self.person = Person.objects.resolve(document, self.name)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Keep the values loaded from the database to diff against later."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        # The person, the row and the ``post_save`` receivers (the change
+        # feed) share one transaction.
+        with transaction.atomic(savepoint=False):
+            self.resolve_person()
+            super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+        }
+
     @property
     def is_individual(self):
         """Check if party is an individual (CPF) or company (CNPJ)."""
-        return len(self.document.replace('.', '').replace('-', '').replace('/', '')) == 11
+        return self.person.is_individual
 
     @property
     def formatted_document(self):
         """Return formatted document number."""
-        doc = self.document.replace('.', '').replace('-', '').replace('/', '')
-        if len(doc) == 11:  # CPF
-            return f"{doc[:3]}.{doc[3:6]}.{doc[6:9]}-{doc[9:]}"
-        elif len(doc) == 14:  # CNPJ
-            return f"{doc[:2]}.{doc[2:5]}.{doc[5:8]}/{doc[8:12]}-{doc[12:]}"
-        return self.document
+        return self.person.formatted_document
+
+
+class DuplicateClusterManager(models.Manager):
+    """Manager for the duplicate review table."""
+
+    def replace_pending(self, found):
+        """
+        Replace the pending clusters with ``found``, ``[(score, {id: score})]``.
+
+        Reviewed clusters are kept, and a cluster with the same members
+        as a reviewed one is not suggested again. Returns the number of
+        clusters written.
+        """
+        with transaction.atomic():
+            self.filter(status=DuplicateCluster.PENDING).delete()
+            reviewed = set(self.values_list('key', flat=True))
+            clusters, members = [], []
+            for score, group in found:
+                key = DuplicateCluster.key_for(group)
+                if key in reviewed:
+                    continue
+                cluster = DuplicateCluster(key=key, score=score, size=len(group))
+                clusters.append(cluster)
+                members.append((cluster, group))
+            self.bulk_create(clusters, batch_size=1000)
+            DuplicateMember.objects.bulk_create(
+                [
+                    DuplicateMember(cluster=cluster, person_id=pk, score=value)
+                    for cluster, group in members
+                    for pk, value in group.items()
+                ],
+                batch_size=1000,
+            )
+        return len(clusters)
+
+
+class DuplicateCluster(models.Model):
+    """
+    People that probably are one person or company, for review.
+
+    Written by the ``find_duplicates`` command (see ``parties.dedup``);
+    reviewers confirm or reject a cluster in the admin. Merging confirmed
+    people is left to the reviewer.
+    """
+    PENDING = 'pending'
+    CONFIRMED = 'confirmed'
+    REJECTED = 'rejected'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (CONFIRMED, 'Confirmed'),
+        (REJECTED, 'Rejected'),
+    ]
+
+    key = models.CharField(
+        max_length=40,
+        unique=True,
+        help_text="Digest of the member ids"
+    )
+    score = models.FloatField(
+        help_text="Best score of a pair in the cluster (0 to 1)"
+    )
+    size = models.PositiveIntegerField(
+        help_text="Number of people in the cluster"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        db_index=True
+    )
+    people = models.ManyToManyField(
+        Person,
+        through='DuplicateMember',
+        related_name='duplicate_clusters'
+    )
+
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    reviewed_at = models.DateTimeField(null=True, blank=True)
+
+    objects = DuplicateClusterManager()
+
+    class Meta:
+        verbose_name = "Duplicate cluster"
+        verbose_name_plural = "Duplicate clusters"
+        ordering = ['-score', 'id']
+
+    def __str__(self):
+        return f"Cluster #{self.pk} ({self.size} people, {self.score:.2f})"
+
+    @staticmethod
+    def key_for(ids):
+        """Return the key of a cluster with members ``ids``."""
+        joined = ','.join(str(pk) for pk in sorted(ids))
+        return hashlib.sha1(joined.encode()).hexdigest()
+
+
+class DuplicateMember(models.Model):
+    """A person in a duplicate cluster."""
+
+    cluster = models.ForeignKey(
+        DuplicateCluster,
+        on_delete=models.CASCADE,
+        related_name='members'
+    )
+    person = models.ForeignKey(
+        Person,
+        on_delete=models.CASCADE,
+        related_name='duplicate_memberships'
+    )
+    score = models.FloatField(
+        help_text="Best score of this person's pairs"
+    )
+
+    class Meta:
+        verbose_name = "Duplicate member"
+        verbose_name_plural = "Duplicate members"
+        ordering = ['-score', 'person__name']
+        unique_together = ['cluster', 'person']
+
+    def __str__(self):
+        return f"{self.person} in cluster #{self.cluster_id}"
@@ -0,0 +1,32 @@
+"""
+Signal handlers that move the ``last_activity_at`` of a party's process.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from processes.activity import touch
+from processes.signals import post_bulk_save
+
+from .models import Party
+
+
+@receiver(post_save, sender=Party)
+def touch_on_save(sender, instance, raw=False, **kwargs):
+    """Touch the process of a saved party, and the one it left."""
+    if raw:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    touch([instance.process_id, loaded.get('process_id')])
+
+
+@receiver(post_delete, sender=Party)
+def touch_on_delete(sender, instance, **kwargs):
+    """Touch the process of a deleted party."""
+    touch([instance.process_id])
+
+
+@receiver(post_bulk_save, sender=Party)
+def touch_on_bulk_save(sender, instances, **kwargs):
+    """Touch the processes of parties written in bulk."""
+    touch(instance.process_id for instance in instances)
@@ -4,19 +4,26 @@ Tests for parties application.
 
 import pytest
 from decimal import Decimal
-from django.test import TestCase, Client
+from io import StringIO
+from django.test import TestCase
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from audit.models import ChangeLog
 from processes.models import Process
-from .models import Party
+from . import dedup
+from .models import DuplicateCluster, Party, Person, PersonCache
 
 
 class PartyModelTest(TestCase):
     """Test cases for Party model."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.process = Process.objects.create( # type: ignore
+        cls.process = Process.objects.create( # type: ignore
             process_number='1004030-81.2016.0.00.0008',
             process_class='Execução de Título Extrajudicial',
             subject='Locação de Imóvel',
@@ -24,13 +31,13 @@ class PartyModelTest(TestCase):
             action_value=Decimal('5911.72'),
         )
         
-        self.party = Party.objects.create( # type: ignore
+        cls.party = Party.objects.create( # type: ignore
             name='Eduardo Amoroso',
             document='564.406.360-73',
             category='EXEQUENTE',
             email='eduardo@example.com',
             phone='(11) 99999-9999',
-            process=self.process,
+            process=cls.process,
         )
 
     def test_party_creation(self):
@@ -90,27 +97,27 @@ class PartyModelTest(TestCase):
 class PartyViewsTest(TestCase):
     """Test cases for party views."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.client = Client()
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username='testuser',
             password='testpass123'
         )
-        self.process = Process.objects.create( # type: ignore
+        cls.process = Process.objects.create( # type: ignore
             process_number='1004030-81.2016.0.00.0008',
             process_class='Execução de Título Extrajudicial',
             subject='Locação de Imóvel',
             judge='Mariana',
             action_value=Decimal('5911.72'),
         )
-        self.party = Party.objects.create( # type: ignore
+        cls.party = Party.objects.create( # type: ignore
             name='Eduardo Amoroso',
             document='564.406.360-73',
             category='EXEQUENTE',
             email='eduardo@example.com',
             phone='(11) 99999-9999',
-            process=self.process,
+            process=cls.process,
         )
 
     def test_party_list_view_requires_login(self): 
@@ -198,6 +205,15 @@ class PartyViewsTest(TestCase):
         self.assertEqual(response.status_code, 200) # type: ignore
         self.assertContains(response, 'Eduardo Amoroso')
 
+    def test_search_by_document_digits(self):
+        """Test documents match exactly whatever the formatting typed."""
+        self.client.login(username='testuser', password='testpass123')
+        for search in ('56440636073', '564.406.360-73'):
+            response = self.client.get(reverse('parties:party_list'), {'search': search})
+            self.assertContains(response, 'Eduardo Amoroso')
+        response = self.client.get(reverse('parties:party_list'), {'search': '5644063'})
+        self.assertNotContains(response, 'Eduardo Amoroso')
+
     def test_category_filter(self):
         """Test category filter functionality."""
         self.client.login(username='testuser', password='testpass123')
@@ -284,6 +300,446 @@ class PartyFormsTest(TestCase):
         self.assertIn('Enter a valid email address.', str(form.errors))
 
 
+class ProcessSearchTest(TestCase):
+    """Test cases for picking the process of a party by searching it."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        User.objects.create_superuser(username='admin', password='testpass123')
+        cls.processes = [
+            Process.objects.create( # type: ignore
+                process_number=number,
+                process_class='Execução de Título Extrajudicial',
+                subject='Locação de Imóvel',
+                judge='Mariana',
+                action_value=Decimal('10.00'),
+            )
+            for number in (
+                '1004030-81.2016.0.00.0008',
+                '1004031-64.2016.0.00.0008',
+                '987654-32.2023.8.26.0001',
+            )
+        ]
+
+    def setUp(self):
+        """Log in the superuser."""
+        self.client.login(username='admin', password='testpass123')
+
+    def test_form_page_has_no_process_list(self):
+        """Test the form renders a search box, not every process."""
+        response = self.client.get(reverse('parties:party_create'))
+        self.assertContains(response, 'data-process-search=')
+        self.assertNotContains(response, '987654-32.2023.8.26.0001')
+
+        party = Party.objects.create( # type: ignore
+            name='Eduardo Amoroso', document='564.406.360-73',
+            category='AUTOR', process=self.processes[2],
+        )
+        response = self.client.get(reverse('parties:party_update', args=[party.pk]))
+        self.assertContains(response, 'value="987654-32.2023.8.26.0001"')
+        self.assertNotContains(response, '1004030-81.2016.0.00.0008')
+
+    def test_search_by_number_prefix(self):
+        """Test the endpoint answers with the pks of matching processes."""
+        response = self.client.get(
+            reverse('processes:process_search'), {'q': '100403'}
+        )
+        self.assertEqual(response.json()['results'], [
+            {'id': self.processes[0].pk, 'process_number': '1004030-81.2016.0.00.0008'},
+            {'id': self.processes[1].pk, 'process_number': '1004031-64.2016.0.00.0008'},
+        ])
+        response = self.client.get(reverse('processes:process_search'), {'q': '1'})
+        self.assertEqual(response.json()['results'], [])
+
+    def test_validation_reads_only_the_submitted_process(self):
+        """Test validating the process costs one query by pk."""
+        from .forms import PartyForm
+
+        form = PartyForm({
+            'name': 'Eduardo Amoroso',
+            'document': '564.406.360-73',
+            'category': 'EXEQUENTE',
+            'process': self.processes[1].pk,
+        })
+        # The process by pk, then the duplicate check.
+        with self.assertNumQueries(2):
+            self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['process'], self.processes[1])
+
+        form = PartyForm({
+            'name': 'Eduardo Amoroso',
+            'document': '564.406.360-73',
+            'category': 'EXEQUENTE',
+            'process': 0,
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn('process', form.errors)
+
+
+class PersonTest(TestCase):
+    """Test cases for the canonical people behind parties."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        cls.first = Process.objects.create( # type: ignore
+            process_number='1004030-81.2016.0.00.0008',
+            process_class='Execução de Título Extrajudicial',
+            subject='Locação de Imóvel',
+            judge='Mariana',
+            action_value=Decimal('5911.72'),
+        )
+        cls.second = Process.objects.create( # type: ignore
+            process_number='987654-32.2023.8.26.0001',
+            process_class='Execução de Título Extrajudicial',
+            subject='Locação de Imóvel',
+            judge='Mariana',
+            action_value=Decimal('100.00'),
+        )
+
+    def test_same_document_shares_person(self):
+        """Test parties are deduplicated by document digits."""
+        a = Party.objects.create( # type: ignore
+            name='Eduardo Amoroso', document='564.406.360-73',
+            category='EXEQUENTE', process=self.first,
+        )
+        b = Party.objects.create( # type: ignore
+            name='EDUARDO AMOROSO', document='56440636073',
+            category='REQUERIDO', process=self.second,
+        )
+        self.assertEqual(a.person_id, b.person_id)
+        self.assertEqual(Person.objects.count(), 1)
+        self.assertEqual(b.person.name, 'Eduardo Amoroso')
+        self.assertEqual(b.name, 'EDUARDO AMOROSO')
+
+    def test_changing_document_relinks_party(self):
+        """Test a new document moves the party to another person."""
+        party = Party.objects.create( # type: ignore
+            name='Eduardo Amoroso', document='564.406.360-73',
+            category='EXEQUENTE', process=self.first,
+        )
+        party.document = '10.261.482/0001-97'
+        party.save()
+        party.refresh_from_db()
+        self.assertEqual(party.person.document_digits, '10261482000197')
+        self.assertFalse(party.is_individual)
+
+    def test_document_type(self):
+        """Test the document type is derived on save."""
+        party = Party.objects.create( # type: ignore
+            name='Eduardo Amoroso', document='564.406.360-73',
+            category='EXEQUENTE', process=self.first,
+        )
+        company = Party.objects.create( # type: ignore
+            name='ACME Ltda', document='10.261.482/0001-97',
+            category='EXECUTADA', process=self.first,
+        )
+        self.assertEqual(party.person.document_type, Person.CPF)
+        self.assertEqual(company.person.document_type, Person.CNPJ)
+        self.assertEqual(Person.objects.resolve('123', 'X').document_type, Person.OTHER)
+
+    def test_person_cache(self):
+        """Test each document is resolved once per cache."""
+        cache = PersonCache()
+        person = cache.get('564.406.360-73', 'Eduardo Amoroso')
+        with self.assertNumQueries(0):
+            self.assertEqual(cache.get('56440636073'), person)
+
+    def test_form_rejects_duplicate_document_in_process(self):
+        """Test the (process, document) pair is unique regardless of format."""
+        from .forms import PartyForm
+
+        Party.objects.create( # type: ignore
+            name='Eduardo Amoroso', document='564.406.360-73',
+            category='EXEQUENTE', process=self.first,
+        )
+        form = PartyForm({
+            'name': 'Eduardo Amoroso',
+            'document': '56440636073',
+            'category': 'AUTOR',
+            'process': self.first.pk,
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn('already exists', str(form.errors))
+
+
+class PartyLookupViewTest(TestCase):
+    """Test cases for the document lookup endpoint."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        User.objects.create_user(username='testuser', password='testpass123')
+        cls.processes = [
+            Process.objects.create( # type: ignore
+                process_number=number,
+                process_class='Execução de Título Extrajudicial',
+                subject='Locação de Imóvel',
+                judge='Mariana',
+                action_value=Decimal('10.00'),
+            )
+            for number in ('1004030-81.2016.0.00.0008', '987654-32.2023.8.26.0001')
+        ]
+        for process, category in zip(cls.processes, ('EXEQUENTE', 'RÉU')):
+            Party.objects.create( # type: ignore
+                name='Eduardo Amoroso', document='564.406.360-73',
+                category=category, process=process,
+            )
+
+    def setUp(self):
+        """Log in the test user."""
+        self.client.login(username='testuser', password='testpass123')
+
+    def test_lookup_by_formatted_or_plain_document(self):
+        """Test every process of a document is returned."""
+        for document in ('564.406.360-73', '56440636073'):
+            response = self.client.get(
+                reverse('parties:party_lookup', args=[document])
+            )
+            self.assertEqual(response.status_code, 200) # type: ignore
+            data = response.json()
+            self.assertEqual(data['name'], 'Eduardo Amoroso')
+            self.assertEqual(
+                [(row['id'], row['category']) for row in data['processes']],
+                [(self.processes[0].pk, 'EXEQUENTE'), (self.processes[1].pk, 'RÉU')],
+            )
+
+    def test_lookup_unknown_document(self):
+        """Test unknown documents return 404."""
+        response = self.client.get(
+            reverse('parties:party_lookup', args=['000.000.000-00'])
+        )
+        self.assertEqual(response.status_code, 404) # type: ignore
+
+
+class PartyFormSetTest(TestCase):
+    """Test cases for the parties formset on the process form."""
+
+    PROCESS = {
+        'process_number': '1004030-81.2016.0.00.0008',
+        'status': 'active',
+        'process_type': 'digital',
+        'process_class': 'Execução de Título Extrajudicial',
+        'subject': 'Locação de Imóvel',
+        'judge': 'Mariana',
+        'action_value': '10.00',
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        User.objects.create_superuser(username='admin', password='testpass123')
+
+    def setUp(self):
+        """Log in the superuser."""
+        self.client.login(username='admin', password='testpass123')
+
+    def formset_data(self, rows, initial=0):
+        data = {
+            'parties-TOTAL_FORMS': len(rows),
+            'parties-INITIAL_FORMS': initial,
+            'parties-MIN_NUM_FORMS': 0,
+            'parties-MAX_NUM_FORMS': 1000,
+        }
+        for i, row in enumerate(rows):
+            data.update({f'parties-{i}-{key}': value for key, value in row.items()})
+        return data
+
+    def party_rows(self, count, first=1):
+        return [
+            {'name': f'Parte {n}', 'document': f'{n:011d}', 'category': 'AUTOR'}
+            for n in range(first, first + count)
+        ]
+
+    def create(self, rows, number=PROCESS['process_number']):
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.post(
+                    reverse('processes:process_create'),
+                    {**self.PROCESS, 'process_number': number,
+                     **self.formset_data(rows)},
+                )
+        return response, len(captured)
+
+    def test_create_with_parties_in_constant_queries(self):
+        """Test 15 parties cost the same queries as 3, logged as one entry."""
+        # The first post also creates the lookup rows.
+        self.create(self.party_rows(1), number='1000001-00.2016.0.00.0008')
+        response, few = self.create(
+            self.party_rows(3, first=100), number='1000002-00.2016.0.00.0008'
+        )
+        self.assertEqual(response.status_code, 302) # type: ignore
+        response, many = self.create(self.party_rows(15, first=200))
+        self.assertEqual(response.status_code, 302) # type: ignore
+
+        process = Process.objects.get(process_number=self.PROCESS['process_number'])
+        self.assertEqual(process.parties.count(), 15)
+        self.assertEqual(few, many)
+        entry = ChangeLog.objects.for_object(process).get()
+        self.assertEqual(len(entry.changes['parties.party']), 15)
+
+    def test_duplicate_documents_rejected_in_memory(self):
+        """Test a document repeated in one submit saves nothing."""
+        rows = self.party_rows(2)
+        rows[1]['document'] = '000.000.000-01'
+        response, _ = self.create(rows)
+        self.assertEqual(response.status_code, 200) # type: ignore
+        self.assertContains(response, 'already a party of this process')
+        self.assertFalse(Process.objects.exists())
+
+    def test_update_changes_deletes_and_adds(self):
+        """Test one submit updates, deletes and adds parties."""
+        self.create(self.party_rows(2))
+        process = Process.objects.get()
+        first, second = process.parties.order_by('pk')
+        rows = [
+            {'id': first.pk, 'name': 'Parte Renomeada',
+             'document': first.document, 'category': 'RÉU'},
+            {'id': second.pk, 'name': second.name, 'document': second.document,
+             'category': second.category, 'DELETE': 'on'},
+            {'name': 'Parte Nova', 'document': '10.261.482/0001-97',
+             'category': 'TERCEIRO'},
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('processes:process_update', args=[process.pk]),
+                {**self.PROCESS, **self.formset_data(rows, initial=2)},
+            )
+        self.assertEqual(response.status_code, 302) # type: ignore
+        self.assertEqual(
+            sorted(process.parties.values_list('name', 'category')),
+            [('Parte Nova', 'TERCEIRO'), ('Parte Renomeada', 'RÉU')],
+        )
+        changes = ChangeLog.objects.for_object(process).first().changes['parties.party']
+        self.assertEqual(
+            sorted(row['action'] for row in changes.values()),
+            ['create', 'delete', 'update'],
+        )
+
+    def test_admin_inline(self):
+        """Test the process admin edits parties inline."""
+        self.create(self.party_rows(2))
+        process = Process.objects.get()
+        response = self.client.get(
+            reverse('admin:processes_process_change', args=[process.pk])
+        )
+        self.assertContains(response, 'parties-0-document')
+        self.assertContains(response, 'value="00000000001"')
+
+        first, second = process.parties.order_by('pk')
+        rows = [
+            {'id': first.pk, 'process': process.pk, 'name': first.name,
+             'document': first.document, 'category': first.category},
+            {'id': second.pk, 'process': process.pk, 'name': second.name,
+             'document': second.document, 'category': second.category},
+            {'process': process.pk, 'name': 'Parte Nova',
+             'document': '10.261.482/0001-97', 'category': 'TERCEIRO'},
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('admin:processes_process_change', args=[process.pk]),
+                {**self.PROCESS, **self.formset_data(rows, initial=2)},
+            )
+        self.assertEqual(response.status_code, 302) # type: ignore
+        self.assertEqual(process.parties.count(), 3)
+
+    def test_admin_inline_rejects_duplicate_document(self):
+        """Test a new inline row for a document of the process is an error."""
+        self.create(self.party_rows(1))
+        process = Process.objects.get()
+        party = process.parties.get()
+        rows = [
+            {'id': party.pk, 'process': process.pk, 'name': party.name,
+             'document': party.document, 'category': party.category},
+            {'process': process.pk, 'name': 'Outro Nome',
+             'document': '000.000.000-01', 'category': 'RÉU'},
+        ]
+        response = self.client.post(
+            reverse('admin:processes_process_change', args=[process.pk]),
+            {**self.PROCESS, **self.formset_data(rows, initial=1)},
+        )
+        self.assertEqual(response.status_code, 200) # type: ignore
+        self.assertContains(response, 'This document is already a party of this process.')
+        self.assertEqual(process.parties.count(), 1)
+
+
+class PartyAdminTest(TestCase):
+    """Test cases for the party admin on large tables."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        User.objects.create_superuser(username='admin', password='testpass123')
+        cls.processes = [
+            Process.objects.create( # type: ignore
+                process_number=number,
+                process_class='Execução de Título Extrajudicial',
+                subject='Locação de Imóvel',
+                judge='Mariana',
+                action_value=Decimal('10.00'),
+            )
+            for number in ('1004030-81.2016.0.00.0008', '987654-32.2023.8.26.0001')
+        ]
+        for process, name in zip(cls.processes, ('Eduardo Amoroso', 'Ana Paula')):
+            Party.objects.create( # type: ignore
+                name=name, document='564.406.360-73',
+                category='AUTOR', process=process,
+            )
+
+    def setUp(self):
+        """Log in the superuser."""
+        self.client.login(username='admin', password='testpass123')
+
+    def test_changelist_filters_by_process_through_autocomplete(self):
+        """Test the process filter is a search box, not a list of processes."""
+        url = reverse('admin:parties_party_changelist')
+        response = self.client.get(url)
+        self.assertContains(response, 'autocomplete_filter_process__id__exact')
+        self.assertNotContains(response, '?process__id__exact=')
+        # No second count for the "N total" link.
+        self.assertIsNone(response.context['cl'].full_result_count)
+
+        response = self.client.get(url, {'process__id__exact': self.processes[1].pk})
+        self.assertEqual(
+            list(response.context['cl'].result_list),
+            [Party.objects.get(process=self.processes[1])],
+        )
+        # The selected process is rendered in the box.
+        self.assertContains(
+            response, f'<option value="{self.processes[1].pk}" selected>'
+        )
+
+    def test_change_form_uses_autocomplete(self):
+        """Test the process field does not list every process."""
+        party = Party.objects.get(process=self.processes[0])
+        response = self.client.get(
+            reverse('admin:parties_party_change', args=[party.pk])
+        )
+        self.assertContains(response, 'admin-autocomplete')
+        self.assertNotContains(response, '987654-32.2023.8.26.0001')
+
+    def test_add_rejects_duplicate_document(self):
+        """Test a document already in the process is a form error, not a 500."""
+        response = self.client.post(reverse('admin:parties_party_add'), {
+            'name': 'Outro Nome',
+            'document': '56440636073',
+            'category': 'RÉU',
+            'process': self.processes[0].pk,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Party with this Process and Document already exists.')
+        self.assertEqual(Party.objects.filter(process=self.processes[0]).count(), 1)
+
+    def test_paginator_counts_exactly_below_threshold(self):
+        """Test small results (and sqlite) keep the exact count."""
+        from legal_processes.admin_list import EstimatedCountPaginator
+
+        paginator = EstimatedCountPaginator(Party.objects.order_by('pk'), 1)
+        self.assertIsNone(paginator.estimate())
+        self.assertEqual(paginator.num_pages, 2)
+
+
 @pytest.mark.django_db
 def test_create_party():
     process = Process.objects.create( # type: ignore
@@ -306,3 +762,122 @@ def test_create_party():
     )
     assert party.process == process
     assert party.name == "Fulano de Tal"
+
+
+class DeduplicationTest(TestCase):
+    """Test cases for finding duplicate people."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        User.objects.create_superuser(username='admin', password='testpass123')
+        cls.people = {
+            key: Person.objects.create(name=name, document=document) # type: ignore
+            for key, name, document in (
+                ('acme', 'ACME LTDA', '11.222.333/0001-81'),
+                ('acme_variant', 'Acme Ltda.', '99.888.777/0001-00'),
+                ('acme_branch', 'Acme Comércio e Serviços', '11.222.333/0002-62'),
+                ('jose', 'José da Silva', '111.444.777-35'),
+                ('jose_other', 'Jose da Silva', '529.982.247-25'),
+                ('maria', 'Maria Souza', '1234'),
+                ('maria_padded', 'Maria Souza', '01234'),
+                ('bank', 'Banco Bandeira', '10.261.482/0001-97'),
+            )
+        }
+
+    def setUp(self):
+        """Log in."""
+        self.client.login(username='admin', password='testpass123')
+
+    def clusters(self):
+        return sorted(
+            sorted(cluster.people.values_list('pk', flat=True))
+            for cluster in DuplicateCluster.objects.all()
+        )
+
+    def expected(self, *groups):
+        return sorted(sorted(self.people[key].pk for key in group) for group in groups)
+
+    def test_normalize_name(self):
+        """Test accents, punctuation and legal suffixes are ignored."""
+        self.assertEqual(dedup.normalize_name('Banco do Brasil S.A.'), 'BANCO BRASIL')
+        self.assertEqual(dedup.normalize_name('Acme Ltda.'), dedup.normalize_name('ACME LTDA'))
+        self.assertEqual(dedup.normalize_name('Comércio S/A'), 'COMERCIO')
+
+    def test_score(self):
+        """Test documents outweigh names where they tell people apart."""
+        record = ('pk', 'JOSE SILVA', '11144477735', 'CPF')
+        self.assertEqual(dedup.score(record, ('pk', 'JOSE SILVA', '52998224725', 'CPF')), 0.0)
+        self.assertEqual(dedup.score(record, ('pk', 'J SILVA', '11144477735', 'OTHER')), 1.0)
+        self.assertEqual(
+            dedup.score(
+                ('pk', 'ACME', '11222333000181', 'CNPJ'),
+                ('pk', 'ACME COMERCIO', '11222333000262', 'CNPJ'),
+            ),
+            dedup.SAME_ROOT_SCORE,
+        )
+
+    def test_similar_names_share_a_block(self):
+        """Test near-identical names land in a common MinHash band."""
+        (_, keys_a), (_, keys_b), (_, keys_c) = dedup.block_keys([
+            (1, 'Eduardo Amoroso Pereira', '', 'OTHER'),
+            (2, 'Eduardo Amoroso Pereira.', '', 'OTHER'),
+            (3, 'Banco Bandeira', '', 'OTHER'),
+        ])
+        self.assertTrue(set(keys_a) & set(keys_b))
+        self.assertFalse(set(keys_a) & set(keys_c))
+
+    def test_large_block_compares_neighbours(self):
+        """Test a block past ``MAX_BLOCK`` is not compared pairwise."""
+        block = [(pk, f'NAME {pk:04d}', str(pk), 'OTHER') for pk in range(dedup.MAX_BLOCK + 1)]
+        pairs = list(dedup.candidate_pairs(block))
+        self.assertLess(len(pairs), (dedup.MAX_BLOCK + 1) * dedup.WINDOW)
+
+    def test_command_writes_clusters(self):
+        """Test the command clusters duplicates and keeps distinct people apart."""
+        call_command('find_duplicates', workers=1, stdout=StringIO())
+        self.assertEqual(
+            self.clusters(),
+            self.expected(('acme', 'acme_variant', 'acme_branch'), ('maria', 'maria_padded')),
+        )
+
+    def test_parallel_run_matches(self):
+        """Test worker processes find the same clusters."""
+        call_command('find_duplicates', workers=2, chunk_size=3, stdout=StringIO())
+        self.assertEqual(
+            self.clusters(),
+            self.expected(('acme', 'acme_variant', 'acme_branch'), ('maria', 'maria_padded')),
+        )
+
+    def test_rerun_keeps_reviews(self):
+        """Test a rejected cluster is kept and not suggested again."""
+        call_command('find_duplicates', workers=1, stdout=StringIO())
+        maria = DuplicateCluster.objects.get(people=self.people['maria'])
+        maria.status = DuplicateCluster.REJECTED
+        maria.save()
+
+        call_command('find_duplicates', workers=1, stdout=StringIO())
+        self.assertEqual(DuplicateCluster.objects.count(), 2)
+        self.assertEqual(
+            DuplicateCluster.objects.get(people=self.people['maria']).pk, maria.pk
+        )
+
+    def test_admin_review(self):
+        """Test the review list shows the names and the actions mark clusters."""
+        call_command('find_duplicates', workers=1, stdout=StringIO())
+        url = reverse('admin:parties_duplicatecluster_changelist')
+        response = self.client.get(url)
+        self.assertContains(response, 'Maria Souza')
+
+        cluster = DuplicateCluster.objects.get(people=self.people['maria'])
+        self.client.post(url, {
+            'action': 'confirm_selected', '_selected_action': [cluster.pk],
+        })
+        cluster.refresh_from_db()
+        self.assertEqual(cluster.status, DuplicateCluster.CONFIRMED)
+        self.assertIsNotNone(cluster.reviewed_at)
+
+        response = self.client.get(
+            reverse('admin:parties_duplicatecluster_change', args=[cluster.pk])
+        )
+        self.assertContains(response, self.people['maria_padded'].document)
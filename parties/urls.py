@@ -13,4 +13,5 @@ urlpatterns = [
     path('<int:pk>/', views.party_detail, name='party_detail'),
     path('<int:pk>/update/', views.party_update, name='party_update'),
     path('<int:pk>/delete/', views.party_delete, name='party_delete'),
+    path('lookup/<path:document>/', views.party_lookup, name='party_lookup'),
 ] 
\ No newline at end of file
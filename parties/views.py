@@ -7,29 +7,46 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
 from django.db.models import Q
-from .models import Party
+from django.http import Http404, JsonResponse
+from archive.models import ArchivedParty
+from legal_processes.listing import ChainedResults, row_urls
+from .models import Party, Person, document_digits
 from .forms import PartyForm
 
 
-@login_required
-def party_list(request):
-    """Display list of parties with search and pagination."""
-    search_query = request.GET.get('search', '')
-    category_filter = request.GET.get('category', '')
-    
-    parties = Party.objects.all()
-    
-    # Apply search filter
+def filter_parties(parties, search_query, category_filter):
+    """Apply the list search and filters to live or archived parties."""
     if search_query:
-        parties = parties.filter(
+        search = (
             Q(name__icontains=search_query) |
-            Q(document__icontains=search_query) |
             Q(process__process_number__icontains=search_query)
         )
-    
-    # Apply category filter
+        digits = document_digits(search_query)
+        if digits.isdigit():
+            # Indexed exact match, whatever the formatting typed.
+            search |= Q(person__document_digits=digits)
+        parties = parties.filter(search)
     if category_filter:
         parties = parties.filter(category=category_filter)
+    return parties
+
+
+@login_required
+def party_list(request):
+    """Display list of parties with search and pagination."""
+    search_query = request.GET.get('search', '')
+    category_filter = request.GET.get('category', '')
+    include_archived = bool(request.GET.get('include_archived'))
+    
+    parties = filter_parties(
+        Party.objects.select_related('person', 'process'), search_query, category_filter
+    )
+    if include_archived:
+        # Archived rows come after the live ones.
+        parties = ChainedResults(parties, filter_parties(
+            ArchivedParty.objects.select_related('person', 'process'),
+            search_query, category_filter,
+        ))
     
     # Pagination
     paginator = Paginator(parties, 20)
@@ -40,7 +57,15 @@ def party_list(request):
         'page_obj': page_obj,
         'search_query': search_query,
         'category_filter': category_filter,
+        'include_archived': include_archived,
         'category_choices': Party.PARTY_CATEGORY_CHOICES,
+        'urls': row_urls(
+            detail='parties:party_detail',
+            update='parties:party_update',
+            delete='parties:party_delete',
+            process_detail='processes:process_detail',
+            archived_process_detail='archive:archived_process_detail',
+        ),
     }
     
     return render(request, 'parties/party_list.html', context)
@@ -49,7 +74,9 @@ def party_list(request):
 @login_required
 def party_detail(request, pk):
     """Display party details."""
-    party = get_object_or_404(Party, pk=pk)
+    party = get_object_or_404(
+        Party.objects.select_related('person', 'process'), pk=pk
+    )
     
     context = {
         'party': party,
@@ -58,6 +85,37 @@ def party_detail(request, pk):
     return render(request, 'parties/party_detail.html', context)
 
 
+@login_required
+def party_lookup(request, document):
+    """Return every process a CPF/CNPJ takes part in, as JSON."""
+    try:
+        person = Person.objects.get(document_digits=document_digits(document))
+    except Person.DoesNotExist:
+        raise Http404("No party with this document.")
+
+    # Served by the (person, process) index; no party rows are read.
+    links = (
+        Party.objects.filter(person=person)
+        .order_by('process_id')
+        .values_list('process_id', 'category')
+    )
+    categories = dict(Party.PARTY_CATEGORY_CHOICES)
+    processes = [
+        {
+            'id': process_id,
+            'category': category,
+            'category_display': categories.get(category, category),
+        }
+        for process_id, category in links
+    ]
+
+    return JsonResponse({
+        'document': person.formatted_document,
+        'name': person.name,
+        'processes': processes,
+    })
+
+
 @login_required
 def party_create(request):
     """Create a new party."""
@@ -0,0 +1,45 @@
+"""
+Keeping ``Process.last_activity_at`` in step with the parties.
+
+A save of the process moves the column itself (``auto_now``); changes of
+its parties move it through ``touch``, called by the receivers in
+``parties.signals``. Inside ``deferred()`` the ids are collected and
+touched with one ``UPDATE`` when the block ends, so an import or a
+formset saving many parties of one process costs one statement.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .models import Process
+
+# Process ids collected by ``deferred()``, or None.
+_pending = ContextVar('activity_pending', default=None)
+
+
+def touch(ids):
+    """Mark the processes ``ids`` as changed now."""
+    ids = {pk for pk in ids if pk is not None}
+    if not ids:
+        return
+    pending = _pending.get()
+    if pending is not None:
+        pending.update(ids)
+    else:
+        Process.objects.filter(pk__in=ids).touch()
+
+
+@contextmanager
+def deferred():
+    """Touch the processes collected in the block once, at its end."""
+    if _pending.get() is not None:
+        yield
+        return
+    token = _pending.set(set())
+    try:
+        yield
+        ids = _pending.get()
+    finally:
+        _pending.reset(token)
+    if ids:
+        Process.objects.filter(pk__in=ids).touch()
@@ -2,14 +2,64 @@
 Admin configuration for legal processes application.
 """
 
-from django.contrib import admin
-from .models import Process
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.template.response import TemplateResponse
+from legal_processes.admin_list import LargeTableAdminMixin
+from parties.admin import PartyInline
+from parties.models import Party
+from .bulk import bulk_delete
+from .forms import LookupNamesMixin
+from .models import (
+    Court,
+    District,
+    Judge,
+    Jurisdiction,
+    Process,
+    ProcessClass,
+    Subject,
+)
+
+
+class ProcessAdminForm(LookupNamesMixin, forms.ModelForm):
+    """Admin form editing the lookup-backed attributes as plain text."""
+
+    process_class = forms.CharField(max_length=200)
+    subject = forms.CharField(max_length=200)
+    judge = forms.CharField(max_length=100)
+    court = forms.CharField(max_length=200, required=False)
+    jurisdiction = forms.CharField(max_length=200, required=False)
+    district = forms.CharField(max_length=200, required=False)
+
+    class Meta:
+        model = Process
+        exclude = [
+            f'{field}_ref' for field in Process.LOOKUP_FIELDS
+        ]
+
+
+@admin.register(ProcessClass, Subject, Judge, Court, Jurisdiction, District)
+class LookupAdmin(admin.ModelAdmin):
+    """Admin configuration for the process lookup tables."""
+
+    list_display = [
+        'name',
+    ]
+
+    search_fields = [
+        'name',
+    ]
+
+    ordering = ['name']
 
 
 @admin.register(Process)
-class ProcessAdmin(admin.ModelAdmin):
+class ProcessAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Admin configuration for Process model."""
-    
+
+    form = ProcessAdminForm
+
     list_display = [
         'process_number',
         'process_class',
@@ -29,10 +79,10 @@ class ProcessAdmin(admin.ModelAdmin):
     
     search_fields = [
         'process_number',
-        'process_class',
-        'subject',
-        'judge',
-        'court',
+        'process_class_ref__name',
+        'subject_ref__name',
+        'judge_ref__name',
+        'court_ref__name',
     ]
     
     readonly_fields = [
@@ -79,7 +129,46 @@ class ProcessAdmin(admin.ModelAdmin):
     )
     
     ordering = ['-created_at']
+
+    inlines = [PartyInline]
+
+    actions = ['bulk_delete_selected']
+
+    def get_actions(self, request):
+        """Replace the stock delete action, which loads every party."""
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    @admin.action(
+        permissions=['delete'],
+        description='Delete selected processes and their parties',
+    )
+    def bulk_delete_selected(self, request, queryset):
+        """Delete the selected processes in chunks, after a confirmation."""
+        if request.POST.get('post'):
+            deleted, parties = bulk_delete(queryset)
+            self.message_user(
+                request,
+                f'Deleted {deleted} processes and {parties} parties.',
+                messages.SUCCESS,
+            )
+            return None
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Are you sure?',
+            'opts': self.model._meta,
+            'count': queryset.count(),
+            'party_count': Party.objects.filter(process__in=queryset).count(),
+            'select_across': request.POST.get('select_across') == '1',
+            'selected': request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        }
+        return TemplateResponse(
+            request, 'admin/processes/process/bulk_delete_confirmation.html', context
+        )
     
     def get_queryset(self, request):
-        """Optimize queryset with related parties."""
-        return super().get_queryset(request).prefetch_related('parties')
+        """Join the lookup names shown in the list."""
+        return super().get_queryset(request).with_lookups()
@@ -0,0 +1,95 @@
+"""
+Chunked bulk updates and deletes of processes.
+
+Rows are handled in chunks of primary keys taken in ascending order
+(``legal_processes.chunking.keyset_chunks``), each chunk in its own
+short transaction, so locks are held briefly and memory stays flat
+however many rows match. Updates are one ``UPDATE`` per chunk. Parties
+are deleted before their processes with raw ``DELETE ... WHERE id IN
+(...)`` statements: no instances are loaded and no per-row signals are
+sent. Receivers of ``processes.signals`` keep the change log and reports
+in step.
+"""
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from legal_processes.chunking import keyset_chunks
+from parties.models import Party
+
+from .models import Process
+from .signals import post_bulk_update, pre_bulk_delete, pre_bulk_update
+
+CHUNK_SIZE = 500
+
+
+def _delete_rows(model, ids):
+    """Delete the rows ``ids`` of ``model`` with one statement."""
+    pre_bulk_delete.send(sender=model, ids=ids)
+    qn = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {qn(model._meta.db_table)} '
+            f'WHERE {qn(model._meta.pk.column)} IN ({placeholders})',
+            ids,
+        )
+        return cursor.rowcount
+
+
+def bulk_delete(queryset, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Delete the processes of ``queryset`` and their parties in chunks.
+
+    ``progress`` is called with ``(processes, parties)`` deleted so far
+    after each chunk. Returns the same pair of totals.
+    """
+    processes = parties = 0
+    for process_ids in keyset_chunks(queryset, chunk_size):
+        for party_ids in keyset_chunks(
+            Party.objects.filter(process_id__in=process_ids), chunk_size
+        ):
+            with transaction.atomic():
+                parties += _delete_rows(Party, party_ids)
+            if progress is not None:
+                progress(processes, parties)
+        with transaction.atomic():
+            # Lock the processes so no party can be added to them until
+            # they are gone, then delete any added since the loop above.
+            list(
+                Process.objects.filter(pk__in=process_ids)
+                .select_for_update().values_list('pk', flat=True)
+            )
+            late = list(
+                Party.objects.filter(process_id__in=process_ids)
+                .values_list('pk', flat=True)
+            )
+            if late:
+                parties += _delete_rows(Party, late)
+            processes += _delete_rows(Process, process_ids)
+        if progress is not None:
+            progress(processes, parties)
+    return processes, parties
+
+
+def bulk_update(queryset, values, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Set ``values`` (``{attname: value}``) on the processes of ``queryset``.
+
+    Each chunk is one ``UPDATE`` that also sets ``updated_at`` and
+    ``last_activity_at``.
+    ``progress`` is called with the number of processes updated so far.
+    Returns the total.
+    """
+    updated = 0
+    for ids in keyset_chunks(queryset, chunk_size):
+        with transaction.atomic():
+            pre_bulk_update.send(sender=Process, ids=ids, values=values)
+            now = timezone.now()
+            updated += Process.objects.filter(pk__in=ids).update(
+                updated_at=now, last_activity_at=now, **values
+            )
+            post_bulk_update.send(sender=Process, ids=ids, values=values)
+        if progress is not None:
+            progress(updated)
+    return updated
@@ -0,0 +1,57 @@
+"""
+Parsing of CNJ process numbers (``NNNNNNN-DD.AAAA.J.TR.OOOO``).
+
+The parts are the sequence, two check digits, the filing year, the
+judiciary segment, the tribunal and the originating court. The check
+digits are ``98 - (NNNNNNN AAAA J TR OOOO 00 mod 97)`` (CNJ Resolution
+65/2008, ISO 7064 MOD 97-10).
+"""
+
+import re
+from collections import namedtuple
+
+# Formatted (a shorter sequence is zero-padded) or as the 20 bare digits.
+NUMBER_PATTERN = re.compile(
+    r'(?<!\d)(\d{1,7})-(\d{2})\.(\d{4})\.(\d)\.(\d{2})\.(\d{4})(?!\d)'
+)
+DIGITS_PATTERN = re.compile(r'^(\d{7})(\d{2})(\d{4})(\d)(\d{2})(\d{4})$')
+
+
+class CNJNumber(namedtuple(
+    'CNJNumber', ['sequence', 'check_digits', 'year', 'segment', 'tribunal', 'origin']
+)):
+    """The parts of a process number, as integers."""
+
+    __slots__ = ()
+
+    @property
+    def is_valid(self):
+        """Whether the check digits match the other parts."""
+        return self.check_digits == check_digits(
+            self.sequence, self.year, self.segment, self.tribunal, self.origin
+        )
+
+    def __str__(self):
+        return (f'{self.sequence:07d}-{self.check_digits:02d}.{self.year:04d}.'
+                f'{self.segment}.{self.tribunal:02d}.{self.origin:04d}')
+
+
+def check_digits(sequence, year, segment, tribunal, origin):
+    """Return the check digits of a number made of these parts."""
+    base = f'{sequence:07d}{year:04d}{segment}{tribunal:02d}{origin:04d}00'
+    return 98 - int(base) % 97
+
+
+def parse(number):
+    """Return the parts of ``number``, or ``None`` if it is not a CNJ number."""
+    number = (number or '').strip()
+    match = DIGITS_PATTERN.match(number) or NUMBER_PATTERN.fullmatch(number)
+    if match is None:
+        return None
+    return CNJNumber(*map(int, match.groups()))
+
+
+def find(text):
+    """Return the first CNJ number written in ``text`` (``''`` if none)."""
+    match = NUMBER_PATTERN.search(text or '')
+    return match.group(0) if match else ''
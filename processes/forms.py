@@ -3,12 +3,58 @@ Forms for legal processes application.
 """
 
 from django import forms
+from .delta import decode_cursor
 from .models import Process
 
 
-class ProcessForm(forms.ModelForm):
+def lookup_name_field(required=True, max_length=200, placeholder=None):
+    """Build a text field for a lookup-backed process attribute."""
+    attrs = {'class': 'form-control'}
+    if placeholder:
+        attrs['placeholder'] = placeholder
+    return forms.CharField(
+        max_length=max_length,
+        required=required,
+        widget=forms.TextInput(attrs=attrs),
+    )
+
+
+class LookupNamesMixin:
+    """
+    Edit the lookup-backed attributes of a process (judge, court, ...) as
+    plain text. The names are interned into their lookup tables on save.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            for field in Process.LOOKUP_FIELDS:
+                if field in self.fields:
+                    self.initial.setdefault(field, getattr(self.instance, field))
+
+    def _post_clean(self):
+        super()._post_clean()
+        for field in Process.LOOKUP_FIELDS:
+            if field in self.cleaned_data:
+                setattr(self.instance, field, self.cleaned_data[field])
+
+
+class ProcessForm(LookupNamesMixin, forms.ModelForm):
     """Form for creating and editing processes."""
-    
+
+    process_class = lookup_name_field(
+        placeholder='e.g., Execução de Título Extrajudicial'
+    )
+    subject = lookup_name_field(placeholder='e.g., Locação de Imóvel')
+    judge = lookup_name_field(max_length=100, placeholder='Judge name')
+    court = lookup_name_field(required=False, placeholder='Court name')
+    jurisdiction = lookup_name_field(
+        required=False, placeholder='Jurisdiction information'
+    )
+    district = lookup_name_field(
+        required=False, placeholder='District information'
+    )
+
     class Meta:
         model = Process
         fields = [
@@ -31,30 +77,6 @@ class ProcessForm(forms.ModelForm):
             }),
             'status': forms.Select(attrs={'class': 'form-select'}),
             'process_type': forms.Select(attrs={'class': 'form-select'}),
-            'process_class': forms.TextInput(attrs={
-                'class': 'form-control',
-                'placeholder': 'e.g., Execução de Título Extrajudicial'
-            }),
-            'subject': forms.TextInput(attrs={
-                'class': 'form-control',
-                'placeholder': 'e.g., Locação de Imóvel'
-            }),
-            'judge': forms.TextInput(attrs={
-                'class': 'form-control',
-                'placeholder': 'Judge name'
-            }),
-            'court': forms.TextInput(attrs={
-                'class': 'form-control',
-                'placeholder': 'Court name'
-            }),
-            'jurisdiction': forms.TextInput(attrs={
-                'class': 'form-control',
-                'placeholder': 'Jurisdiction information'
-            }),
-            'district': forms.TextInput(attrs={
-                'class': 'form-control',
-                'placeholder': 'District information'
-            }),
             'action_value': forms.NumberInput(attrs={
                 'class': 'form-control',
                 'step': '0.01',
@@ -83,4 +105,84 @@ class ProcessForm(forms.ModelForm):
         action_value = self.cleaned_data['action_value']
         if action_value and action_value < 0:
             raise forms.ValidationError("Action value cannot be negative.")
-        return action_value 
\ No newline at end of file
+        return action_value
+
+
+class IdListField(forms.Field):
+    """List of primary keys; unknown ones are simply matched by no row."""
+
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        try:
+            return [int(pk) for pk in value or []]
+        except (TypeError, ValueError):
+            raise forms.ValidationError('Enter a list of process ids.')
+
+
+class BulkActionForm(forms.Form):
+    """Bulk action applied to selected processes or to a whole filter."""
+
+    ACTION_CHOICES = [
+        ('status', 'Set status'),
+        ('process_type', 'Set type'),
+        ('judge', 'Reassign judge'),
+        ('delete', 'Delete'),
+    ]
+
+    action = forms.ChoiceField(
+        choices=ACTION_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    status = forms.ChoiceField(
+        choices=Process.PROCESS_STATUS_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    process_type = forms.ChoiceField(
+        choices=Process.PROCESS_TYPE_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    judge = lookup_name_field(
+        required=False, max_length=100, placeholder='Judge name'
+    )
+    ids = IdListField(required=False)
+    select_all = forms.BooleanField(required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get('action')
+        if action and action != 'delete' and not cleaned_data.get(action):
+            self.add_error(action, 'This field is required.')
+        if not cleaned_data.get('select_all') and not cleaned_data.get('ids'):
+            raise forms.ValidationError('Select at least one process.')
+        return cleaned_data
+
+    def values(self):
+        """Return the ``{attname: value}`` the update action sets."""
+        action = self.cleaned_data['action']
+        value = self.cleaned_data[action]
+        if action == 'judge':
+            return {'judge_ref_id': Process.LOOKUP_FIELDS['judge'].objects.intern(value).pk}
+        return {action: value}
+
+
+class DeltaForm(forms.Form):
+    """Watermark of a delta read: ``updated_since`` and/or ``cursor``."""
+
+    updated_since = forms.DateTimeField(required=False)
+    cursor = forms.CharField(required=False)
+
+    def clean_cursor(self):
+        cursor = self.cleaned_data['cursor']
+        if not cursor:
+            return None
+        try:
+            return decode_cursor(cursor)
+        except ValueError as e:
+            raise forms.ValidationError(str(e))
+
+    def is_delta(self):
+        """Whether a watermark was given."""
+        return any(self.cleaned_data.get(name) for name in ('updated_since', 'cursor'))
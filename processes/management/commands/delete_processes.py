@@ -0,0 +1,68 @@
+"""
+Management command to delete processes and their parties in chunks.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from processes.bulk import CHUNK_SIZE, bulk_delete
+from processes.models import Process
+from processes.views import filter_processes, number_filters
+
+
+class Command(BaseCommand):
+    """Command to bulk delete the processes matching a filter."""
+
+    help = 'Delete the processes matching a filter and their parties, in chunks'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--status',
+            choices=[value for value, _ in Process.PROCESS_STATUS_CHOICES],
+            help='Only delete processes with this status'
+        )
+        parser.add_argument(
+            '--search',
+            default='',
+            help='Only delete processes matching this list search'
+        )
+        for part in ('year', 'segment', 'tribunal', 'origin'):
+            parser.add_argument(
+                f'--{part}',
+                type=int,
+                help=f'Only delete processes whose number has this {part}'
+            )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Delete every process when no filter is given'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help=f'Rows deleted per transaction (default: {CHUNK_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command execution."""
+        number = number_filters({
+            part: '' if options[part] is None else options[part]
+            for part in ('year', 'segment', 'tribunal', 'origin')
+        })
+        if not (options['status'] or options['search'] or number or options['all']):
+            raise CommandError('Give --status, --search, a number part or --all')
+
+        processes = filter_processes(
+            Process.objects.all(), options['search'], options['status'] or '', number
+        )
+
+        def progress(deleted, parties):
+            self.stdout.write(f'{deleted} processes, {parties} parties deleted...')
+
+        deleted, parties = bulk_delete(
+            processes, chunk_size=options['chunk_size'], progress=progress
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Deleted {deleted} processes and {parties} parties')
+        )
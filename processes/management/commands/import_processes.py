@@ -9,8 +9,11 @@ from decimal import Decimal
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from bs4 import BeautifulSoup
-from processes.models import Process
-from parties.models import Party
+from audit.services import attribution
+from feed.services import deferred as deferred_feed
+from processes import activity, cnj
+from processes.models import LookupCache, Process
+from parties.models import Party, PersonCache
 
 
 class Command(BaseCommand):
@@ -30,16 +33,21 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         """Handle the command execution."""
         html_files = options['html_files']
+        # Lookup names (judges, courts, ...) repeat across files; intern
+        # each distinct name once per run.
+        self.lookup_cache = LookupCache()
+        self.person_cache = PersonCache()
         
-        for html_file in html_files:
-            if not os.path.exists(html_file):
-                self.stdout.write(
-                    self.style.ERROR(f'File {html_file} does not exist')
-                )
-                continue
-                
-            self.stdout.write(f'Processing file: {html_file}')
-            self.import_process_from_html(html_file)
+        with attribution(source='import'):
+            for html_file in html_files:
+                if not os.path.exists(html_file):
+                    self.stdout.write(
+                        self.style.ERROR(f'File {html_file} does not exist')
+                    )
+                    continue
+
+                self.stdout.write(f'Processing file: {html_file}')
+                self.import_process_from_html(html_file)
 
     def import_process_from_html(self, html_file):
         """Import a single process from HTML file."""
@@ -54,7 +62,7 @@ class Command(BaseCommand):
             parties_data = self.extract_parties_data(soup)
             
             # Create process and parties
-            with transaction.atomic():
+            with transaction.atomic(), deferred_feed(), activity.deferred():
                 process = self.create_process(process_data)
                 self.create_parties(process, parties_data)
                 
@@ -63,8 +71,16 @@ class Command(BaseCommand):
                     f'Successfully imported process {process.process_number}'
                 )
             )
+            if not process.cnj_valid:
+                self.stdout.write(self.style.WARNING(
+                    f'{process.process_number} is not a CNJ number with valid check digits'
+                ))
                 
         except Exception as e:
+            # Lookup and person rows created inside the rolled back transaction are
+            # gone; do not hand out their ids to the next file.
+            self.lookup_cache = LookupCache()
+            self.person_cache = PersonCache()
             self.stdout.write(
                 self.style.ERROR(f'Error processing {html_file}: {str(e)}')
             )
@@ -76,10 +92,12 @@ class Command(BaseCommand):
         # Extract process number
         process_number_elem = soup.find('h4', class_='mr-auto')
         if process_number_elem:
-            process_number = process_number_elem.get_text(strip=True)
-            # Remove status badges from process number
-            process_number = re.sub(r'\s+Ativo\s+.*$', '', process_number)
-            data['process_number'] = process_number.strip()
+            # The heading also holds the status badges; keep the number only.
+            number = cnj.find(process_number_elem.get_text(' ', strip=True))
+            if not number:
+                text = process_number_elem.find(string=True, recursive=False) or ''
+                number = text.strip()
+            data['process_number'] = number
         
         # Extract status and type
         status_badges = soup.find_all('span', class_='badge')
@@ -185,11 +203,22 @@ class Command(BaseCommand):
         except (ValueError, TypeError):
             return Decimal('0.00')
 
+    def resolve_lookups(self, data):
+        """Replace lookup names in ``data`` by their interned rows."""
+        resolved = {}
+        for field, value in data.items():
+            if field in Process.LOOKUP_FIELDS:
+                model = Process.LOOKUP_FIELDS[field]
+                resolved[f'{field}_ref'] = self.lookup_cache.get(model, value)
+            else:
+                resolved[field] = value
+        return resolved
+
     def create_process(self, data):
         """Create a process from extracted data."""
         process, created = Process.objects.get_or_create(
             process_number=data['process_number'],
-            defaults={
+            defaults=self.resolve_lookups({
                 'status': data.get('status', 'active'),
                 'process_type': data.get('process_type', 'digital'),
                 'process_class': data.get('process_class', ''),
@@ -200,13 +229,17 @@ class Command(BaseCommand):
                 'district': data.get('district', ''),
                 'action_value': data.get('action_value', Decimal('0.00')),
                 'distribution_date': data.get('distribution_date'),
-            }
+            })
         )
         
         if not created:
             # Update existing process
             for field, value in data.items():
                 if hasattr(process, field) and value is not None:
+                    if field in Process.LOOKUP_FIELDS:
+                        model = Process.LOOKUP_FIELDS[field]
+                        field = f'{field}_ref'
+                        value = self.lookup_cache.get(model, value)
                     setattr(process, field, value)
             process.save()
         
@@ -215,9 +248,12 @@ class Command(BaseCommand):
     def create_parties(self, process, parties_data):
         """Create parties for a process."""
         for party_data in parties_data:
+            person = self.person_cache.get(
+                party_data['document'], party_data['name']
+            )
             party, created = Party.objects.get_or_create(
                 process=process,
-                document=party_data['document'],
+                person=person,
                 defaults={
                     'name': party_data['name'],
                     'category': party_data['category'],
@@ -0,0 +1,64 @@
+"""
+Management command to fill the database with a realistic volume of processes.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from parties.models import Person
+from processes.models import Process
+from reports.services import rebuild_summaries
+
+PARTIES_PER_PROCESS = 3
+SEED_CHUNK = 10_000
+
+# Seeded rows spread over these values so the filters select subsets.
+STATUSES = ['active', 'active', 'suspended', 'archived']
+JUDGES = ['Mariana', 'Roberto', 'Helena', 'Carlos', 'Beatriz']
+
+
+class Command(BaseCommand):
+    """Command to top the database up to a number of processes."""
+
+    help = (
+        'Add factory processes, with their parties, until the database holds '
+        'the given number (requires factory_boy, from requirements-dev.txt)'
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument('size', type=int, help='Number of processes to reach')
+        parser.add_argument(
+            '--parties',
+            type=int,
+            default=PARTIES_PER_PROCESS,
+            help=f'Parties per new process (default: {PARTIES_PER_PROCESS})'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command execution."""
+        try:
+            import factory
+
+            from parties.factories import PartyFactory, PersonFactory
+            from processes.factories import ProcessFactory
+        except ImportError:
+            raise CommandError('Seeding requires factory_boy (requirements-dev.txt)')
+
+        size = options['size']
+        existing = Process.objects.count()
+        # Continue the unique number and document sequences of earlier runs.
+        ProcessFactory.reset_sequence(existing)
+        PersonFactory.reset_sequence(Person.objects.count())
+        while existing < size:
+            chunk = min(SEED_CHUNK, size - existing)
+            processes = ProcessFactory.create_bulk(
+                chunk,
+                status=factory.Iterator(STATUSES),
+                judge=factory.Iterator(JUDGES),
+            )
+            PartyFactory.create_bulk(processes, options['parties'])
+            existing += chunk
+            self.stdout.write(f'{existing}/{size} processes seeded...')
+        # Bulk inserts send no signals: summarize the new rows at once.
+        rebuild_summaries()
+        self.stdout.write(self.style.SUCCESS(f'{existing} processes in the database'))
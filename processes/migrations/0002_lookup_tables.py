@@ -0,0 +1,112 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Court',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='District',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Judge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Jurisdiction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ProcessClass',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Process class',
+                'verbose_name_plural': 'Process classes',
+                'ordering': ['name'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Subject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='court_ref',
+            field=models.ForeignKey(blank=True, help_text='Court name', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='processes', to='processes.court'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='district_ref',
+            field=models.ForeignKey(blank=True, help_text='District information', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='processes', to='processes.district'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='judge_ref',
+            field=models.ForeignKey(blank=True, help_text='Judge name', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='processes', to='processes.judge'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='jurisdiction_ref',
+            field=models.ForeignKey(blank=True, help_text='Jurisdiction information', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='processes', to='processes.jurisdiction'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='process_class_ref',
+            field=models.ForeignKey(blank=True, help_text='Process class (e.g., Execução de Título Extrajudicial)', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='processes', to='processes.processclass'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='subject_ref',
+            field=models.ForeignKey(blank=True, help_text='Process subject (e.g., Locação de Imóvel)', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='processes', to='processes.subject'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:31
+
+from collections import defaultdict
+
+from django.db import migrations
+
+LOOKUP_FIELDS = {
+    'process_class': 'ProcessClass',
+    'subject': 'Subject',
+    'judge': 'Judge',
+    'court': 'Court',
+    'jurisdiction': 'Jurisdiction',
+    'district': 'District',
+}
+
+BATCH_SIZE = 1000
+
+
+def populate_lookups(apps, schema_editor):
+    """Deduplicate the free-text columns into the lookup tables."""
+    Process = apps.get_model('processes', 'Process')
+    for field, model_name in LOOKUP_FIELDS.items():
+        Lookup = apps.get_model('processes', model_name)
+        spellings = defaultdict(list)
+        stored = (
+            Process.objects.order_by()
+            .values_list(field, flat=True)
+            .distinct()
+        )
+        for value in stored:
+            if value and value.strip():
+                spellings[value.strip()].append(value)
+        Lookup.objects.bulk_create(
+            [Lookup(name=name) for name in sorted(spellings)],
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        lookup_ids = dict(Lookup.objects.values_list('name', 'id'))
+        for name, values in spellings.items():
+            # One UPDATE per distinct value, not per process.
+            Process.objects.filter(**{f'{field}__in': values}).update(
+                **{f'{field}_ref_id': lookup_ids[name]}
+            )
+
+
+def populate_text_columns(apps, schema_editor):
+    """Copy the lookup names back into the free-text columns."""
+    Process = apps.get_model('processes', 'Process')
+    for field, model_name in LOOKUP_FIELDS.items():
+        Lookup = apps.get_model('processes', model_name)
+        for lookup_id, name in Lookup.objects.values_list('id', 'name'):
+            Process.objects.filter(**{f'{field}_ref_id': lookup_id}).update(
+                **{field: name}
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0002_lookup_tables'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_lookups, populate_text_columns),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0003_populate_lookup_tables'),
+    ]
+
+    operations = [
+        # Give the columns a default first, so that unapplying this
+        # migration can re-add them to tables that already have rows.
+        migrations.AlterField(
+            model_name='process',
+            name='court',
+            field=models.CharField(blank=True, default='', help_text='Court name', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='process',
+            name='district',
+            field=models.CharField(blank=True, default='', help_text='District information', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='process',
+            name='judge',
+            field=models.CharField(default='', help_text='Judge name', max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='process',
+            name='jurisdiction',
+            field=models.CharField(blank=True, default='', help_text='Jurisdiction information', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='process',
+            name='process_class',
+            field=models.CharField(default='', help_text='Process class (e.g., Execução de Título Extrajudicial)', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='process',
+            name='subject',
+            field=models.CharField(default='', help_text='Process subject (e.g., Locação de Imóvel)', max_length=200),
+        ),
+        migrations.RemoveField(
+            model_name='process',
+            name='court',
+        ),
+        migrations.RemoveField(
+            model_name='process',
+            name='district',
+        ),
+        migrations.RemoveField(
+            model_name='process',
+            name='judge',
+        ),
+        migrations.RemoveField(
+            model_name='process',
+            name='jurisdiction',
+        ),
+        migrations.RemoveField(
+            model_name='process',
+            name='process_class',
+        ),
+        migrations.RemoveField(
+            model_name='process',
+            name='subject',
+        ),
+    ]
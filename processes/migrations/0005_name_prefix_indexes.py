@@ -0,0 +1,34 @@
+from django.db import migrations
+
+# Case-insensitive prefix matches (``name__istartswith``, compiled to
+# ``UPPER(name::text) LIKE UPPER('x%')``) for the typeahead suggestions.
+TABLES = ['processes_judge', 'processes_court']
+
+
+def create_indexes(apps, schema_editor):
+    """Index ``UPPER(name)`` with ``text_pattern_ops`` (PostgreSQL)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in TABLES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {table}_name_prefix_idx '
+            f'ON {table} (UPPER(name) text_pattern_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in TABLES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_name_prefix_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0004_remove_process_text_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:24
+
+from django.db import migrations, models
+
+from processes.cnj import CNJNumber, parse
+
+BATCH_SIZE = 1000
+COLUMNS = [f'cnj_{name}' for name in CNJNumber._fields] + ['cnj_valid']
+
+
+def parse_numbers(apps, schema_editor):
+    """Fill the number parts of the existing rows."""
+    Process = apps.get_model('processes', 'Process')
+    batch = []
+    rows = Process.objects.order_by().only('process_number')
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        parts = parse(row.process_number)
+        for name in CNJNumber._fields:
+            setattr(row, f'cnj_{name}', getattr(parts, name) if parts else None)
+        row.cnj_valid = bool(parts and parts.is_valid)
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            Process.objects.bulk_update(batch, COLUMNS)
+            batch = []
+    Process.objects.bulk_update(batch, COLUMNS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0005_name_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='process',
+            name='cnj_check_digits',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='cnj_origin',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='Originating court (OOOO)', null=True),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='cnj_segment',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='Judiciary segment (J)', null=True),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='cnj_sequence',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='cnj_tribunal',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='Tribunal (TR)', null=True),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='cnj_valid',
+            field=models.BooleanField(default=False, editable=False, help_text='Whether the check digits match'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='cnj_year',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(parse_numbers, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['cnj_year', 'cnj_tribunal', 'cnj_segment'], name='process_cnj_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['cnj_segment', 'cnj_tribunal', 'cnj_origin'], name='process_cnj_origin_idx'),
+        ),
+    ]
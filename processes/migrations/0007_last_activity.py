@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:02
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+def fill_last_activity(apps, schema_editor):
+    """Start from the latest change of each process or its parties."""
+    Process = apps.get_model('processes', 'Process')
+    Party = apps.get_model('parties', 'Party')
+    latest_party = Party.objects.filter(process=OuterRef('pk')).order_by().values(
+        'process'
+    ).annotate(latest=Max('updated_at')).values('latest')
+    Process.objects.update(
+        last_activity_at=Greatest(
+            F('updated_at'), Coalesce(Subquery(latest_party), F('updated_at'))
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parties', '0006_person_name_prefix_index'),
+        ('processes', '0006_cnj_number_parts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='process',
+            name='last_activity_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, help_text='Last change of the process or of its parties'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_last_activity, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['updated_at'], name='process_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['last_activity_at', 'id'], name='process_activity_idx'),
+        ),
+    ]
@@ -2,10 +2,126 @@
 Models for legal processes application.
 """
 
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 
+from legal_processes.formatting import format_currency
+
+from . import cnj
+
+
+class LookupManager(models.Manager):
+    """Manager that interns names into a lookup table."""
+
+    def intern(self, name):
+        """Return the row for ``name``, creating it if needed."""
+        name = (name or '').strip()
+        if not name:
+            return None
+        instance, _ = self.get_or_create(name=name)
+        return instance
+
+
+class LookupModel(models.Model):
+    """
+    Base model for the normalized values repeated across many processes.
+    """
+    name = models.CharField(max_length=200, unique=True)
+
+    objects = LookupManager()
+
+    class Meta:
+        abstract = True
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class ProcessClass(LookupModel):
+    """Process class (e.g., Execução de Título Extrajudicial)."""
+
+    class Meta(LookupModel.Meta):
+        verbose_name = "Process class"
+        verbose_name_plural = "Process classes"
+
+
+class Subject(LookupModel):
+    """Process subject (e.g., Locação de Imóvel)."""
+
+
+class Judge(LookupModel):
+    """Judge responsible for processes."""
+
+
+class Court(LookupModel):
+    """Court (foro) where processes are handled."""
+
+
+class Jurisdiction(LookupModel):
+    """Jurisdiction (vara) information."""
+
+
+class District(LookupModel):
+    """District (comarca) information."""
+
+
+class LookupCache:
+    """
+    In-memory ``name -> row`` cache for interning lookup values in bulk.
+
+    Meant to live for one import run: every distinct name costs at most
+    one query, repeated names cost none.
+    """
+
+    def __init__(self):
+        self._rows = {}
+
+    def get(self, model, name):
+        """Return the row of ``model`` for ``name`` (``None`` if blank)."""
+        name = (name or '').strip()
+        if not name:
+            return None
+        key = (model, name)
+        if key not in self._rows:
+            self._rows[key] = model.objects.intern(name)
+        return self._rows[key]
+
+
+def lookup_name(field):
+    """Expose the lookup foreign key ``<field>_ref`` as a plain name."""
+    attname = f'{field}_ref'
+
+    def getter(self):
+        pending = self.__dict__.get('_pending_lookups', {})
+        if field in pending:
+            return pending[field]
+        related = getattr(self, attname)
+        return related.name if related else ''
+
+    def setter(self, value):
+        self.__dict__.setdefault('_pending_lookups', {})[field] = (
+            (value or '').strip()
+        )
+
+    return property(getter, setter, doc=f"Name of the related {field}.")
+
+
+class ProcessQuerySet(models.QuerySet):
+    """QuerySet for processes."""
+
+    def with_lookups(self):
+        """Join the lookup tables needed to display the plain names."""
+        return self.select_related(
+            *(f'{field}_ref' for field in Process.LOOKUP_FIELDS)
+        )
+
+    def touch(self):
+        """Mark the processes as changed now (see ``last_activity_at``)."""
+        return self.update(last_activity_at=timezone.now())
+
 
 class Process(models.Model):
     """
@@ -22,12 +138,41 @@ class Process(models.Model):
         ('physical', 'Physical'),
     ]
 
+    # Attributes stored in lookup tables, with their lookup model.
+    LOOKUP_FIELDS = {
+        'process_class': ProcessClass,
+        'subject': Subject,
+        'judge': Judge,
+        'court': Court,
+        'jurisdiction': Jurisdiction,
+        'district': District,
+    }
+
     # Basic process information
     process_number = models.CharField(
         max_length=50,
         unique=True,
         help_text="Process number (e.g., 1004030-81.2016.0.00.0008)"
     )
+
+    # Parts of the CNJ number, parsed from ``process_number`` on save
+    # (null when it is not a CNJ number).
+    cnj_sequence = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    cnj_check_digits = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    cnj_year = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    cnj_segment = models.PositiveSmallIntegerField(
+        null=True, blank=True, editable=False, help_text="Judiciary segment (J)"
+    )
+    cnj_tribunal = models.PositiveSmallIntegerField(
+        null=True, blank=True, editable=False, help_text="Tribunal (TR)"
+    )
+    cnj_origin = models.PositiveSmallIntegerField(
+        null=True, blank=True, editable=False, help_text="Originating court (OOOO)"
+    )
+    cnj_valid = models.BooleanField(
+        default=False, editable=False, help_text="Whether the check digits match"
+    )
+
     status = models.CharField(
         max_length=20,
         choices=PROCESS_STATUS_CHOICES,
@@ -39,34 +184,54 @@ class Process(models.Model):
         default='digital'
     )
 
-    # Process details
-    process_class = models.CharField(
-        max_length=200,
+    # Process details and location, normalized into lookup tables. The
+    # plain names are exposed as properties below (e.g. ``process.judge``).
+    process_class_ref = models.ForeignKey(
+        'ProcessClass',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='processes',
         help_text="Process class (e.g., Execução de Título Extrajudicial)"
     )
-    subject = models.CharField(
-        max_length=200,
+    subject_ref = models.ForeignKey(
+        'Subject',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='processes',
         help_text="Process subject (e.g., Locação de Imóvel)"
     )
-    judge = models.CharField(
-        max_length=100,
+    judge_ref = models.ForeignKey(
+        'Judge',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='processes',
         help_text="Judge name"
     )
-
-    # Location information
-    court = models.CharField(
-        max_length=200,
+    court_ref = models.ForeignKey(
+        'Court',
+        on_delete=models.PROTECT,
+        null=True,
         blank=True,
+        related_name='processes',
         help_text="Court name"
     )
-    jurisdiction = models.CharField(
-        max_length=200,
+    jurisdiction_ref = models.ForeignKey(
+        'Jurisdiction',
+        on_delete=models.PROTECT,
+        null=True,
         blank=True,
+        related_name='processes',
         help_text="Jurisdiction information"
     )
-    district = models.CharField(
-        max_length=200,
+    district_ref = models.ForeignKey(
+        'District',
+        on_delete=models.PROTECT,
+        null=True,
         blank=True,
+        related_name='processes',
         help_text="District information"
     )
 
@@ -89,19 +254,92 @@ class Process(models.Model):
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Also moved by every change of the parties (``processes.activity``),
+    # so delta exports find a process whose parties changed.
+    last_activity_at = models.DateTimeField(
+        auto_now=True,
+        help_text="Last change of the process or of its parties"
+    )
+
+    objects = ProcessQuerySet.as_manager()
+
+    process_class = lookup_name('process_class')
+    subject = lookup_name('subject')
+    judge = lookup_name('judge')
+    court = lookup_name('court')
+    jurisdiction = lookup_name('jurisdiction')
+    district = lookup_name('district')
+
+    # Live rows; see ``archive.models.ArchivedProcess``.
+    is_archived = False
+
+    # Filters on the number parts, e.g. ``cnj_year=2016, cnj_tribunal=0``.
+    CNJ_FILTERS = ['cnj_year', 'cnj_segment', 'cnj_tribunal', 'cnj_origin']
 
     class Meta:
         verbose_name = "Process"
         verbose_name_plural = "Processes"
         ordering = ['-created_at']
+        indexes = [
+            # Year first: "2016 processes of tribunal 00" is a range scan.
+            models.Index(
+                fields=['cnj_year', 'cnj_tribunal', 'cnj_segment'],
+                name='process_cnj_year_idx',
+            ),
+            models.Index(
+                fields=['cnj_segment', 'cnj_tribunal', 'cnj_origin'],
+                name='process_cnj_origin_idx',
+            ),
+            # Incremental reads: snapshot refreshes, archiving.
+            models.Index(fields=['updated_at'], name='process_updated_idx'),
+            # Delta exports walk it in (last_activity_at, id) order.
+            models.Index(
+                fields=['last_activity_at', 'id'],
+                name='process_activity_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.process_number} - {self.process_class}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Keep the values loaded from the database to diff against later."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def resolve_lookups(self, cache=None):
+        """Point the lookup foreign keys at the names assigned so far."""
+        pending = self.__dict__.pop('_pending_lookups', {})
+        for field, name in pending.items():
+            model = self.LOOKUP_FIELDS[field]
+            row = cache.get(model, name) if cache else model.objects.intern(name)
+            setattr(self, f'{field}_ref', row)
+
+    def parse_number(self):
+        """Fill the ``cnj_*`` columns from ``process_number``."""
+        parts = cnj.parse(self.process_number)
+        for name in cnj.CNJNumber._fields:
+            setattr(self, f'cnj_{name}', getattr(parts, name) if parts else None)
+        self.cnj_valid = bool(parts and parts.is_valid)
+
+    def save(self, *args, **kwargs):
+        self.resolve_lookups()
+        self.parse_number()
+        # ``post_save`` receivers (the change feed) write in the same
+        # transaction as the row.
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+        }
+
     @property
     def formatted_action_value(self):
         """Return formatted action value."""
-        return f"R$ {self.action_value:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+        return format_currency(self.action_value)
 
     @property
     def is_active(self):
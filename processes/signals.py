@@ -0,0 +1,30 @@
+"""
+Signals sent by the bulk operations on processes and parties.
+
+Bulk operations write with ``QuerySet.update()`` and raw ``DELETE``
+statements, so ``pre_save``/``post_delete`` never fire. They send these
+signals instead, once per chunk and inside the chunk's transaction,
+before the rows change:
+
+- ``pre_bulk_update(sender, ids, values)``: ``values`` maps the
+  attnames being set to their new value.
+- ``pre_bulk_delete(sender, ids)``
+
+and, once the chunk is written:
+
+- ``post_bulk_update(sender, ids, values)``
+
+Rows written with ``bulk_create``/``bulk_update`` (the party formset)
+are announced after the statement, inside its transaction:
+
+- ``post_bulk_save(sender, instances, created)``: ``instances`` hold the
+  values written (and, when not ``created``, the ``_loaded_values``
+  read before the change).
+"""
+
+from django.dispatch import Signal
+
+pre_bulk_update = Signal()
+pre_bulk_delete = Signal()
+post_bulk_update = Signal()
+post_bulk_save = Signal()
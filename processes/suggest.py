@@ -0,0 +1,135 @@
+"""
+Typeahead suggestions for the search boxes.
+
+Each kind is a prefix match, found through an index, returning the
+first matches in alphabetical order:
+
+- ``number``: ``process_number``, case-sensitive (PostgreSQL already
+  keeps a ``varchar_pattern_ops`` index next to the unique one);
+- ``judge`` / ``court``: the lookup tables, case-insensitive, with
+  ``UPPER(name)`` indexed with ``text_pattern_ops``;
+- ``party``: the canonical names of people, indexed the same way.
+
+The queries have no ``DISTINCT``, so the ``LIMIT`` applies right after
+the ordering. Lookup names are unique; people may share a name, and
+repeated names are merged after the query.
+
+Results are kept in a small per-process LRU of hot prefixes. A prefix
+whose cached list was not cut at the limit already holds every match,
+so longer prefixes typed after it are answered by filtering that list
+without a query.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models.functions import Upper
+
+from parties.models import Person
+
+from .models import Court, Judge, Process
+
+MIN_LENGTH = 2
+MAX_LIMIT = 20
+
+
+def _numbers(prefix, limit):
+    return Process.objects.filter(process_number__startswith=prefix) \
+        .order_by('process_number').values_list('process_number', flat=True)[:limit]
+
+
+def _names(model):
+    def query(prefix, limit):
+        return model.objects.filter(name__istartswith=prefix) \
+            .order_by(Upper('name')).values_list('name', flat=True)[:limit]
+    return query
+
+
+# Kind -> (query, permission needed to see it).
+KINDS = {
+    'number': (_numbers, 'processes.view_process'),
+    'judge': (_names(Judge), 'processes.view_process'),
+    'court': (_names(Court), 'processes.view_process'),
+    'party': (_names(Person), 'parties.view_party'),
+}
+
+
+class PrefixCache:
+    """Thread-safe LRU of ``key -> value`` entries that expire."""
+
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+cache = PrefixCache(settings.SUGGEST_CACHE_SIZE, settings.SUGGEST_CACHE_TIMEOUT)
+
+
+def suggest(kind, prefix, limit=None):
+    """Return up to ``limit`` values of ``kind`` starting with ``prefix``."""
+    limit = max(1, min(limit or settings.SUGGEST_LIMIT, MAX_LIMIT))
+    key = prefix.casefold()
+    if len(key) < MIN_LENGTH:
+        return []
+
+    # Cached lists hold the rows as read, repeated names included, so
+    # their length tells whether the query was cut at the limit.
+    values = cache.get((kind, key, limit))
+    if values is None:
+        # A shorter prefix whose list is complete holds every match already.
+        for end in range(len(key) - 1, MIN_LENGTH - 1, -1):
+            shorter = cache.get((kind, key[:end], limit))
+            if shorter is not None and len(shorter) < limit:
+                values = [value for value in shorter if value.casefold().startswith(key)]
+                break
+        else:
+            query, _ = KINDS[kind]
+            values = list(query(prefix, limit))
+        cache.set((kind, key, limit), values)
+    return list(dict.fromkeys(values))
+
+
+def processes_by_number(prefix, limit=None):
+    """Return ``{'id', 'process_number'}`` of processes numbered ``prefix...``."""
+    limit = max(1, min(limit or settings.SUGGEST_LIMIT, MAX_LIMIT))
+    prefix = prefix.strip()
+    if len(prefix) < MIN_LENGTH:
+        return []
+    return list(
+        Process.objects.filter(process_number__startswith=prefix)
+        .order_by('process_number')
+        .values('id', 'process_number')[:limit]
+    )
+
+
+def allowed_kinds(user, requested=None):
+    """The requested kinds (all by default) that ``user`` may see."""
+    kinds = [kind for kind in (requested or KINDS) if kind in KINDS]
+    return [kind for kind in kinds if user.has_perm(KINDS[kind][1])]
@@ -2,21 +2,39 @@
 Tests for legal processes application.
 """
 
+import os
+import time
 import pytest
+from contextlib import contextmanager
+from datetime import timedelta
 from decimal import Decimal
-from django.test import TestCase, Client
-from django.contrib.auth.models import User
+from io import BytesIO, StringIO
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import Permission, User
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
-from .models import Process
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from audit.models import ChangeLog
+from audit.services import BATCH_TYPE
+from parties.models import Party
+from reports.models import ProcessSummary
+from reports.services import rebuild_summaries
+from . import cnj
+from .bulk import bulk_delete, bulk_update
+from .models import Judge, LookupCache, Process
+from .suggest import cache as suggest_cache, suggest
 
 
 class ProcessModelTest(TestCase):
     """Test cases for Process model."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.process = Process.objects.create( # type: ignore
+        cls.process = Process.objects.create( # type: ignore
             process_number='1004030-81.2016.0.00.0008',
             status='active',
             process_type='digital',
@@ -45,6 +63,14 @@ class ProcessModelTest(TestCase):
         """Test formatted action value property."""
         self.assertEqual(self.process.formatted_action_value, 'R$ 5.911,72')
 
+    def test_format_currency(self):
+        """Test money formatting follows the locale separators."""
+        from legal_processes.formatting import format_currency
+
+        self.assertEqual(format_currency(Decimal('1234567.8')), 'R$ 1.234.567,80')
+        self.assertEqual(format_currency(Decimal('1234567.8'), 'en-us'), 'US$ 1,234,567.80')
+        self.assertEqual(format_currency(Decimal('0')), 'R$ 0,00')
+
     def test_is_active_property(self):
         """Test is_active property."""
         self.assertTrue(self.process.is_active)
@@ -66,23 +92,77 @@ class ProcessModelTest(TestCase):
         self.assertEqual(processes[0], process2)  # Newer process first
 
 
+class ProcessLookupTest(TestCase):
+    """Test cases for the normalized lookup attributes."""
+
+    def test_names_are_interned(self):
+        """Test that repeated names share one lookup row."""
+        first = Process.objects.create( # type: ignore
+            process_number='1004030-81.2016.0.00.0008',
+            process_class='Execução de Título Extrajudicial',
+            subject='Locação de Imóvel',
+            judge='Mariana',
+        )
+        second = Process.objects.create( # type: ignore
+            process_number='1007944-79.2020.0.00.0361',
+            process_class='Busca e Apreensão',
+            subject='Alienação Fiduciária',
+            judge=' Mariana ',
+        )
+        self.assertEqual(Judge.objects.count(), 1)
+        self.assertEqual(first.judge_ref_id, second.judge_ref_id)
+        self.assertEqual(second.judge, 'Mariana')
+
+    def test_blank_names_are_null(self):
+        """Test that blank optional attributes store no lookup row."""
+        process = Process.objects.create( # type: ignore
+            process_number='1004030-81.2016.0.00.0008',
+            process_class='Execução de Título Extrajudicial',
+            subject='Locação de Imóvel',
+            judge='Mariana',
+        )
+        process.refresh_from_db()
+        self.assertIsNone(process.court_ref_id)
+        self.assertEqual(process.court, '')
+
+    def test_with_lookups_avoids_extra_queries(self):
+        """Test that with_lookups joins the lookup tables."""
+        Process.objects.create( # type: ignore
+            process_number='1004030-81.2016.0.00.0008',
+            process_class='Execução de Título Extrajudicial',
+            subject='Locação de Imóvel',
+            judge='Mariana',
+            court='Foro Regional VIII - Tatuapé',
+        )
+        with self.assertNumQueries(1):
+            process = Process.objects.with_lookups().get()
+            self.assertEqual(process.judge, 'Mariana')
+            self.assertEqual(process.court, 'Foro Regional VIII - Tatuapé')
+
+    def test_lookup_cache(self):
+        """Test that the cache queries each distinct name once."""
+        cache = LookupCache()
+        judge = cache.get(Judge, 'Mariana')
+        with self.assertNumQueries(0):
+            self.assertEqual(cache.get(Judge, 'Mariana'), judge)
+            self.assertIsNone(cache.get(Judge, ''))
+
+
 class ProcessViewsTest(TestCase):
     """Test cases for process views."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.client = Client()
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username='testuser',
             password='testpass123'
         )
         # Adiciona todas as permissões de Process ao usuário
         from django.contrib.auth.models import Permission
         permissions = Permission.objects.filter(content_type__app_label='processes')
-        self.user.user_permissions.set(permissions)
-        self.user.save()
-        self.client.login(username='testuser', password='testpass123')
-        self.process = Process.objects.create( # type: ignore
+        cls.user.user_permissions.set(permissions)
+        cls.process = Process.objects.create( # type: ignore
             process_number='1004030-81.2016.0.00.0008',
             status='active',
             process_class='Execução de Título Extrajudicial',
@@ -91,6 +171,10 @@ class ProcessViewsTest(TestCase):
             action_value=Decimal('5911.72'),
         )
 
+    def setUp(self):
+        """Log in the test user."""
+        self.client.login(username='testuser', password='testpass123')
+
     def test_process_list_view_requires_login(self):
         """Test that process list requires login."""
         response = self.client.get(reverse('processes:process_list'))
@@ -193,6 +277,949 @@ class ProcessViewsTest(TestCase):
         self.assertContains(response, '1004030-81.2016.0.00.0008')
 
 
+@override_settings(PERMISSIONS_CACHE='default')
+class PermissionCacheTest(TestCase):
+    """
+    Test cases for the cached permission backend.
+
+    The local memory cache of the tests stands in for a shared one.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        from django.contrib.auth.models import Group, Permission
+        cls.group = Group.objects.create(name='Usuários')
+        cls.group.permissions.add(
+            Permission.objects.get(codename='view_process')
+        )
+        cls.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        cls.user.groups.add(cls.group)
+
+    def setUp(self):
+        """Forget permissions cached by the previous (rolled back) test."""
+        from django.conf import settings
+        from django.core.cache import caches
+        caches[settings.PERMISSIONS_CACHE].clear()
+
+    def fresh_user(self):
+        return User.objects.get(pk=self.user.pk)
+
+    def test_steady_state_needs_no_permission_queries(self):
+        """Test a new user object reads its permissions from the cache."""
+        self.assertTrue(self.fresh_user().has_perm('processes.view_process'))
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perm('processes.view_process'))
+            self.assertFalse(user.has_perm('processes.change_process'))
+
+    def test_group_permission_change_invalidates(self):
+        """Test granting a permission to a group is seen at once."""
+        from django.contrib.auth.models import Permission
+        self.assertFalse(self.fresh_user().has_perm('processes.change_process'))
+        self.group.permissions.add(
+            Permission.objects.get(codename='change_process')
+        )
+        self.assertTrue(self.fresh_user().has_perm('processes.change_process'))
+
+    def test_membership_change_invalidates(self):
+        """Test leaving a group is seen at once."""
+        self.assertTrue(self.fresh_user().has_perm('processes.view_process'))
+        self.user.groups.remove(self.group)
+        self.assertFalse(self.fresh_user().has_perm('processes.view_process'))
+
+    @override_settings(PERMISSIONS_CACHE=None)
+    def test_not_cached_without_shared_cache(self):
+        """Test a change made by another worker is seen without invalidation."""
+        self.assertTrue(self.fresh_user().has_perm('processes.view_process'))
+        # A raw delete sends no signal, like a change handled by another
+        # process with its own local cache.
+        self.group.permissions.through.objects.filter(group=self.group).delete()
+        self.assertFalse(self.fresh_user().has_perm('processes.view_process'))
+
+    def test_view_does_no_permission_queries(self):
+        """Test an authenticated page view reuses the cached permissions."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.client.login(username='testuser', password='testpass123')
+        self.client.get(reverse('processes:process_list'))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('processes:process_list'))
+        self.assertEqual(response.status_code, 200) # type: ignore
+        self.assertFalse([
+            query['sql'] for query in queries
+            if 'auth_permission' in query['sql']
+        ])
+
+
+class ProcessListRenderingTest(TestCase):
+    """Test cases for the cached rendering of list rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        cls.user = User.objects.create_superuser(
+            username='admin', password='testpass123'
+        )
+        cls.process = Process.objects.create( # type: ignore
+            process_number='1004030-81.2016.0.00.0008',
+            process_class='Execução de Título Extrajudicial',
+            subject='Locação de Imóvel',
+            judge='Mariana',
+            action_value=Decimal('5911.72'),
+        )
+
+    def setUp(self):
+        """Start from an empty row cache."""
+        from django.core.cache import cache
+        cache.clear()
+        self.client.login(username='admin', password='testpass123')
+
+    def test_row_urls(self):
+        """Test URLs built from the precomputed prefixes match reverse()."""
+        from legal_processes.listing import RowUrl
+        for name in ('process_detail', 'process_update', 'process_delete'):
+            self.assertEqual(
+                RowUrl(f'processes:{name}').for_pk(self.process.pk),
+                reverse(f'processes:{name}', args=[self.process.pk]),
+            )
+        response = self.client.get(reverse('processes:process_list'))
+        self.assertContains(
+            response, reverse('processes:process_update', args=[self.process.pk])
+        )
+
+    def test_row_cached_until_updated(self):
+        """Test a row is re-rendered once its updated_at changes."""
+        self.client.get(reverse('processes:process_list'))
+        # Bypasses updated_at, so the cached row is still served.
+        Process.objects.filter(pk=self.process.pk).update(status='suspended')
+        response = self.client.get(reverse('processes:process_list'))
+        self.assertNotContains(response, 'bg-warning">Suspended')
+
+        self.process.status = 'suspended'
+        self.process.save()
+        response = self.client.get(reverse('processes:process_list'))
+        self.assertContains(response, 'bg-warning">Suspended')
+
+    def test_row_cached_until_lookup_renamed(self):
+        """Test renaming a judge re-renders the rows showing it."""
+        self.client.get(reverse('processes:process_list'))
+        judge = Process.objects.get(pk=self.process.pk).judge_ref
+        judge.name = 'Mariana Souza'
+        judge.save()
+        response = self.client.get(reverse('processes:process_list'))
+        self.assertContains(response, 'Mariana Souza')
+
+    def test_assets_are_self_hosted(self):
+        """Test pages load CSS, JS and icons from our static files."""
+        response = self.client.get(reverse('processes:process_list'))
+        self.assertNotContains(response, 'cdn.jsdelivr.net')
+        self.assertNotContains(response, 'cdnjs.cloudflare.com')
+        self.assertContains(response, 'vendor/fontawesome/css/fontawesome-subset')
+
+    def test_row_cache_disabled(self):
+        """Test rows always render when fragment caching is off."""
+        with self.settings(LIST_FRAGMENT_CACHE=False):
+            self.client.get(reverse('processes:process_list'))
+            Process.objects.filter(pk=self.process.pk).update(status='suspended')
+            response = self.client.get(reverse('processes:process_list'))
+        self.assertContains(response, 'bg-warning">Suspended')
+
+
+class ProcessDetailStreamingTest(TestCase):
+    """Test cases for the streamed process detail page."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        User.objects.create_superuser(username='admin', password='testpass123')
+        cls.process = Process.objects.create( # type: ignore
+            process_number='1004030-81.2016.0.00.0008',
+            process_class='Execução de Título Extrajudicial',
+            subject='Locação de Imóvel',
+            judge='Mariana',
+            action_value=Decimal('5911.72'),
+        )
+        for i in range(3):
+            Party.objects.create( # type: ignore
+                name=f'Parte {i}', document=f'{i:011d}',
+                category='AUTOR', process=cls.process,
+            )
+
+    def setUp(self):
+        """Log in the test user."""
+        self.client.login(username='admin', password='testpass123')
+
+    def test_process_block_sent_before_parties(self):
+        """Test the first chunk holds the process and no party yet."""
+        response = self.client.get(
+            reverse('processes:process_detail', args=[self.process.pk])
+        )
+        self.assertTrue(response.streaming)
+        chunks = [chunk.decode() for chunk in response.streaming_content]
+        self.assertIn('1004030-81.2016.0.00.0008', chunks[0])
+        self.assertNotIn('Parte 0', chunks[0])
+        page = ''.join(chunks)
+        for i in range(3):
+            self.assertIn(f'Parte {i}', page)
+        self.assertTrue(page.rstrip().endswith('</html>'))
+
+    def test_empty_and_buffered_modes_match(self):
+        """Test streaming renders the same page as buffered rendering."""
+        self.process.parties.all().delete()
+        url = reverse('processes:process_detail', args=[self.process.pk])
+        streamed = b''.join(self.client.get(url).streaming_content).decode()
+        with self.settings(PROCESS_DETAIL_STREAMING=False):
+            buffered = self.client.get(url).content.decode()
+        self.assertIn('Nenhuma parte cadastrada.', streamed)
+        self.assertEqual(streamed.split(), buffered.split())
+
+
+class ResponseCompressionTest(TestCase):
+    """Test cases for the app-level compression middleware."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        User.objects.create_superuser(username='admin', password='testpass123')
+
+    def setUp(self):
+        """Log in the test user."""
+        self.client.login(username='admin', password='testpass123')
+
+    def compress(self, content_type, accept):
+        """Run a 4 KB response of ``content_type`` through the middleware."""
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from legal_processes.middleware import CompressionMiddleware
+
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept)
+        response = HttpResponse(b'{"name": "Mariana"}' * 200, content_type=content_type)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_brotli_preferred(self):
+        """Test brotli is used for data when accepted, gzip otherwise."""
+        import brotli
+        import gzip
+        response = self.compress('application/json', 'gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn(b'Mariana', brotli.decompress(response.content))
+        response = self.compress('application/json', 'gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(b'Mariana', gzip.decompress(response.content))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_html_keeps_breach_padding(self):
+        """Test pages are gzipped with a random-length filename, never brotli."""
+        import gzip
+        url = reverse('processes:process_list')
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(b'Legal Processes', gzip.decompress(response.content))
+        # FNAME flag: Django's random filename padding is present.
+        self.assertTrue(response.content[3] & gzip.FNAME)
+        lengths = {
+            len(self.compress('text/html; charset=utf-8', 'gzip, br').content)
+            for _ in range(10)
+        }
+        self.assertGreater(len(lengths), 1)
+
+    def test_small_and_disabled_responses_untouched(self):
+        """Test the size threshold and the setting."""
+        url = reverse('processes:process_list')
+        with self.settings(RESPONSE_COMPRESSION_MIN_SIZE=10 ** 7):
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        with self.settings(RESPONSE_COMPRESSION=False):
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_streaming_response_compressed(self):
+        """Test streamed pages are compressed chunk by chunk."""
+        import gzip
+        process = Process.objects.create( # type: ignore
+            process_number='1004030-81.2016.0.00.0008',
+            process_class='Execução de Título Extrajudicial',
+            subject='Locação de Imóvel',
+            judge='Mariana',
+            action_value=Decimal('5911.72'),
+        )
+        response = self.client.get(
+            reverse('processes:process_detail', args=[process.pk]),
+            HTTP_ACCEPT_ENCODING='gzip, br',
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        page = gzip.decompress(b''.join(response.streaming_content))
+        self.assertIn(b'1004030-81.2016.0.00.0008', page)
+
+
+class BulkDeleteTest(TestCase):
+    """Test cases for chunked bulk deletes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        User.objects.create_superuser(username='admin', password='testpass123')
+        cls.processes = []
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.create_processes()
+
+    @classmethod
+    def create_processes(cls):
+        for i, status in enumerate(['active', 'archived', 'archived']):
+            process = Process.objects.create( # type: ignore
+                process_number=f'100{i}030-81.2016.0.00.0008',
+                status=status,
+                process_class='Execução de Título Extrajudicial',
+                subject='Locação de Imóvel',
+                judge='Mariana',
+                action_value=Decimal('100.00'),
+            )
+            for j in range(5):
+                Party.objects.create( # type: ignore
+                    name=f'Parte {j}', document=f'{i}{j:010d}',
+                    category='EXEQUENTE', process=process,
+                )
+            cls.processes.append(process)
+
+    def setUp(self):
+        """Log in the test user."""
+        self.client.login(username='admin', password='testpass123')
+
+    def test_bulk_delete_in_chunks(self):
+        """Test parties and processes are deleted chunk by chunk."""
+        steps = []
+        with self.captureOnCommitCallbacks(execute=True):
+            result = bulk_delete(
+                Process.objects.filter(status='archived'),
+                chunk_size=2,
+                progress=lambda *totals: steps.append(totals),
+            )
+
+        self.assertEqual(result, (2, 10))
+        self.assertEqual(steps, [(0, 2), (0, 4), (0, 6), (0, 8), (0, 10), (2, 10)])
+        self.assertEqual(list(Process.objects.all()), [self.processes[0]])
+        self.assertEqual(Party.objects.count(), 5)
+
+    def test_bulk_delete_removes_parties_added_meanwhile(self):
+        """Test a party added after its process's parties were deleted goes too."""
+        process = self.processes[1]
+        first_party = Party.objects.filter(process=process).order_by('pk').first()
+        added = []
+
+        def add_party(processes, parties):
+            # Behind the party loop's position, like a row committed late.
+            if parties == 10 and not added:
+                added.append(Party.objects.create( # type: ignore
+                    pk=first_party.pk, name='Late Party', document='111.444.777-35',
+                    category='TERCEIRO', process=process,
+                ))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = bulk_delete(
+                Process.objects.filter(status='archived'), progress=add_party
+            )
+
+        self.assertEqual(result, (2, 11))
+        self.assertFalse(Party.objects.filter(process=process).exists())
+
+    def test_bulk_delete_keeps_reports_and_log(self):
+        """Test summaries and the change log follow bulk deletes."""
+        rebuild_summaries()
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_delete(Process.objects.filter(status='archived'))
+
+        self.assertFalse(
+            ProcessSummary.objects.filter(dimension='status', key='archived').exists()
+        )
+        entries = ChangeLog.objects.filter(object_type=BATCH_TYPE)
+        self.assertEqual(entries.count(), 2)
+        deleted = {
+            label: len(rows) for entry in entries for label, rows in entry.changes.items()
+        }
+        self.assertEqual(deleted, {'processes.process': 2, 'parties.party': 10})
+
+    def test_process_delete_view(self):
+        """Test deleting one process with its parties."""
+        process = self.processes[0]
+        response = self.client.post(reverse('processes:process_delete', args=[process.pk]))
+        self.assertRedirects(response, reverse('processes:process_list'))
+        self.assertFalse(Process.objects.filter(pk=process.pk).exists())
+        self.assertFalse(Party.objects.filter(process_id=process.pk).exists())
+
+    def test_bulk_delete_view_uses_list_filters(self):
+        """Test the filtered selection is confirmed, then deleted."""
+        url = reverse('processes:process_bulk_delete') + '?status=archived'
+        response = self.client.get(url)
+        self.assertContains(response, 'excluir 2 processos')
+
+        self.client.post(url)
+        self.assertEqual(list(Process.objects.all()), [self.processes[0]])
+
+    def test_admin_action(self):
+        """Test the admin delete action asks, then deletes in chunks."""
+        url = reverse('admin:processes_process_changelist')
+        data = {
+            'action': 'bulk_delete_selected',
+            '_selected_action': [self.processes[1].pk, self.processes[2].pk],
+        }
+        response = self.client.post(url, data)
+        self.assertContains(response, 'Delete 2 processes and their 10 parties?')
+        self.assertEqual(Process.objects.count(), 3)
+
+        self.client.post(url, {**data, 'post': 'yes'})
+        self.assertEqual(list(Process.objects.all()), [self.processes[0]])
+
+    def test_command_reports_progress(self):
+        """Test the management command."""
+        out = StringIO()
+        call_command('delete_processes', '--status', 'archived', stdout=out)
+        self.assertIn('2 processes, 10 parties deleted...', out.getvalue())
+        self.assertIn('Deleted 2 processes and 10 parties', out.getvalue())
+
+
+class SeedProcessesCommandTest(TestCase):
+    """Test cases for the seed_processes command."""
+
+    def test_tops_up_to_size(self):
+        """Test a second run only adds the missing processes."""
+        call_command('seed_processes', '20', stdout=StringIO())
+        call_command('seed_processes', '30', '--parties', '1', stdout=StringIO())
+
+        self.assertEqual(Process.objects.count(), 30)
+        self.assertEqual(Party.objects.count(), 20 * 3 + 10)
+        self.assertEqual(
+            set(Process.objects.values_list('status', flat=True)),
+            {'active', 'suspended', 'archived'},
+        )
+        self.assertEqual(
+            sum(ProcessSummary.objects.filter(dimension='status').values_list(
+                'process_count', flat=True
+            )),
+            30,
+        )
+
+
+class BulkEditTest(TestCase):
+    """Test cases for bulk actions from the list and the JSON API."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        User.objects.create_superuser(username='admin', password='testpass123')
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.processes = [
+                Process.objects.create( # type: ignore
+                    process_number=f'100{i}030-81.2016.0.00.0008',
+                    process_class='Execução de Título Extrajudicial',
+                    subject='Locação de Imóvel',
+                    judge='Mariana',
+                    action_value=Decimal('100.00'),
+                )
+                for i in range(4)
+            ]
+        cls.before = Process.objects.get(pk=cls.processes[0].pk).updated_at
+
+    def setUp(self):
+        """Log in the test user."""
+        self.client.login(username='admin', password='testpass123')
+
+    def test_set_status_on_selection(self):
+        """Test the selected processes change status in chunks."""
+        ids = [self.processes[0].pk, self.processes[1].pk]
+        with self.captureOnCommitCallbacks(execute=True):
+            updated = bulk_update(
+                Process.objects.filter(pk__in=ids), {'status': 'archived'}, chunk_size=1
+            )
+
+        self.assertEqual(updated, 2)
+        self.assertEqual(
+            set(Process.objects.filter(status='archived').values_list('pk', flat=True)),
+            set(ids),
+        )
+        self.assertGreater(Process.objects.get(pk=ids[0]).updated_at, self.before)
+        self.assertEqual(
+            ProcessSummary.objects.get(dimension='status', key='archived').process_count, 2
+        )
+        entries = ChangeLog.objects.filter(object_type=BATCH_TYPE)
+        self.assertEqual(entries.count(), 2)
+        self.assertEqual(
+            entries.first().changes['processes.process'][str(entries.first().object_id)],
+            {'action': 'update', 'fields': {'status': ['active', 'archived']}},
+        )
+
+    def test_list_action_on_whole_filter(self):
+        """Test a bulk action from the list applies to the current filter."""
+        url = reverse('processes:process_bulk_action') + '?search=1001030'
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                url, {'action': 'judge', 'judge': 'Roberto', 'select_all': '1'}
+            )
+        self.assertRedirects(
+            response, reverse('processes:process_list') + '?search=1001030'
+        )
+        self.assertEqual(
+            [process.judge for process in Process.objects.with_lookups().order_by('pk')],
+            ['Mariana', 'Roberto', 'Mariana', 'Mariana'],
+        )
+        entry = ChangeLog.objects.get(object_type=BATCH_TYPE)
+        self.assertEqual(entry.username, 'admin')
+        self.assertEqual(entry.source, 'bulk')
+
+    def test_list_shows_bulk_form(self):
+        """Test the list offers the bulk actions and row checkboxes."""
+        response = self.client.get(reverse('processes:process_list'))
+        self.assertContains(response, 'id="bulk-form"')
+        self.assertContains(
+            response, f'name="ids" value="{self.processes[0].pk}" form="bulk-form"'
+        )
+
+    def test_api(self):
+        """Test the JSON API."""
+        url = reverse('processes:process_bulk_api')
+        response = self.client.post(
+            url,
+            {'action': 'process_type', 'process_type': 'physical',
+             'ids': [self.processes[2].pk]},
+            content_type='application/json',
+        )
+        self.assertEqual(response.json(), {'action': 'process_type', 'updated': 1})
+        self.assertEqual(Process.objects.get(pk=self.processes[2].pk).process_type, 'physical')
+
+        response = self.client.post(
+            url,
+            {'action': 'delete', 'select_all': True, 'filter': {'search': '1003030'}},
+            content_type='application/json',
+        )
+        self.assertEqual(response.json(), {'action': 'delete', 'deleted': 1, 'parties': 0})
+
+        response = self.client.post(
+            url, {'action': 'status', 'ids': [1]}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400) # type: ignore
+        self.assertIn('status', response.json()['errors'])
+
+    def test_api_requires_permission(self):
+        """Test users without the change permission are refused."""
+        User.objects.create_user(username='viewer', password='testpass123')
+        self.client.login(username='viewer', password='testpass123')
+        response = self.client.post(
+            reverse('processes:process_bulk_api'),
+            {'action': 'status', 'status': 'archived', 'ids': [self.processes[0].pk]},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 403) # type: ignore
+        self.assertFalse(Process.objects.filter(status='archived').exists())
+
+
+class SuggestTest(TestCase):
+    """Test cases for the typeahead suggestions."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        User.objects.create_superuser(username='admin', password='testpass123')
+        User.objects.create_user(username='reader', password='testpass123') \
+            .user_permissions.add(Permission.objects.get(codename='view_process'))
+        for number, judge, court in (
+            ('1004030-81.2016.0.00.0008', 'Mariana', 'Foro Central'),
+            ('1004031-81.2016.0.00.0008', 'Marcos', 'Foro Regional'),
+            ('987654-32.2023.8.26.0001', 'Roberto', 'Foro Central'),
+        ):
+            process = Process.objects.create( # type: ignore
+                process_number=number, judge=judge, court=court,
+                action_value=Decimal('10.00'),
+            )
+        Party.objects.create( # type: ignore
+            name='Eduardo Amoroso', document='564.406.360-73',
+            category='EXEQUENTE', process=process,
+        )
+
+    def setUp(self):
+        """Start from an empty prefix cache."""
+        suggest_cache.clear()
+
+    def test_prefix_matches_by_kind(self):
+        """Test each kind matches its prefix, ignoring case."""
+        self.client.login(username='admin', password='testpass123')
+        response = self.client.get(reverse('processes:process_suggest'), {'q': 'mar'})
+        suggestions = response.json()['suggestions']
+        self.assertEqual(suggestions['judge'], ['Marcos', 'Mariana'])
+        self.assertEqual(suggestions['number'], [])
+
+        response = self.client.get(
+            reverse('processes:process_suggest'), {'q': '1004', 'kinds': 'number'}
+        )
+        self.assertEqual(response.json()['suggestions'], {
+            'number': ['1004030-81.2016.0.00.0008', '1004031-81.2016.0.00.0008'],
+        })
+
+        response = self.client.get(
+            reverse('processes:process_suggest'), {'q': 'FORO c', 'kinds': 'court,party'}
+        )
+        self.assertEqual(response.json()['suggestions'], {'court': ['Foro Central'], 'party': []})
+
+        response = self.client.get(
+            reverse('processes:process_suggest'), {'q': 'edu', 'kinds': 'party'}
+        )
+        self.assertEqual(response.json()['suggestions'], {'party': ['Eduardo Amoroso']})
+
+    def test_kinds_follow_permissions(self):
+        """Test party names need the party view permission."""
+        self.client.login(username='reader', password='testpass123')
+        response = self.client.get(reverse('processes:process_suggest'), {'q': 'ed'})
+        self.assertNotIn('party', response.json()['suggestions'])
+        self.assertIn('judge', response.json()['suggestions'])
+
+    def test_hot_prefixes_are_cached(self):
+        """Test repeated and narrowed prefixes are answered without queries."""
+        with self.assertNumQueries(1):
+            self.assertEqual(suggest('judge', 'ma'), ['Marcos', 'Mariana'])
+        with self.assertNumQueries(0):
+            self.assertEqual(suggest('judge', 'MA'), ['Marcos', 'Mariana'])
+            self.assertEqual(suggest('judge', 'mari'), ['Mariana'])
+        # A list cut at the limit may miss matches of a longer prefix.
+        suggest('number', '10', limit=1)
+        with self.assertNumQueries(1):
+            self.assertEqual(suggest('number', '100403', limit=1), ['1004030-81.2016.0.00.0008'])
+
+    def test_first_names_in_order(self):
+        """Test the limit keeps the first names alphabetically, each once."""
+        self.assertEqual(suggest('court', 'foro', limit=1), ['Foro Central'])
+        process = Process.objects.get(process_number='987654-32.2023.8.26.0001')
+        Party.objects.create( # type: ignore
+            name='Eduardo Amoroso', document='111.444.777-35',
+            category='EXECUTADO', process=process,
+        )
+        Party.objects.create( # type: ignore
+            name='eduarda lima', document='529.982.247-25',
+            category='TERCEIRO', process=process,
+        )
+        self.assertEqual(
+            suggest('party', 'edu', limit=3), ['eduarda lima', 'Eduardo Amoroso']
+        )
+
+    def test_short_prefix(self):
+        """Test one-letter prefixes are not looked up."""
+        with self.assertNumQueries(0):
+            self.assertEqual(suggest('judge', 'm'), [])
+
+
+class ProcessNumberTest(TestCase):
+    """Test cases for the parsed CNJ number parts."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        User.objects.create_superuser(username='admin', password='testpass123')
+        cls.valid = str(cnj.CNJNumber(1004030, cnj.check_digits(1004030, 2016, 0, 0, 8), 2016, 0, 0, 8))
+        cls.processes = {
+            number: Process.objects.create( # type: ignore
+                process_number=number, action_value=Decimal('10.00'),
+            )
+            for number in (
+                '1004030-81.2016.0.00.0008',
+                '987654-32.2023.8.26.0001',
+                '1007944-79.2020.8.26.0361',
+                'PROC-42',
+            )
+        }
+
+    def setUp(self):
+        """Log in the test user."""
+        self.client.login(username='admin', password='testpass123')
+
+    def test_parts_are_parsed_on_save(self):
+        """Test each part is stored, with a zero-padded sequence accepted."""
+        process = self.processes['987654-32.2023.8.26.0001']
+        self.assertEqual(
+            (process.cnj_sequence, process.cnj_check_digits, process.cnj_year,
+             process.cnj_segment, process.cnj_tribunal, process.cnj_origin),
+            (987654, 32, 2023, 8, 26, 1),
+        )
+        self.assertFalse(process.cnj_valid)
+        self.assertIsNone(self.processes['PROC-42'].cnj_year)
+
+    def test_check_digits(self):
+        """Test the check digits are validated, not enforced."""
+        self.assertEqual(self.valid, '1004030-73.2016.0.00.0008')
+        self.assertTrue(Process.objects.create( # type: ignore
+            process_number=self.valid, action_value=Decimal('10.00'),
+        ).cnj_valid)
+        self.assertTrue(cnj.parse('10040307320160000008').is_valid)
+        process = self.processes['1004030-81.2016.0.00.0008']
+        process.process_number = '1004030-70.2016.0.00.0009'
+        process.save()
+        process.refresh_from_db()
+        self.assertTrue(process.cnj_valid)
+
+    def test_list_and_export_filter_on_parts(self):
+        """Test the year, segment, tribunal and origin filters."""
+        response = self.client.get(
+            reverse('processes:process_list'), {'year': '2016', 'tribunal': '0'}
+        )
+        self.assertEqual(
+            [process.process_number for process in response.context['page_obj']],
+            ['1004030-81.2016.0.00.0008'],
+        )
+        response = self.client.get(
+            reverse('processes:process_list'),
+            {'segment': '8', 'tribunal': '26', 'year': 'x'},
+        )
+        self.assertEqual(len(response.context['page_obj']), 2)
+
+        from openpyxl import load_workbook
+        response = self.client.get(
+            reverse('processes:export_processes'), {'origin': '361'}
+        )
+        sheet = load_workbook(BytesIO(response.content)).active
+        self.assertEqual(
+            [row[0] for row in sheet.iter_rows(min_row=2, values_only=True)],
+            ['1007944-79.2020.8.26.0361'],
+        )
+
+    def test_import_reads_number_without_badges(self):
+        """Test the status badge is not glued to the imported number."""
+        out = StringIO()
+        call_command('import_processes', 'sample_data/process1.html', stdout=out)
+        self.assertTrue(
+            Process.objects.filter(process_number='1004030-81.2016.0.00.0008').exists()
+        )
+        self.assertFalse(Process.objects.filter(process_number__endswith='Ativo').exists())
+        self.assertIn('not a CNJ number with valid check digits', out.getvalue())
+
+
+@override_settings(DELTA_SAFETY_LAG=0)
+class DeltaExportTest(TestCase):
+    """Test cases for reading the processes changed since a watermark."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        User.objects.create_user(username='reader', password='testpass123') \
+            .user_permissions.add(Permission.objects.get(codename='view_process'))
+        cls.processes = [
+            Process.objects.create( # type: ignore
+                process_number=f'100{i}030-81.2016.0.00.0008',
+                judge='Mariana', action_value=Decimal('10.00'),
+            )
+            for i in range(3)
+        ]
+        cls.party = Party.objects.create( # type: ignore
+            name='Eduardo Amoroso', document='564.406.360-73',
+            category='EXEQUENTE', process=cls.processes[0],
+        )
+
+    def setUp(self):
+        """Log in and age every process."""
+        self.client.login(username='reader', password='testpass123')
+        self.old = timezone.now() - timedelta(days=1)
+        Process.objects.update(last_activity_at=self.old)
+        self.since = (self.old + timedelta(hours=1)).isoformat()
+
+    def changed(self):
+        response = self.client.get(
+            reverse('processes:process_changes'), {'updated_since': self.since}
+        )
+        return [row['id'] for row in response.json()['results']]
+
+    def test_party_changes_move_last_activity(self):
+        """Test saving or deleting a party counts as a change of its process."""
+        self.party.name = 'Eduardo A.'
+        self.party.save()
+        self.assertEqual(self.changed(), [self.processes[0].pk])
+
+        Process.objects.update(last_activity_at=self.old)
+        self.party.delete()
+        self.assertEqual(self.changed(), [self.processes[0].pk])
+
+    def test_bulk_update_moves_last_activity(self):
+        """Test bulk edits count as changes."""
+        bulk_update(Process.objects.filter(pk=self.processes[2].pk), {'status': 'suspended'})
+        self.assertEqual(self.changed(), [self.processes[2].pk])
+
+    def test_cursor_pages_through_changes(self):
+        """Test ``next_cursor`` continues after the last row returned."""
+        self.processes[2].save()
+        self.processes[1].save()
+        url = reverse('processes:process_changes')
+
+        first = self.client.get(url, {'updated_since': self.since, 'limit': 1}).json()
+        self.assertEqual([row['id'] for row in first['results']], [self.processes[2].pk])
+        self.assertTrue(first['more'])
+        rest = self.client.get(url, {'cursor': first['next_cursor']}).json()
+        self.assertEqual([row['id'] for row in rest['results']], [self.processes[1].pk])
+        self.assertFalse(rest['more'])
+        self.assertEqual(rest['results'][0]['judge'], 'Mariana')
+        self.assertEqual(rest['results'][0]['parties'], [])
+
+        empty = self.client.get(url, {'cursor': rest['next_cursor']}).json()
+        self.assertEqual(empty['results'], [])
+        self.assertEqual(empty['next_cursor'], rest['next_cursor'])
+
+    @override_settings(DELTA_SAFETY_LAG=3600)
+    def test_recent_changes_wait_for_safety_lag(self):
+        """Test changes of possibly open transactions are held back."""
+        Process.objects.filter(pk=self.processes[0].pk).update(
+            last_activity_at=timezone.now() - timedelta(hours=2)
+        )
+        self.processes[1].save()
+        url = reverse('processes:process_changes')
+
+        page = self.client.get(url, {'updated_since': self.since}).json()
+        self.assertEqual([row['id'] for row in page['results']], [self.processes[0].pk])
+        # The cursor stays behind the held back change, which comes later.
+        Process.objects.filter(pk=self.processes[1].pk).update(
+            last_activity_at=timezone.now() - timedelta(hours=1, minutes=30)
+        )
+        rest = self.client.get(url, {'cursor': page['next_cursor']}).json()
+        self.assertEqual([row['id'] for row in rest['results']], [self.processes[1].pk])
+
+    def test_rejects_bad_watermark(self):
+        """Test malformed parameters are a bad request."""
+        url = reverse('processes:process_changes')
+        response = self.client.get(url, {'cursor': 'nope'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cursor', response.json()['errors'])
+        response = self.client.get(reverse('processes:export_processes'), {'updated_since': 'x'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_only_changed_rows(self):
+        """Test a delta export holds the changed rows and the next cursor."""
+        from openpyxl import load_workbook
+        self.processes[1].save()
+        url = reverse('processes:export_processes')
+
+        response = self.client.get(url, {'updated_since': self.since})
+        rows = list(load_workbook(BytesIO(response.content)).active.values)
+        self.assertEqual([row[0] for row in rows[1:]], [self.processes[1].process_number])
+
+        cursor = response['X-Next-Cursor']
+        response = self.client.get(url, {'cursor': cursor})
+        self.assertEqual(len(list(load_workbook(BytesIO(response.content)).active.values)), 1)
+        self.assertEqual(response['X-Next-Cursor'], cursor)
+
+
+@pytest.mark.perf
+class PerformanceBudgetTest(TestCase):
+    """
+    Query-count and wall-time budgets for the heaviest pages.
+
+    Query budgets are fixed whatever the row count, so an N+1 shows up
+    as a failure. Time budgets are scaled by ``PERF_TIME_FACTOR`` for
+    slow machines.
+    """
+
+    ROWS = 1000
+    PARTIES_PER_PROCESS = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        from parties.factories import PartyFactory
+        from .factories import ProcessFactory
+
+        User.objects.create_superuser(username='admin', password='testpass123')
+        cls.processes = ProcessFactory.create_bulk(cls.ROWS)
+        PartyFactory.create_bulk(cls.processes, cls.PARTIES_PER_PROCESS)
+
+    def setUp(self):
+        """Log in and start from an empty row cache."""
+        from django.core.cache import cache
+        cache.clear()
+        self.client.login(username='admin', password='testpass123')
+
+    @contextmanager
+    def assertBudget(self, queries, seconds):
+        factor = float(os.environ.get('PERF_TIME_FACTOR', '1'))
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            yield
+            elapsed = time.perf_counter() - start
+        self.assertLessEqual(
+            len(captured), queries,
+            '\n'.join(query['sql'] for query in captured.captured_queries),
+        )
+        self.assertLessEqual(elapsed, seconds * factor)
+
+    def test_list(self):
+        """Test a list page costs the same whatever the table size."""
+        with self.assertBudget(queries=4, seconds=2):
+            response = self.client.get(reverse('processes:process_list'), {'page': 2})
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail(self):
+        """Test the detail page loads parties without a query per party."""
+        with self.assertBudget(queries=5, seconds=1):
+            response = self.client.get(
+                reverse('processes:process_detail', args=[self.processes[0].pk])
+            )
+            content = b''.join(response.streaming_content)
+        self.assertIn(self.processes[0].process_number.encode(), content)
+
+    def test_export(self):
+        """Test exporting every process stays a handful of queries."""
+        with self.assertBudget(queries=3, seconds=5):
+            response = self.client.get(reverse('processes:export_processes'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_import(self):
+        """Test importing the sample pages stays within its budget."""
+        # Each file also reads its rows back once for the change feed.
+        with self.assertBudget(queries=90, seconds=2):
+            call_command(
+                'import_processes',
+                'sample_data/process1.html', 'sample_data/process2.html',
+                stdout=StringIO(),
+            )
+
+
+@pytest.mark.perf
+class ExportMemoryTest(TestCase):
+    """Test the export holds one chunk of rows, not the whole table."""
+
+    ROWS = 300
+    CHUNK_SIZE = 100
+
+    def setUp(self):
+        """Log in."""
+        User.objects.create_superuser(username='admin', password='testpass123')
+        self.client.login(username='admin', password='testpass123')
+
+    def export_peak(self):
+        import tracemalloc
+        from functools import partial
+        from unittest import mock
+        from legal_processes.chunking import iterate
+
+        chunked = partial(iterate, chunk_size=self.CHUNK_SIZE)
+        with mock.patch('processes.views.iterate', chunked):
+            tracemalloc.start()
+            try:
+                response = self.client.get(reverse('processes:export_processes'))
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        self.assertEqual(response.status_code, 200)
+        return peak
+
+    def test_peak_memory_flat_as_rows_grow(self):
+        """Test ten times the rows does not take ten times the memory."""
+        from .factories import ProcessFactory
+
+        ProcessFactory.create_bulk(self.ROWS)
+        small = self.export_peak()
+        ProcessFactory.create_bulk(self.ROWS * 9)
+        large = self.export_peak()
+        # The response body itself still grows with the rows; the objects
+        # built per row must not.
+        self.assertLess(large, small * 3)
+
+
 class ProcessFormsTest(TestCase):
     """Test cases for process forms."""
 
@@ -13,5 +13,11 @@ urlpatterns = [
     path('<int:pk>/', views.process_detail, name='process_detail'),
     path('<int:pk>/update/', views.process_update, name='process_update'),
     path('<int:pk>/delete/', views.process_delete, name='process_delete'),
+    path('delete/', views.process_bulk_delete, name='process_bulk_delete'),
+    path('bulk/', views.process_bulk_action, name='process_bulk_action'),
+    path('api/bulk/', views.process_bulk_api, name='process_bulk_api'),
+    path('api/search/', views.process_search, name='process_search'),
+    path('api/changes/', views.process_changes, name='process_changes'),
     path('export/', views.export_processes, name='export_processes'),
+    path('suggest/', views.process_suggest, name='process_suggest'),
 ] 
\ No newline at end of file
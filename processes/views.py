@@ -2,20 +2,73 @@
 Views for legal processes application.
 """
 
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
+from django.urls import reverse
+from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib import messages
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.db import transaction
 from django.db.models import Q
 from django.core.paginator import Paginator
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment
+from openpyxl.utils import get_column_letter
+from archive.models import ArchivedProcess
+from audit.services import attribution, history
+from legal_processes.chunking import iterate
+from legal_processes.listing import ChainedResults, row_urls, stream_rows
+from parties.forms import PartyFormSet
+from .bulk import bulk_delete, bulk_update
+from .delta import changed_since, encode_cursor
 from .models import Process
-from .forms import ProcessForm
+from .suggest import allowed_kinds, processes_by_number, suggest
+from .forms import BulkActionForm, DeltaForm, ProcessForm
 import datetime
+import json
+from itertools import chain
 from django.core.exceptions import PermissionDenied
 
 
+def number_filters(params):
+    """
+    Return the ``cnj_*`` lookups asked for in ``params``.
+
+    ``params`` holds the list parameters (``year``, ``segment``,
+    ``tribunal`` and ``origin``); blank or non-numeric values are
+    ignored.
+    """
+    filters = {}
+    for field in Process.CNJ_FILTERS:
+        value = str(params.get(field[len('cnj_'):], '')).strip()
+        if value.isdigit():
+            filters[field] = int(value)
+    return filters
+
+
+def filter_processes(processes, search_query, status_filter, number=None):
+    """
+    Apply the list search and filters to live or archived processes.
+
+    ``number`` holds the number-part lookups from ``number_filters``.
+    """
+    if search_query:
+        processes = processes.filter(
+            Q(process_number__icontains=search_query) |
+            Q(process_class_ref__name__icontains=search_query) |
+            Q(subject_ref__name__icontains=search_query) |
+            Q(judge_ref__name__icontains=search_query) |
+            Q(court_ref__name__icontains=search_query)
+        )
+    if status_filter:
+        processes = processes.filter(status=status_filter)
+    if number:
+        processes = processes.filter(**number)
+    return processes
+
+
 def remove_tz(dt):
     if isinstance(dt, datetime.datetime) and dt.tzinfo is not None:
         return dt.replace(tzinfo=None)
@@ -28,34 +81,44 @@ def process_list(request):
     """Display list of processes with search and pagination."""
     search_query = request.GET.get('search', '')
     status_filter = request.GET.get('status', '')
+    include_archived = bool(request.GET.get('include_archived'))
+    number = number_filters(request.GET)
     
-    processes = Process.objects.all()
-    
-    # Apply search filter
-    if search_query:
-        processes = processes.filter(
-            Q(process_number__icontains=search_query) |
-            Q(process_class__icontains=search_query) |
-            Q(subject__icontains=search_query) |
-            Q(judge__icontains=search_query)
-        )
-    
-    # Apply status filter
-    if status_filter:
-        processes = processes.filter(status=status_filter)
+    processes = filter_processes(
+        Process.objects.with_lookups(), search_query, status_filter, number
+    )
+    if include_archived:
+        # Archived rows come after the live ones.
+        processes = ChainedResults(processes, filter_processes(
+            ArchivedProcess.objects.with_lookups(), search_query, status_filter, number
+        ))
     
     # Pagination
     paginator = Paginator(processes, 20)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    querystring = request.GET.copy()
+    querystring.pop('page', None)
     
     context = {
         'page_obj': page_obj,
         'search_query': search_query,
         'status_filter': status_filter,
+        'include_archived': include_archived,
+        'number_filters': {
+            name: request.GET.get(name, '') for name in ('year', 'segment', 'tribunal', 'origin')
+        },
+        'querystring': querystring.urlencode(),
+        'bulk_form': BulkActionForm(),
         'status_choices': Process.PROCESS_STATUS_CHOICES,
         'can_edit': request.user.has_perm('processes.change_process'),
         'can_delete': request.user.has_perm('processes.delete_process'),
+        'urls': row_urls(
+            detail='processes:process_detail',
+            update='processes:process_update',
+            delete='processes:process_delete',
+            archived_detail='archive:archived_process_detail',
+        ),
     }
     
     return render(request, 'processes/process_list.html', context)
@@ -65,34 +128,76 @@ def process_list(request):
 @permission_required('processes.view_process', raise_exception=True)
 def process_detail(request, pk):
     """Display process details."""
-    process = get_object_or_404(Process, pk=pk)
-    parties = process.parties.all()
+    process = Process.objects.with_lookups().filter(pk=pk).first()
+    if process is None:
+        if ArchivedProcess.objects.filter(pk=pk).exists():
+            return redirect('archive:archived_process_detail', pk=pk)
+        raise Http404('No process matches the given query.')
+    parties = process.parties.select_related('person')
     
     context = {
         'process': process,
         'parties': parties,
         'can_edit': request.user.has_perm('processes.change_process'),
         'can_delete': request.user.has_perm('processes.delete_process'),
+        'party_urls': row_urls(detail='parties:party_detail'),
+        'history': history(process),
     }
+
+    if settings.PROCESS_DETAIL_STREAMING:
+        # Send the process block before reading hundreds of parties.
+        return stream_rows(
+            request, 'processes/process_detail.html', context,
+            'parties', parties, 'processes/includes/party_rows.html',
+        )
     
     return render(request, 'processes/process_detail.html', context)
 
 
+def party_formset(request, process, data=None):
+    """
+    The parties formset of the process form, if the user may edit parties.
+
+    Posts without the formset (older clients, scripts) leave the parties
+    as they are.
+    """
+    if not request.user.has_perms(['parties.add_party', 'parties.change_party']):
+        return None
+    prefix = 'parties'
+    if data is not None and f'{prefix}-TOTAL_FORMS' not in data:
+        return None
+    return PartyFormSet(data, instance=process, prefix=prefix)
+
+
+def save_with_parties(form, formset):
+    """Save the process and its parties in one transaction."""
+    with transaction.atomic():
+        process = form.save()
+        if formset is not None:
+            formset.instance = process
+            formset.save()
+    return process
+
+
 @login_required
 @permission_required('processes.add_process', raise_exception=True)
 def process_create(request):
     """Create a new process."""
+    process = Process()
     if request.method == 'POST':
-        form = ProcessForm(request.POST)
-        if form.is_valid():
-            process = form.save()
+        form = ProcessForm(request.POST, instance=process)
+        formset = party_formset(request, process, request.POST)
+        if form.is_valid() and (formset is None or formset.is_valid()):
+            process = save_with_parties(form, formset)
             messages.success(request, f'Process {process.process_number} created successfully.')
             return redirect('processes:process_detail', pk=process.pk)
     else:
-        form = ProcessForm()
+        form = ProcessForm(instance=process)
+        formset = party_formset(request, process)
     
     context = {
         'form': form,
+        'formset': formset,
         'title': 'Create Process',
     }
     
@@ -109,15 +214,18 @@ def process_update(request, pk):
     
     if request.method == 'POST':
         form = ProcessForm(request.POST, instance=process)
-        if form.is_valid():
-            process = form.save()
+        formset = party_formset(request, process, request.POST)
+        if form.is_valid() and (formset is None or formset.is_valid()):
+            process = save_with_parties(form, formset)
             messages.success(request, f'Process {process.process_number} updated successfully.')
             return redirect('processes:process_detail', pk=process.pk)
     else:
         form = ProcessForm(instance=process)
+        formset = party_formset(request, process)
     
     context = {
         'form': form,
+        'formset': formset,
         'process': process,
         'title': 'Update Process',
     }
@@ -135,7 +243,8 @@ def process_delete(request, pk):
     
     if request.method == 'POST':
         process_number = process.process_number
-        process.delete()
+        # Parties go in chunks instead of through the cascade collector.
+        bulk_delete(Process.objects.filter(pk=process.pk))
         messages.success(request, f'Process {process_number} deleted successfully.')
         return redirect('processes:process_list')
     
@@ -146,93 +255,315 @@ def process_delete(request, pk):
     return render(request, 'processes/process_confirm_delete.html', context)
 
 
+@login_required
+@permission_required('processes.delete_process', raise_exception=True)
+def process_bulk_delete(request):
+    """Delete every process matching the list filters."""
+    search_query = request.GET.get('search', '')
+    status_filter = request.GET.get('status', '')
+    number = number_filters(request.GET)
+    processes = filter_processes(
+        Process.objects.all(), search_query, status_filter, number
+    )
+
+    if request.method == 'POST':
+        deleted, parties = bulk_delete(processes)
+        messages.success(
+            request, f'{deleted} processes and {parties} parties deleted successfully.'
+        )
+        return redirect('processes:process_list')
+
+    context = {
+        'count': processes.count(),
+        'filtered': bool(search_query or status_filter or number),
+    }
+
+    return render(request, 'processes/process_confirm_bulk_delete.html', context)
+
+
+def run_bulk_action(request, form, filters):
+    """
+    Apply a valid ``BulkActionForm`` and return a summary of the result.
+
+    With ``select_all`` the action covers the processes matching
+    ``filters``, the list parameters (``search``, ``status``, ``year``...).
+
+    Raises ``PermissionDenied`` if the user may not run the action.
+    """
+    action = form.cleaned_data['action']
+    permission = 'delete_process' if action == 'delete' else 'change_process'
+    if not request.user.has_perm(f'processes.{permission}'):
+        raise PermissionDenied
+
+    if form.cleaned_data['select_all']:
+        processes = filter_processes(
+            Process.objects.all(),
+            filters.get('search', ''),
+            filters.get('status', ''),
+            number_filters(filters),
+        )
+    else:
+        processes = Process.objects.filter(pk__in=form.cleaned_data['ids'])
+
+    with attribution(request.user, 'bulk'):
+        if action == 'delete':
+            deleted, parties = bulk_delete(processes)
+            return {'action': action, 'deleted': deleted, 'parties': parties}
+        return {
+            'action': action,
+            'updated': bulk_update(processes, form.values()),
+        }
+
+
+@login_required
+@require_POST
+def process_bulk_action(request):
+    """Apply a bulk action from the process list and go back to it."""
+    form = BulkActionForm(request.POST)
+    back = reverse('processes:process_list') + '?' + request.GET.urlencode()
+    if not form.is_valid():
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(request, error)
+        return redirect(back)
+
+    result = run_bulk_action(request, form, request.GET)
+    if result['action'] == 'delete':
+        messages.success(
+            request,
+            f"{result['deleted']} processes and {result['parties']} parties deleted successfully.",
+        )
+    else:
+        messages.success(request, f"{result['updated']} processes updated successfully.")
+    return redirect(back)
+
+
+@login_required
+@require_POST
+def process_bulk_api(request):
+    """
+    Apply a bulk action posted as JSON and return the result as JSON.
+
+    The body holds the ``BulkActionForm`` fields, e.g.
+    ``{"action": "status", "status": "archived", "ids": [1, 2]}``, or
+    ``"select_all": true`` with an optional ``"filter"`` holding the list
+    ``search``, ``status`` and number parts (``year``, ``tribunal``...).
+    """
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'errors': {'__all__': ['Invalid JSON.']}}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({'errors': {'__all__': ['Expected an object.']}}, status=400)
+
+    form = BulkActionForm(data)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+
+    filters = data.get('filter') or {}
+    if not isinstance(filters, dict):
+        return JsonResponse({'errors': {'filter': ['Expected an object.']}}, status=400)
+    try:
+        result = run_bulk_action(request, form, filters)
+    except PermissionDenied:
+        return JsonResponse({'errors': {'__all__': ['Permission denied.']}}, status=403)
+    return JsonResponse(result)
+
+
+@login_required
+def process_suggest(request):
+    """Return typeahead suggestions for the search boxes, as JSON."""
+    query = request.GET.get('q', '').strip()
+    requested = [kind for kind in request.GET.get('kinds', '').split(',') if kind]
+    try:
+        limit = int(request.GET.get('limit', settings.SUGGEST_LIMIT))
+    except ValueError:
+        limit = settings.SUGGEST_LIMIT
+
+    return JsonResponse({
+        'q': query,
+        'suggestions': {
+            kind: suggest(kind, query, limit)
+            for kind in allowed_kinds(request.user, requested)
+        },
+    })
+
+
+@login_required
+@permission_required('processes.view_process', raise_exception=True)
+def process_search(request):
+    """Return the processes whose number starts with ``q``, with their pks."""
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = int(request.GET.get('limit', settings.SUGGEST_LIMIT))
+    except ValueError:
+        limit = settings.SUGGEST_LIMIT
+    return JsonResponse({'q': query, 'results': processes_by_number(query, limit)})
+
+
+def process_json(process):
+    """Return a process and its parties as sent by the delta API."""
+    return {
+        'id': process.pk,
+        'process_number': process.process_number,
+        'status': process.status,
+        'process_type': process.process_type,
+        'process_class': process.process_class,
+        'subject': process.subject,
+        'judge': process.judge,
+        'court': process.court,
+        'jurisdiction': process.jurisdiction,
+        'district': process.district,
+        'action_value': process.action_value,
+        'distribution_date': process.distribution_date,
+        'created_at': process.created_at,
+        'updated_at': process.updated_at,
+        'last_activity_at': process.last_activity_at,
+        'parties': [
+            {
+                'id': party.pk,
+                'name': party.name,
+                'document': party.document,
+                'category': party.category,
+            }
+            for party in process.parties.all()
+        ],
+    }
+
+
+@login_required
+@permission_required('processes.view_process', raise_exception=True)
+def process_changes(request):
+    """
+    Return the processes changed since a watermark, with their parties.
+
+    ``updated_since`` (ISO date or datetime) and ``cursor`` (the
+    ``next_cursor`` of the previous page) select the rows; the list
+    filters (``search``, ``status``, number parts) apply as well.
+    """
+    delta = DeltaForm(request.GET)
+    if not delta.is_valid():
+        return JsonResponse({'errors': delta.errors}, status=400)
+    try:
+        limit = int(request.GET.get('limit', settings.CHANGES_PAGE_SIZE))
+    except ValueError:
+        limit = settings.CHANGES_PAGE_SIZE
+    limit = max(1, min(limit, settings.CHANGES_PAGE_SIZE))
+
+    processes = changed_since(
+        filter_processes(
+            Process.objects.with_lookups(),
+            request.GET.get('search', ''),
+            request.GET.get('status', ''),
+            number_filters(request.GET),
+        ),
+        delta.cleaned_data['updated_since'],
+        delta.cleaned_data['cursor'],
+    ).prefetch_related('parties__person')
+    # One row more than asked tells whether there is a next page.
+    page = list(processes[:limit + 1])
+    more = len(page) > limit
+    page = page[:limit]
+    return JsonResponse({
+        'results': [process_json(process) for process in page],
+        'next_cursor': encode_cursor(page[-1]) if page else request.GET.get('cursor'),
+        'more': more,
+    })
+
+
 @login_required
 @permission_required('processes.view_process', raise_exception=True)
 def export_processes(request):
-    """Export processes to Excel file."""
+    """
+    Export processes to Excel file.
+
+    With ``updated_since`` or ``cursor`` only the live processes changed
+    after the watermark are exported, in delta order; the cursor after
+    the last row is returned in the ``X-Next-Cursor`` header.
+    """
     search_query = request.GET.get('search', '')
     status_filter = request.GET.get('status', '')
+    number = number_filters(request.GET)
+    delta = DeltaForm(request.GET)
+    if not delta.is_valid():
+        return HttpResponseBadRequest(delta.errors.as_text())
     
-    processes = Process.objects.all()
-    
-    # Apply filters
-    if search_query:
-        processes = processes.filter(
-            Q(process_number__icontains=search_query) |
-            Q(process_class__icontains=search_query) |
-            Q(subject__icontains=search_query) |
-            Q(judge__icontains=search_query)
+    processes = filter_processes(
+        Process.objects.with_lookups(), search_query, status_filter, number
+    )
+    if delta.is_delta():
+        processes = changed_since(
+            processes, delta.cleaned_data['updated_since'], delta.cleaned_data['cursor']
         )
+    processes = iterate(processes)
+    if request.GET.get('include_archived') and not delta.is_delta():
+        processes = chain(processes, iterate(filter_processes(
+            ArchivedProcess.objects.with_lookups(), search_query, status_filter, number
+        )))
     
-    if status_filter:
-        processes = processes.filter(status=status_filter)
+    # A write-only workbook streams rows to a temporary file instead of
+    # keeping every cell in memory.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Legal Processes")
     
-    # Create Excel workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Legal Processes"
-    
-    # Define headers
+    # Define headers, with column widths (write-only sheets cannot be
+    # measured after the rows are written)
     headers = [
-        'Process Number',
-        'Status',
-        'Type',
-        'Class',
-        'Subject',
-        'Judge',
-        'Court',
-        'Jurisdiction',
-        'District',
-        'Action Value',
-        'Distribution Date',
-        'Created At',
+        ('Process Number', 28),
+        ('Status', 12),
+        ('Type', 12),
+        ('Class', 40),
+        ('Subject', 40),
+        ('Judge', 30),
+        ('Court', 40),
+        ('Jurisdiction', 30),
+        ('District', 25),
+        ('Action Value', 15),
+        ('Distribution Date', 20),
+        ('Created At', 20),
     ]
+    for col, (header, width) in enumerate(headers, 1):
+        ws.column_dimensions[get_column_letter(col)].width = width
     
-    # Style for headers
+    # Write headers
     header_font = Font(bold=True)
     header_alignment = Alignment(horizontal='center')
-    
-    # Write headers
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
+    header_row = []
+    for header, _ in headers:
+        cell = WriteOnlyCell(ws, value=header)
         cell.font = header_font
         cell.alignment = header_alignment
+        header_row.append(cell)
+    ws.append(header_row)
     
     # Write data
-    for row, process in enumerate(processes, 2):
-        ws.cell(row=row, column=1, value=process.process_number)
-        ws.cell(row=row, column=2, value=process.get_status_display())
-        ws.cell(row=row, column=3, value=process.get_process_type_display())
-        ws.cell(row=row, column=4, value=process.process_class)
-        ws.cell(row=row, column=5, value=process.subject)
-        ws.cell(row=row, column=6, value=process.judge)
-        ws.cell(row=row, column=7, value=process.court)
-        ws.cell(row=row, column=8, value=process.jurisdiction)
-        ws.cell(row=row, column=9, value=process.district)
-        ws.cell(row=row, column=10, value=float(process.action_value))
-        distribution_date = remove_tz(process.distribution_date) if process.distribution_date else None
-        created_at = remove_tz(process.created_at) if process.created_at else None
-        ws.cell(row=row, column=11, value=distribution_date)
-        ws.cell(row=row, column=12, value=created_at)
-    
-    # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
+    last = None
+    for process in processes:
+        last = process
+        ws.append([
+            process.process_number,
+            process.get_status_display(),
+            process.get_process_type_display(),
+            process.process_class,
+            process.subject,
+            process.judge,
+            process.court,
+            process.jurisdiction,
+            process.district,
+            float(process.action_value),
+            remove_tz(process.distribution_date) if process.distribution_date else None,
+            remove_tz(process.created_at) if process.created_at else None,
+        ])
     
     # Create response
     response = HttpResponse(
         content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     )
     response['Content-Disposition'] = 'attachment; filename=legal_processes.xlsx'
+    if delta.is_delta():
+        response['X-Next-Cursor'] = (
+            encode_cursor(last) if last is not None else request.GET.get('cursor', '')
+        )
     
     wb.save(response)
     return response
@@ -0,0 +1,35 @@
+"""
+Admin configuration for reports application.
+"""
+
+from django.contrib import admin
+from .models import ProcessSummary
+
+
+@admin.register(ProcessSummary)
+class ProcessSummaryAdmin(admin.ModelAdmin):
+    """Read-only admin for the pre-aggregated process summaries."""
+
+    list_display = [
+        'dimension',
+        'key',
+        'process_count',
+        'total_action_value',
+        'updated_at',
+    ]
+
+    list_filter = [
+        'dimension',
+    ]
+
+    search_fields = [
+        'key',
+    ]
+
+    ordering = ['dimension', '-total_action_value']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
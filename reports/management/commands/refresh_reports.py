@@ -0,0 +1,34 @@
+"""
+Management command to rebuild the pre-aggregated process reports.
+"""
+
+from django.core.management.base import BaseCommand
+
+from reports.services import rebuild_summaries
+
+
+class Command(BaseCommand):
+    """Command to recompute the process summaries from scratch."""
+
+    help = 'Rebuild the process report summaries from the processes table'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--concurrently',
+            action='store_true',
+            help=(
+                'Only write the groups that changed, in short batches, '
+                'without replacing the whole table'
+            )
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command execution."""
+        result = rebuild_summaries(concurrently=options['concurrently'])
+        self.stdout.write(
+            self.style.SUCCESS(
+                'Reports refreshed: {created} created, {updated} updated, '
+                '{deleted} deleted'.format(**result)
+            )
+        )
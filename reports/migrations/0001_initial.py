@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:25
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('court', 'Court'), ('district', 'District'), ('judge', 'Judge'), ('subject', 'Subject'), ('status', 'Status'), ('month', 'Distribution month')], help_text='Attribute the processes are grouped by', max_length=20)),
+                ('key', models.CharField(blank=True, help_text='Group value (e.g., court name or YYYY-MM month)', max_length=200)),
+                ('process_count', models.BigIntegerField(default=0)),
+                ('total_action_value', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=20)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Process summary',
+                'verbose_name_plural': 'Process summaries',
+                'ordering': ['dimension', '-total_action_value'],
+                'unique_together': {('dimension', 'key')},
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:32
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+LOOKUP_COLUMNS = {
+    'court': 'court_ref_id',
+    'district': 'district_ref_id',
+    'judge': 'judge_ref_id',
+    'subject': 'subject_ref_id',
+}
+
+
+def rekey_lookup_summaries(apps, schema_editor):
+    """Regroup the lookup dimensions by lookup id instead of by name."""
+    Process = apps.get_model('processes', 'Process')
+    ProcessSummary = apps.get_model('reports', 'ProcessSummary')
+    for dimension, column in LOOKUP_COLUMNS.items():
+        ProcessSummary.objects.filter(dimension=dimension).delete()
+        rows = (
+            Process.objects.order_by()
+            .values(column)
+            .annotate(process_count=Count('pk'), total=Sum('action_value'))
+        )
+        ProcessSummary.objects.bulk_create(
+            [
+                ProcessSummary(
+                    dimension=dimension,
+                    key='' if row[column] is None else str(row[column]),
+                    process_count=row['process_count'],
+                    total_action_value=row['total'] or Decimal('0.00'),
+                )
+                for row in rows
+            ],
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+        ('processes', '0004_remove_process_text_columns'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='processsummary',
+            name='key',
+            field=models.CharField(blank=True, help_text='Group value (lookup id, status or YYYY-MM month)', max_length=200),
+        ),
+        migrations.RunPython(
+            rekey_lookup_summaries, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,53 @@
+"""
+Models for reports application.
+"""
+
+from decimal import Decimal
+
+from django.db import models
+
+
+class ProcessSummary(models.Model):
+    """
+    Pre-aggregated process totals for one value of one report dimension.
+
+    Rows are maintained incrementally when processes change and can be
+    rebuilt from scratch with the ``refresh_reports`` command.
+    """
+    DIMENSION_CHOICES = [
+        ('court', 'Court'),
+        ('district', 'District'),
+        ('judge', 'Judge'),
+        ('subject', 'Subject'),
+        ('status', 'Status'),
+        ('month', 'Distribution month'),
+    ]
+
+    dimension = models.CharField(
+        max_length=20,
+        choices=DIMENSION_CHOICES,
+        help_text="Attribute the processes are grouped by"
+    )
+    key = models.CharField(
+        max_length=200,
+        blank=True,
+        help_text="Group value (lookup id, status or YYYY-MM month)"
+    )
+    process_count = models.BigIntegerField(default=0)
+    total_action_value = models.DecimalField(
+        max_digits=20,
+        decimal_places=2,
+        default=Decimal('0.00')
+    )
+
+    # Metadata
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Process summary"
+        verbose_name_plural = "Process summaries"
+        ordering = ['dimension', '-total_action_value']
+        unique_together = ['dimension', 'key']
+
+    def __str__(self):
+        return f"{self.get_dimension_display()}: {self.key or '-'}"
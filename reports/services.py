@@ -0,0 +1,268 @@
+"""
+Maintenance of the pre-aggregated process reports.
+
+Process saves and deletes queue a delta per dimension; the deltas of a
+transaction are merged and applied once, right after it commits. A full
+rebuild recomputes every group from the live and archived processes and
+is meant for the initial load and for healing drift (e.g. after raw SQL edits).
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from archive.models import ArchivedProcess
+from legal_processes.chunking import iterate
+from legal_processes.transactions import CommitBuffer
+from processes.models import Process
+
+from .models import ProcessSummary
+
+DIMENSIONS = [dimension for dimension, _ in ProcessSummary.DIMENSION_CHOICES]
+
+# Process column each dimension (except ``month``) is grouped on. The
+# lookup dimensions are keyed by the lookup row id, not by its name.
+GROUP_COLUMNS = {
+    'court': 'court_ref_id',
+    'district': 'district_ref_id',
+    'judge': 'judge_ref_id',
+    'subject': 'subject_ref_id',
+    'status': 'status',
+}
+
+# Process columns every summary key is derived from.
+SOURCE_FIELDS = [
+    *GROUP_COLUMNS.values(),
+    'distribution_date',
+    'action_value',
+]
+
+BATCH_SIZE = 500
+
+
+def summary_keys(values):
+    """Return the summary key of every dimension for a process."""
+    keys = {
+        dimension: _group_key(values.get(column))
+        for dimension, column in GROUP_COLUMNS.items()
+    }
+    distribution_date = values.get('distribution_date')
+    keys['month'] = (
+        distribution_date.strftime('%Y-%m') if distribution_date else ''
+    )
+    return keys
+
+
+def _group_key(value):
+    return '' if value is None else str(value)
+
+
+def summary_labels(dimension, keys):
+    """Map summary keys of ``dimension`` to human-readable labels."""
+    if dimension in Process.LOOKUP_FIELDS:
+        ids = [int(key) for key in keys if key]
+        names = Process.LOOKUP_FIELDS[dimension].objects.in_bulk(ids)
+        return {
+            key: names[int(key)].name if key and int(key) in names else ''
+            for key in keys
+        }
+    if dimension == 'status':
+        choices = dict(Process.PROCESS_STATUS_CHOICES)
+        return {key: choices.get(key, key) for key in keys}
+    return {key: key for key in keys}
+
+
+def process_values(process):
+    """Return the current report-relevant values of a process instance."""
+    return {field: getattr(process, field) for field in SOURCE_FIELDS}
+
+
+def process_deltas(values, sign):
+    """Build the deltas that add (``sign=1``) or remove (``-1``) a process."""
+    action_value = Decimal(values.get('action_value') or 0)
+    return [
+        (dimension, key, sign, sign * action_value)
+        for dimension, key in summary_keys(values).items()
+    ]
+
+
+def queue_process_change(old_values=None, new_values=None):
+    """Queue the summary change for a process until the transaction commits."""
+    deltas = []
+    if old_values is not None:
+        deltas.extend(process_deltas(old_values, -1))
+    if new_values is not None:
+        deltas.extend(process_deltas(new_values, 1))
+    _pending_deltas.extend(deltas)
+
+
+def apply_deltas(deltas):
+    """Merge ``(dimension, key, count, total)`` deltas and write them."""
+    merged = defaultdict(lambda: [0, Decimal('0.00')])
+    for dimension, key, count, total in deltas:
+        merged[(dimension, key)][0] += count
+        merged[(dimension, key)][1] += total
+
+    touched = defaultdict(list)
+    with transaction.atomic():
+        # Sorted keys keep the row lock order stable between writers.
+        for (dimension, key), (count, total) in sorted(merged.items()):
+            if not count and not total:
+                continue
+            touched[dimension].append(key)
+            _apply_delta(dimension, key, count, total)
+        for dimension, keys in touched.items():
+            ProcessSummary.objects.filter(
+                dimension=dimension,
+                key__in=keys,
+                process_count__lte=0,
+            ).delete()
+
+
+def _apply_delta(dimension, key, count, total):
+    summaries = ProcessSummary.objects.filter(dimension=dimension, key=key)
+    updated = summaries.update(
+        process_count=F('process_count') + count,
+        total_action_value=F('total_action_value') + total,
+    )
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            ProcessSummary.objects.create(
+                dimension=dimension,
+                key=key,
+                process_count=count,
+                total_action_value=total,
+            )
+    except IntegrityError:
+        # Another writer created the group in the meantime.
+        summaries.update(
+            process_count=F('process_count') + count,
+            total_action_value=F('total_action_value') + total,
+        )
+
+
+_pending_deltas = CommitBuffer(apply_deltas)
+
+
+def aggregate_processes(queryset=None):
+    """
+    Compute ``{(dimension, key): (count, total)}`` for a process queryset.
+
+    Without a queryset, every live and archived process is counted.
+    """
+    if queryset is None:
+        querysets = [Process.objects.all(), ArchivedProcess.objects.all()]
+    else:
+        querysets = [queryset]
+    totals = {}
+    for queryset in querysets:
+        _aggregate_into(totals, queryset.order_by())
+    return totals
+
+
+def _aggregate_into(totals, queryset):
+    for dimension in DIMENSIONS:
+        if dimension == 'month':
+            rows = queryset.annotate(
+                group=TruncMonth('distribution_date')
+            ).values('group')
+        else:
+            rows = queryset.annotate(
+                group=F(GROUP_COLUMNS[dimension])
+            ).values('group')
+        rows = rows.annotate(
+            process_count=Count('pk'),
+            total=Sum('action_value'),
+        ).values_list('group', 'process_count', 'total')
+        for group, process_count, total in rows:
+            if dimension == 'month':
+                key = summary_keys({'distribution_date': group})['month']
+            else:
+                key = _group_key(group)
+            count, value = totals.get((dimension, key), (0, Decimal('0.00')))
+            totals[(dimension, key)] = (
+                count + process_count,
+                value + (total or Decimal('0.00')),
+            )
+
+
+def rebuild_summaries(concurrently=False):
+    """
+    Recompute every summary row from the live and archived processes.
+
+    A plain rebuild replaces the table in one transaction. A concurrent
+    rebuild only writes the groups that differ, in short batches, so
+    readers and incremental updates are never blocked for long.
+    Returns a dict with the number of created, updated and deleted rows.
+    """
+    totals = aggregate_processes()
+    if not concurrently:
+        with transaction.atomic():
+            deleted, _ = ProcessSummary.objects.all().delete()
+            ProcessSummary.objects.bulk_create(
+                [
+                    ProcessSummary(
+                        dimension=dimension,
+                        key=key,
+                        process_count=count,
+                        total_action_value=total,
+                    )
+                    for (dimension, key), (count, total) in totals.items()
+                ],
+                batch_size=BATCH_SIZE,
+            )
+        return {'created': len(totals), 'updated': 0, 'deleted': deleted}
+
+    existing = {
+        (summary.dimension, summary.key): summary
+        for summary in iterate(ProcessSummary.objects.all())
+    }
+    to_create = []
+    to_update = []
+    for group, (count, total) in totals.items():
+        summary = existing.pop(group, None)
+        if summary is None:
+            to_create.append(ProcessSummary(
+                dimension=group[0],
+                key=group[1],
+                process_count=count,
+                total_action_value=total,
+            ))
+        elif (summary.process_count, summary.total_action_value) != (
+            count, total
+        ):
+            summary.process_count = count
+            summary.total_action_value = total
+            to_update.append(summary)
+    stale_ids = [summary.pk for summary in existing.values()]
+    now = timezone.now()
+    for summary in to_update:
+        summary.updated_at = now
+
+    for start in range(0, len(to_create), BATCH_SIZE):
+        with transaction.atomic():
+            ProcessSummary.objects.bulk_create(
+                to_create[start:start + BATCH_SIZE]
+            )
+    for start in range(0, len(to_update), BATCH_SIZE):
+        with transaction.atomic():
+            ProcessSummary.objects.bulk_update(
+                to_update[start:start + BATCH_SIZE],
+                ['process_count', 'total_action_value', 'updated_at'],
+            )
+    for start in range(0, len(stale_ids), BATCH_SIZE):
+        with transaction.atomic():
+            ProcessSummary.objects.filter(
+                pk__in=stale_ids[start:start + BATCH_SIZE]
+            ).delete()
+    return {
+        'created': len(to_create),
+        'updated': len(to_update),
+        'deleted': len(stale_ids),
+    }
@@ -0,0 +1,59 @@
+"""
+Signal handlers that keep the process summaries up to date.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from processes.models import Process
+from processes.signals import pre_bulk_delete, pre_bulk_update
+
+from .services import SOURCE_FIELDS, process_values, queue_process_change
+
+
+@receiver(pre_save, sender=Process)
+def remember_summary_values(sender, instance, raw=False, **kwargs):
+    """Load the stored values of processes that were not read from the DB."""
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is not None and all(field in loaded for field in SOURCE_FIELDS):
+        return
+    stored = sender.objects.filter(pk=instance.pk).values(*SOURCE_FIELDS).first()
+    if stored is not None:
+        instance._loaded_values = {**(loaded or {}), **stored}
+
+
+@receiver(post_save, sender=Process)
+def update_summaries_on_save(sender, instance, created, raw=False, **kwargs):
+    """Move the process from its old summary groups to the new ones."""
+    if raw:
+        return
+    old_values = None
+    if not created:
+        loaded = getattr(instance, '_loaded_values', None) or {}
+        if all(field in loaded for field in SOURCE_FIELDS):
+            old_values = {field: loaded[field] for field in SOURCE_FIELDS}
+    queue_process_change(old_values, process_values(instance))
+
+
+@receiver(post_delete, sender=Process)
+def update_summaries_on_delete(sender, instance, **kwargs):
+    """Remove the deleted process from its summary groups."""
+    queue_process_change(process_values(instance), None)
+
+
+@receiver(pre_bulk_delete, sender=Process)
+def update_summaries_on_bulk_delete(sender, ids, **kwargs):
+    """Remove a chunk of bulk deleted processes from their summary groups."""
+    for values in sender.objects.filter(pk__in=ids).values(*SOURCE_FIELDS):
+        queue_process_change(values, None)
+
+
+@receiver(pre_bulk_update, sender=Process)
+def update_summaries_on_bulk_update(sender, ids, values, **kwargs):
+    """Move a chunk of bulk updated processes to their new summary groups."""
+    if not any(field in SOURCE_FIELDS for field in values):
+        return
+    for old_values in sender.objects.filter(pk__in=ids).values(*SOURCE_FIELDS):
+        queue_process_change(old_values, {**old_values, **values})
@@ -0,0 +1,526 @@
+"""
+Columnar, memory-mapped snapshot of the process and party tables.
+
+Like the report summaries, the snapshot covers live and archived rows:
+each table is read from both with one ``UNION ALL`` statement, so a row
+moved between them while the snapshot is read is seen exactly once.
+
+Analytics over the whole table (value distributions, counts per
+district, date histograms) run on NumPy arrays instead of model
+instances:
+
+* choice fields are dictionary-encoded against their ``choices``;
+* lookup columns (court, district, judge, subject) keep their lookup
+  row id, with the ``id -> name`` dictionary stored next to the data;
+* ``action_value`` is stored as integer cents;
+* dates are stored as ``int32`` day numbers since 1970-01-01.
+
+Each column is an ``.npy`` file opened with ``mmap_mode='r'``, so
+several worker processes share the same pages. A refresh only reads the
+rows whose ``updated_at`` moved past the stored watermark, writes a new
+version directory and then switches the ``CURRENT`` pointer, so readers
+never see a half-written snapshot.
+
+Example::
+
+    snapshot = Snapshot.load()
+    active = snapshot.processes.filter(status='active')
+    active.sum('action_value')
+    active.group_by('district').count()
+    snapshot.processes.group_by('distribution_date__month').sum('action_value')
+"""
+
+import datetime
+import json
+import os
+import shutil
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from archive.models import ArchivedParty, ArchivedProcess
+from legal_processes.chunking import CHUNK_SIZE
+from parties.models import Party
+from processes.models import Process
+
+NULL_DAY = np.iinfo(np.int32).min
+NO_MATCH = -2
+EPOCH = datetime.date(1970, 1, 1)
+CURRENT_FILE = 'CURRENT'
+META_FILE = 'meta.json'
+
+# Rows are re-read this far behind the watermark, so rows written by
+# transactions that committed after a refresh started are not missed.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+class Column:
+    """Definition of one snapshot column."""
+
+    def __init__(self, name, kind, source=None, choices=None, model=None):
+        self.name = name
+        self.kind = kind
+        self.source = source or name
+        self.choices = [value for value, _ in choices] if choices else None
+        self.model = model
+
+    @property
+    def dtype(self):
+        return {
+            'int': np.int64,
+            'cents': np.int64,
+            'day': np.int32,
+            'choice': np.int8,
+            'lookup': np.int32,
+        }[self.kind]
+
+    @property
+    def is_dictionary(self):
+        return self.kind in ('choice', 'lookup')
+
+
+class Table:
+    """Definition of one snapshot table."""
+
+    def __init__(self, name, models, columns):
+        self.name = name
+        self.models = models
+        self.columns = {column.name: column for column in columns}
+
+    @property
+    def sources(self):
+        return [column.source for column in self.columns.values()]
+
+    def rows(self, *fields, flat=False, **filters):
+        """Iterate ``fields`` of the rows of every model, in one statement."""
+        first, *rest = [
+            model.objects.filter(**filters).order_by().values_list(*fields, flat=flat)
+            for model in self.models
+        ]
+        return first.union(*rest, all=True).iterator(chunk_size=CHUNK_SIZE)
+
+
+TABLES = [
+    Table('processes', [Process, ArchivedProcess], [
+        Column('id', 'int'),
+        Column('status', 'choice', choices=Process.PROCESS_STATUS_CHOICES),
+        Column(
+            'process_type', 'choice', choices=Process.PROCESS_TYPE_CHOICES
+        ),
+        *(
+            Column(
+                field,
+                'lookup',
+                source=f'{field}_ref_id',
+                model=Process.LOOKUP_FIELDS[field],
+            )
+            for field in ('court', 'district', 'judge', 'subject')
+        ),
+        Column('action_value', 'cents'),
+        Column('distribution_date', 'day'),
+    ]),
+    Table('parties', [Party, ArchivedParty], [
+        Column('id', 'int'),
+        Column('process_id', 'int'),
+        Column('person_id', 'int'),
+        Column('category', 'choice', choices=Party.PARTY_CATEGORY_CHOICES),
+    ]),
+]
+
+
+def default_path():
+    """Return the configured snapshot directory."""
+    return Path(settings.REPORTS_SNAPSHOT_DIR)
+
+
+def date_to_day(value):
+    """Convert a date to its day number, ``NULL_DAY`` for ``None``."""
+    if value is None:
+        return NULL_DAY
+    return (value - EPOCH).days
+
+
+def day_to_date(value):
+    """Convert a day number back to a date."""
+    if value == NULL_DAY:
+        return None
+    return EPOCH + timedelta(days=int(value))
+
+
+def decimal_to_cents(value):
+    """Convert a decimal amount to integer cents."""
+    return int((Decimal(value or 0) * 100).to_integral_value())
+
+
+class Dictionary:
+    """Bidirectional mapping between values and their integer codes."""
+
+    def __init__(self, items=()):
+        self.values = dict(items)
+        self.codes = {value: code for code, value in self.values.items()}
+
+    @classmethod
+    def from_choices(cls, choices):
+        return cls(enumerate(choices))
+
+    def encode(self, value):
+        return self.codes.get(value, NO_MATCH)
+
+    def decode(self, code):
+        return self.values.get(code)
+
+
+def _dictionaries(table, stored=None):
+    """
+    Build the dictionaries of a table, from ``stored`` (as saved in the
+    snapshot metadata) or, for lookup columns, from the lookup tables.
+    """
+    dictionaries = {}
+    for column in table.columns.values():
+        if column.kind == 'choice':
+            dictionaries[column.name] = Dictionary.from_choices(column.choices)
+        elif column.kind == 'lookup':
+            if stored is None:
+                items = column.model.objects.values_list('id', 'name')
+                # Processes without a value are stored as -1.
+                items = [(-1, ''), *items]
+            else:
+                items = stored[column.name]
+            dictionaries[column.name] = Dictionary(items)
+    return dictionaries
+
+
+def _encode(table, rows, dictionaries):
+    """Encode ``values_list`` rows into one array per column."""
+    encoded = {name: [] for name in table.columns}
+    for row in rows:
+        for column, value in zip(table.columns.values(), row):
+            if column.kind == 'cents':
+                value = decimal_to_cents(value)
+            elif column.kind == 'day':
+                value = date_to_day(value)
+            elif column.kind == 'choice':
+                value = dictionaries[column.name].encode(value)
+                value = -1 if value == NO_MATCH else value
+            elif column.kind == 'lookup':
+                value = -1 if value is None else value
+            encoded[column.name].append(value)
+    return {
+        name: np.array(values, dtype=table.columns[name].dtype)
+        for name, values in encoded.items()
+    }
+
+
+def _read_rows(table, dictionaries, **filters):
+    """Read and encode rows in chunks, returning arrays and max ts."""
+    parts = []
+    watermark = None
+    chunk = []
+    rows = table.rows('updated_at', *table.sources, **filters)
+    for updated_at, *row in rows:
+        if watermark is None or updated_at > watermark:
+            watermark = updated_at
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            parts.append(_encode(table, chunk, dictionaries))
+            chunk = []
+    parts.append(_encode(table, chunk, dictionaries))
+    arrays = {
+        name: np.concatenate([part[name] for part in parts])
+        for name in table.columns
+    }
+    return arrays, watermark
+
+
+def _refresh_table(table, previous):
+    """Return ``(arrays, dictionaries, watermark, changed)`` for a table."""
+    stored_watermark = None
+    if previous is not None:
+        stored_watermark = parse_datetime(
+            previous.meta['tables'][table.name]['watermark'] or ''
+        )
+
+    if previous is None or stored_watermark is None:
+        dictionaries = _dictionaries(table)
+        arrays, watermark = _read_rows(table, dictionaries)
+        return arrays, dictionaries, watermark, len(arrays['id'])
+
+    current = previous.tables[table.name]
+    dictionaries = _dictionaries(table)
+    changed, watermark = _read_rows(
+        table,
+        dictionaries,
+        updated_at__gte=stored_watermark - WATERMARK_OVERLAP,
+    )
+    live_ids = np.fromiter(table.rows('id', flat=True), dtype=np.int64)
+    ids = current.columns['id']
+    keep = np.isin(ids, live_ids) & ~np.isin(ids, changed['id'])
+    arrays = {
+        name: np.concatenate([np.asarray(current.columns[name])[keep],
+                              changed[name]])
+        for name in table.columns
+    }
+    order = np.argsort(arrays['id'], kind='stable')
+    arrays = {name: array[order] for name, array in arrays.items()}
+    removed = int(len(ids) - keep.sum())
+    return (
+        arrays,
+        dictionaries,
+        max(filter(None, [stored_watermark, watermark])),
+        len(changed['id']) + removed,
+    )
+
+
+def refresh_snapshot(path=None, full=False):
+    """
+    Write a new snapshot version and make it current.
+
+    Unless ``full`` is set, only rows changed since the stored watermark
+    are read from the database. Returns ``{table: rows_changed}``.
+    """
+    path = Path(path or default_path())
+    path.mkdir(parents=True, exist_ok=True)
+    previous = None if full else Snapshot.load(path, missing_ok=True)
+
+    version = timezone.now().strftime('%Y%m%d%H%M%S%f')
+    target = path / version
+    target.mkdir()
+    meta = {'version': version, 'tables': {}, 'dictionaries': {}}
+    stats = {}
+    for table in TABLES:
+        arrays, dictionaries, watermark, changed = _refresh_table(
+            table, previous
+        )
+        for name, array in arrays.items():
+            np.save(target / f'{table.name}.{name}.npy', array)
+        meta['tables'][table.name] = {
+            'rows': int(len(arrays['id'])),
+            'watermark': watermark.isoformat() if watermark else None,
+        }
+        meta['dictionaries'][table.name] = {
+            name: list(dictionary.values.items())
+            for name, dictionary in dictionaries.items()
+            if table.columns[name].kind == 'lookup'
+        }
+        stats[table.name] = changed
+    with open(target / META_FILE, 'w', encoding='utf-8') as file:
+        json.dump(meta, file)
+
+    pointer = path / f'{CURRENT_FILE}.tmp'
+    pointer.write_text(version, encoding='utf-8')
+    os.replace(pointer, path / CURRENT_FILE)
+    _remove_old_versions(path, keep={version, previous and previous.version})
+    return stats
+
+
+def _remove_old_versions(path, keep):
+    for entry in path.iterdir():
+        if entry.is_dir() and entry.name not in keep:
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+class Snapshot:
+    """A loaded, memory-mapped snapshot version."""
+
+    def __init__(self, path, meta):
+        self.path = Path(path)
+        self.meta = meta
+        self.version = meta['version']
+        self.tables = {
+            table.name: SnapshotTable(
+                table,
+                {
+                    name: np.load(
+                        self.path / f'{table.name}.{name}.npy',
+                        mmap_mode='r',
+                    )
+                    for name in table.columns
+                },
+                _dictionaries(table, meta['dictionaries'][table.name]),
+            )
+            for table in TABLES
+        }
+
+    @classmethod
+    def load(cls, path=None, missing_ok=False):
+        """Open the current snapshot version under ``path``."""
+        path = Path(path or default_path())
+        try:
+            version = (path / CURRENT_FILE).read_text(encoding='utf-8')
+        except FileNotFoundError:
+            if missing_ok:
+                return None
+            raise
+        version = version.strip()
+        with open(path / version / META_FILE, encoding='utf-8') as file:
+            meta = json.load(file)
+        return cls(path / version, meta)
+
+    @property
+    def processes(self):
+        return self.tables['processes']
+
+    @property
+    def parties(self):
+        return self.tables['parties']
+
+
+class SnapshotTable:
+    """Column arrays of one table with a small query API."""
+
+    def __init__(self, table, columns, dictionaries):
+        self.table = table
+        self.columns = columns
+        self.dictionaries = dictionaries
+
+    def __len__(self):
+        return len(self.columns['id'])
+
+    def all(self):
+        return Selection(self, np.ones(len(self), dtype=bool))
+
+    def filter(self, **conditions):
+        return self.all().filter(**conditions)
+
+    def group_by(self, name):
+        return self.all().group_by(name)
+
+    def count(self):
+        return len(self)
+
+    def sum(self, name):
+        return self.all().sum(name)
+
+    def _column(self, name):
+        """Return ``(definition, array)`` for a column or derived column."""
+        base, _, part = name.partition('__')
+        column = self.table.columns.get(base)
+        if column is None:
+            raise ValueError(f'Unknown column: {name}')
+        array = self.columns[base]
+        if not part:
+            return column, array
+        if column.kind != 'day' or part not in ('month', 'year'):
+            raise ValueError(f'Unknown column: {name}')
+        dates = np.where(array == NULL_DAY, np.iinfo(np.int32).max, array)
+        unit = 'M' if part == 'month' else 'Y'
+        derived = dates.astype('datetime64[D]').astype(f'datetime64[{unit}]')
+        derived = derived.astype(np.int64)
+        derived[array == NULL_DAY] = np.iinfo(np.int64).min
+        return Column(name, part), derived
+
+    def _encode_value(self, column, value):
+        if column.kind == 'cents':
+            return decimal_to_cents(value)
+        if column.kind == 'day':
+            return date_to_day(value)
+        if column.is_dictionary:
+            return self.dictionaries[column.name].encode(value)
+        return value
+
+    def _decode(self, column, code):
+        if column.is_dictionary:
+            return self.dictionaries[column.name].decode(int(code))
+        if column.kind == 'day':
+            return day_to_date(code)
+        if column.kind in ('month', 'year'):
+            if code == np.iinfo(np.int64).min:
+                return None
+            unit = 'M' if column.kind == 'month' else 'Y'
+            return str(np.datetime64(int(code), unit))
+        if column.kind == 'cents':
+            return Decimal(int(code)) / 100
+        return int(code)
+
+    def _mask(self, condition, value):
+        name, _, lookup = condition.partition('__')
+        lookup = lookup or 'exact'
+        column = self.table.columns.get(name)
+        if column is None:
+            raise ValueError(f'Unknown column: {name}')
+        array = self.columns[name]
+        if lookup == 'isnull':
+            if column.kind != 'day':
+                raise ValueError(f'isnull is not supported on {name}')
+            return (array == NULL_DAY) == bool(value)
+        if lookup == 'in':
+            codes = [self._encode_value(column, item) for item in value]
+            return np.isin(array, codes)
+        if column.is_dictionary and lookup != 'exact':
+            raise ValueError(f'{lookup} is not supported on {name}')
+        encoded = self._encode_value(column, value)
+        if lookup == 'exact':
+            return array == encoded
+        if column.kind == 'day':
+            array = np.where(array == NULL_DAY, np.nan, array)
+        operations = {
+            'gt': np.greater,
+            'gte': np.greater_equal,
+            'lt': np.less,
+            'lte': np.less_equal,
+        }
+        if lookup not in operations:
+            raise ValueError(f'Unknown lookup: {lookup}')
+        return operations[lookup](array, encoded)
+
+
+class Selection:
+    """Rows of a snapshot table that match a set of filters."""
+
+    def __init__(self, table, mask):
+        self.table = table
+        self.mask = mask
+
+    def filter(self, **conditions):
+        mask = self.mask.copy()
+        for condition, value in conditions.items():
+            mask &= self.table._mask(condition, value)
+        return Selection(self.table, mask)
+
+    def count(self):
+        return int(self.mask.sum())
+
+    def sum(self, name):
+        column, array = self.table._column(name)
+        total = int(np.asarray(array)[self.mask].sum(dtype=np.int64))
+        if column.kind == 'cents':
+            return Decimal(total) / 100
+        return total
+
+    def group_by(self, name):
+        return Grouping(self, name)
+
+
+class Grouping:
+    """A selection grouped by the values of one column."""
+
+    def __init__(self, selection, name):
+        self.selection = selection
+        self.table = selection.table
+        self.column, array = self.table._column(name)
+        keys = np.asarray(array)[selection.mask]
+        self.keys, self.inverse = np.unique(keys, return_inverse=True)
+
+    def _result(self, values):
+        return {
+            self.table._decode(self.column, key): value
+            for key, value in zip(self.keys, values)
+        }
+
+    def count(self):
+        counts = np.bincount(self.inverse, minlength=len(self.keys))
+        return self._result(int(count) for count in counts)
+
+    def sum(self, name):
+        column, array = self.table._column(name)
+        values = np.asarray(array)[self.selection.mask].astype(np.int64)
+        totals = np.zeros(len(self.keys), dtype=np.int64)
+        np.add.at(totals, self.inverse, values)
+        if column.kind == 'cents':
+            return self._result(Decimal(int(total)) / 100 for total in totals)
+        return self._result(int(total) for total in totals)
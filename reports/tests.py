@@ -0,0 +1,340 @@
+"""
+Tests for reports application.
+"""
+
+import datetime
+import shutil
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import Permission, User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from archive.services import archive_processes, restore_batch
+from parties.models import Party
+from processes.models import Judge, Process
+
+from .models import ProcessSummary
+from .services import apply_deltas, rebuild_summaries
+from .snapshot import Snapshot, refresh_snapshot
+
+
+def create_process(number, **kwargs):
+    """Create a process with sensible defaults for report tests."""
+    defaults = {
+        'process_class': 'Execução de Título Extrajudicial',
+        'subject': 'Locação de Imóvel',
+        'judge': 'Mariana',
+        'court': 'Foro Regional VIII - Tatuapé',
+        'district': 'São Paulo',
+        'action_value': Decimal('100.00'),
+        'distribution_date': datetime.date(2016, 5, 10),
+    }
+    defaults.update(kwargs)
+    return Process.objects.create(process_number=number, **defaults)
+
+
+def summary_callbacks(callbacks):
+    """Return the commit callbacks that apply summary deltas."""
+    return [
+        callback for callback in callbacks
+        if getattr(getattr(callback, '__self__', None), 'flush', None) is apply_deltas
+    ]
+
+
+def summary(dimension, key):
+    """Return ``(count, total)`` of a summary row or ``None``."""
+    if dimension in Process.LOOKUP_FIELDS and key:
+        lookup = Process.LOOKUP_FIELDS[dimension].objects.filter(name=key)
+        key = str(lookup.values_list('pk', flat=True).first())
+    row = ProcessSummary.objects.filter(dimension=dimension, key=key).first()
+    if row is None:
+        return None
+    return row.process_count, row.total_action_value
+
+
+class ProcessSummaryMaintenanceTest(TestCase):
+    """Test cases for the incremental summary maintenance."""
+
+    def test_create_adds_process_to_every_dimension(self):
+        """Test that a new process is counted once per dimension."""
+        with self.captureOnCommitCallbacks(execute=True):
+            create_process('1004030-81.2016.0.00.0008')
+
+        self.assertEqual(summary('judge', 'Mariana'), (1, Decimal('100.00')))
+        self.assertEqual(summary('status', 'active'), (1, Decimal('100.00')))
+        self.assertEqual(summary('month', '2016-05'), (1, Decimal('100.00')))
+        self.assertEqual(ProcessSummary.objects.count(), 6)
+
+    def test_transaction_is_applied_once_on_commit(self):
+        """Test that the deltas of one transaction are merged."""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            create_process('1004030-81.2016.0.00.0008')
+            create_process('1007944-79.2020.0.00.0361')
+
+        self.assertEqual(len(summary_callbacks(callbacks)), 1)
+        self.assertEqual(summary('judge', 'Mariana'), (2, Decimal('200.00')))
+
+    def test_update_moves_process_between_groups(self):
+        """Test that editing a process updates old and new groups."""
+        with self.captureOnCommitCallbacks(execute=True):
+            process = create_process('1004030-81.2016.0.00.0008')
+        process = Process.objects.get(pk=process.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            process.judge = 'Domingos Parra Neto'
+            process.action_value = Decimal('250.00')
+            process.save()
+
+        self.assertIsNone(summary('judge', 'Mariana'))
+        self.assertEqual(
+            summary('judge', 'Domingos Parra Neto'), (1, Decimal('250.00'))
+        )
+        self.assertEqual(summary('status', 'active'), (1, Decimal('250.00')))
+
+    def test_delete_removes_process(self):
+        """Test that deleting a process empties its groups."""
+        with self.captureOnCommitCallbacks(execute=True):
+            process = create_process('1004030-81.2016.0.00.0008')
+        with self.captureOnCommitCallbacks(execute=True):
+            process.delete()
+
+        self.assertFalse(ProcessSummary.objects.exists())
+
+    def test_rollback_discards_pending_deltas(self):
+        """Test that rolled back changes never reach the summaries."""
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            create_process('1004030-81.2016.0.00.0008')
+        self.assertEqual(len(summary_callbacks(callbacks)), 1)
+        self.assertFalse(ProcessSummary.objects.exists())
+
+
+class RebuildSummariesTest(TestCase):
+    """Test cases for the full summary rebuild."""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_process('1004030-81.2016.0.00.0008')
+        create_process(
+            '1007944-79.2020.0.00.0361',
+            judge='Domingos Parra Neto',
+            status='archived',
+            action_value=Decimal('51336.07'),
+            distribution_date=None,
+        )
+
+    def test_rebuild(self):
+        """Test that a rebuild recomputes every group."""
+        rebuild_summaries()
+
+        self.assertEqual(summary('judge', 'Mariana'), (1, Decimal('100.00')))
+        self.assertEqual(
+            summary('status', 'archived'), (1, Decimal('51336.07'))
+        )
+        self.assertEqual(summary('month', ''), (1, Decimal('51336.07')))
+        self.assertEqual(
+            summary('court', 'Foro Regional VIII - Tatuapé'),
+            (2, Decimal('51436.07')),
+        )
+
+    def test_concurrent_rebuild_only_writes_differences(self):
+        """Test that a concurrent rebuild fixes drift in place."""
+        rebuild_summaries()
+        ProcessSummary.objects.filter(dimension='status', key='active').update(
+            process_count=7
+        )
+        ProcessSummary.objects.create(dimension='judge', key='Stale')
+
+        result = rebuild_summaries(concurrently=True)
+
+        self.assertEqual(result, {'created': 0, 'updated': 1, 'deleted': 1})
+        self.assertEqual(summary('status', 'active'), (1, Decimal('100.00')))
+        self.assertIsNone(summary('judge', 'Stale'))
+
+    def test_refresh_reports_command(self):
+        """Test the refresh_reports management command."""
+        call_command('refresh_reports', '--concurrently', stdout=StringIO())
+        self.assertEqual(summary('status', 'active'), (1, Decimal('100.00')))
+
+
+class ReportViewsTest(TestCase):
+    """Test cases for report views."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        cls.user.user_permissions.add(
+            Permission.objects.get(codename='view_process')
+        )
+        create_process('1004030-81.2016.0.00.0008')
+        rebuild_summaries()
+
+    def setUp(self):
+        self.client.login(username='testuser', password='testpass123')
+
+    def test_report_list_view(self):
+        """Test the reports page."""
+        response = self.client.get(reverse('reports:report_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Foro Regional VIII - Tatuapé')
+
+    def test_report_data_view(self):
+        """Test the JSON endpoint for one dimension."""
+        response = self.client.get(
+            reverse('reports:report_data'), {'dimension': 'judge'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {'results': {'judge': [{
+                'key': str(Judge.objects.get(name='Mariana').pk),
+                'label': 'Mariana',
+                'process_count': 1,
+                'total_action_value': '100.00',
+            }]}},
+        )
+
+    def test_report_data_unknown_dimension(self):
+        """Test that unknown dimensions are rejected."""
+        response = self.client.get(
+            reverse('reports:report_data'), {'dimension': 'nope'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_reports_require_permission(self):
+        """Test that users without view permission are refused."""
+        User.objects.create_user(username='other', password='testpass123')
+        self.client.login(username='other', password='testpass123')
+        response = self.client.get(reverse('reports:report_list'))
+        self.assertEqual(response.status_code, 403)
+
+
+class SnapshotTest(TestCase):
+    """Test cases for the columnar analytics snapshot."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = create_process('1004030-81.2016.0.00.0008')
+        cls.second = create_process(
+            '1007944-79.2020.0.00.0361',
+            district='Guarulhos',
+            status='archived',
+            action_value=Decimal('51336.07'),
+            distribution_date=datetime.date(2020, 3, 1),
+        )
+        cls.third = create_process(
+            '0000001-02.2021.8.26.0100',
+            distribution_date=None,
+            action_value=Decimal('0.10'),
+        )
+        Party.objects.create(
+            name='Eduardo Amoroso',
+            document='564.406.360-73',
+            category='EXEQUENTE',
+            process=cls.first,
+        )
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path, ignore_errors=True)
+
+    def test_full_snapshot(self):
+        """Test encoding, filters and aggregations on a fresh snapshot."""
+        refresh_snapshot(self.path)
+        snapshot = Snapshot.load(self.path)
+        processes = snapshot.processes
+
+        self.assertEqual(len(processes), 3)
+        self.assertEqual(processes.columns['action_value'].dtype, 'int64')
+        self.assertEqual(processes.columns['distribution_date'].dtype, 'int32')
+        self.assertEqual(processes.sum('action_value'), Decimal('51436.17'))
+        self.assertEqual(processes.filter(status='active').count(), 2)
+        self.assertEqual(
+            processes.filter(status__in=['archived', 'suspended']).count(), 1
+        )
+        self.assertEqual(processes.filter(district='Nowhere').count(), 0)
+        self.assertEqual(
+            processes.group_by('district').count(),
+            {'São Paulo': 2, 'Guarulhos': 1},
+        )
+        self.assertEqual(
+            processes.filter(status='active').group_by('status').sum(
+                'action_value'
+            ),
+            {'active': Decimal('100.10')},
+        )
+        self.assertEqual(
+            processes.group_by('distribution_date__year').count(),
+            {'2016': 1, '2020': 1, None: 1},
+        )
+        self.assertEqual(
+            processes.filter(
+                distribution_date__gte=datetime.date(2017, 1, 1)
+            ).count(),
+            1,
+        )
+        self.assertEqual(
+            snapshot.parties.group_by('category').count(), {'EXEQUENTE': 1}
+        )
+
+    def test_incremental_refresh(self):
+        """Test that a refresh picks up changed and deleted rows."""
+        refresh_snapshot(self.path)
+        Process.objects.filter(pk=self.first.pk).update(
+            status='suspended', updated_at=timezone.now()
+        )
+        Process.objects.filter(pk=self.third.pk).delete()
+
+        refresh_snapshot(self.path)
+        snapshot = Snapshot.load(self.path)
+
+        self.assertEqual(len(snapshot.parties), 1)
+        self.assertEqual(len(snapshot.processes), 2)
+        self.assertEqual(
+            snapshot.processes.group_by('status').count(),
+            {'suspended': 1, 'archived': 1},
+        )
+        self.assertEqual(
+            list(snapshot.processes.columns['id']),
+            sorted([self.first.pk, self.second.pk]),
+        )
+
+    def test_archived_rows_stay_in_snapshot(self):
+        """Test the snapshot counts archived rows, like the summaries."""
+        refresh_snapshot(self.path)
+        archive_processes()
+        for full in (False, True):
+            refresh_snapshot(self.path, full=full)
+            snapshot = Snapshot.load(self.path)
+            self.assertEqual(len(snapshot.processes), 3)
+            self.assertEqual(snapshot.processes.filter(status='archived').count(), 1)
+            self.assertEqual(
+                snapshot.processes.sum('action_value'), Decimal('51436.17')
+            )
+
+        rebuild_summaries()
+        self.assertEqual(
+            ProcessSummary.objects.get(dimension='status', key='archived').process_count,
+            snapshot.processes.filter(status='archived').count(),
+        )
+
+        restore_batch([self.second.pk])
+        refresh_snapshot(self.path)
+        self.assertEqual(
+            list(Snapshot.load(self.path).processes.columns['id']),
+            sorted([self.first.pk, self.second.pk, self.third.pk]),
+        )
+
+    def test_unknown_column(self):
+        """Test that unknown columns are rejected."""
+        refresh_snapshot(self.path)
+        snapshot = Snapshot.load(self.path)
+        with self.assertRaises(ValueError):
+            snapshot.processes.filter(nope=1)
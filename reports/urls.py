@@ -0,0 +1,13 @@
+"""
+URL configuration for reports app.
+"""
+
+from django.urls import path
+from . import views
+
+app_name = 'reports'
+
+urlpatterns = [
+    path('', views.report_list, name='report_list'),
+    path('data/', views.report_data, name='report_data'),
+]
@@ -0,0 +1,87 @@
+"""
+Views for reports application.
+"""
+
+from django.contrib.auth.decorators import login_required, permission_required
+from django.http import JsonResponse
+from django.shortcuts import render
+
+from .models import ProcessSummary
+from .services import summary_labels
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 500
+
+
+def get_summaries(dimension, limit):
+    """
+    Return the top summary rows of a dimension by total action value,
+    each with a ``label`` attribute holding its display name.
+    """
+    summaries = list(
+        ProcessSummary.objects.filter(dimension=dimension).order_by(
+            '-total_action_value', 'key'
+        )[:limit]
+    )
+    labels = summary_labels(dimension, [summary.key for summary in summaries])
+    for summary in summaries:
+        summary.label = labels[summary.key]
+    return summaries
+
+
+def parse_limit(value, default=DEFAULT_LIMIT):
+    """Parse the ``limit`` query parameter, clamped to ``MAX_LIMIT``."""
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(limit, MAX_LIMIT))
+
+
+@login_required
+@permission_required('processes.view_process', raise_exception=True)
+def report_list(request):
+    """Display process totals grouped by every report dimension."""
+    limit = parse_limit(request.GET.get('limit'))
+    reports = [
+        {
+            'dimension': dimension,
+            'label': label,
+            'rows': get_summaries(dimension, limit),
+        }
+        for dimension, label in ProcessSummary.DIMENSION_CHOICES
+    ]
+
+    context = {
+        'reports': reports,
+        'limit': limit,
+    }
+
+    return render(request, 'reports/report_list.html', context)
+
+
+@login_required
+@permission_required('processes.view_process', raise_exception=True)
+def report_data(request):
+    """Return process totals for one or all dimensions as JSON."""
+    dimension = request.GET.get('dimension', '')
+    dimensions = dict(ProcessSummary.DIMENSION_CHOICES)
+    if dimension and dimension not in dimensions:
+        return JsonResponse(
+            {'error': f'Unknown dimension: {dimension}'}, status=400
+        )
+    limit = parse_limit(request.GET.get('limit'), default=MAX_LIMIT)
+
+    data = {}
+    for name in [dimension] if dimension else dimensions:
+        data[name] = [
+            {
+                'key': summary.key,
+                'label': summary.label,
+                'process_count': summary.process_count,
+                'total_action_value': str(summary.total_action_value),
+            }
+            for summary in get_summaries(name, limit)
+        ]
+
+    return JsonResponse({'results': data})
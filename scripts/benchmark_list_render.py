@@ -0,0 +1,99 @@
+"""
+Render-time benchmark for the process and party list pages.
+
+Renders the first page of each list repeatedly against the configured
+database and compares:
+
+- ``uncached``: templates re-read and compiled on every render, every
+  row rendered (how the pages rendered before);
+- ``compiled``: cached template loader, every row rendered;
+- ``row cache``: cached template loader with per-row fragment caching
+  (warm cache).
+
+Usage:
+    python scripts/benchmark_list_render.py [--repeat 200]
+"""
+
+import argparse
+import copy
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'legal_processes.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.cache import caches  # noqa: E402
+from django.test import RequestFactory, override_settings  # noqa: E402
+
+from parties.views import party_list  # noqa: E402
+from processes.views import process_list  # noqa: E402
+
+PAGES = [
+    ('process_list', process_list, '/processes/'),
+    ('party_list', party_list, '/parties/'),
+]
+
+
+def uncached_templates():
+    """TEMPLATES with the plain (non-caching) loaders."""
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]['OPTIONS']['loaders'] = [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]
+    return templates
+
+
+MODES = [
+    ('uncached', {'TEMPLATES': uncached_templates(), 'LIST_FRAGMENT_CACHE': False}),
+    ('compiled', {'LIST_FRAGMENT_CACHE': False}),
+    ('row cache', {'LIST_FRAGMENT_CACHE': True}),
+]
+
+
+def measure(view, path, repeat):
+    """Return the render times of ``view`` in milliseconds."""
+    factory = RequestFactory()
+    # Superusers pass every permission check without queries.
+    user = User(username='benchmark', is_superuser=True, is_active=True)
+    timings = []
+    for _ in range(repeat + 1):
+        request = factory.get(path)
+        request.user = user
+        request._messages = []
+        start = time.perf_counter()
+        view(request)
+        timings.append((time.perf_counter() - start) * 1000)
+    # The first render fills the template and row caches.
+    return timings[1:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    caches[settings.LIST_FRAGMENT_CACHE_ALIAS].clear()
+    print(f"{'page':<14}{'mode':<12}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, view, path in PAGES:
+        baseline = None
+        for mode, overrides in MODES:
+            with override_settings(**overrides):
+                timings = measure(view, path, args.repeat)
+            p50 = statistics.median(timings)
+            p95 = statistics.quantiles(timings, n=20)[-1]
+            baseline = baseline or p50
+            print(f'{name:<14}{mode:<12}{p50:>10.2f}{p95:>10.2f}'
+                  f'  ({baseline / p50:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""
+Latency and query-count regression benchmark for the main views.
+
+Seeds a throwaway test database (``test_<NAME>``, never the configured
+one) with 10k, 100k and 1M processes, three parties each, plus one
+process with many parties. At every size, each scenario goes through
+the full middleware stack as a logged-in superuser and records:
+
+- ``p50_ms`` / ``p95_ms``: wall time, streamed bodies included;
+- ``queries``: SQL statements of one request.
+
+Results are written as JSON. With ``--baseline`` they are compared to a
+previous run and the script exits with status 1 when a scenario runs
+more queries than before or its p95 grows past ``--tolerance``. A
+baseline may hold query counts only, without timings; the committed
+``benchmarks/baseline.json`` does, since timings depend on the machine.
+
+Seeding goes through the ``seed_processes`` command, which requires
+``factory_boy`` (``requirements-dev.txt``); the seeded database can be
+reused between runs with ``--keepdb``.
+
+Usage:
+    python scripts/benchmark_views.py --save-baseline benchmarks/baseline.json
+    python scripts/benchmark_views.py --sizes 10000 100000 --keepdb \\
+        --output benchmarks/latest.json --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'legal_processes.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.cache import caches  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    CaptureQueriesContext, setup_test_environment,
+)
+from django.urls import reverse  # noqa: E402
+
+from parties.factories import PartyFactory  # noqa: E402
+from processes.factories import ProcessFactory  # noqa: E402
+from processes.models import Process  # noqa: E402
+
+SIZES = [10_000, 100_000, 1_000_000]
+DETAIL_PARTIES = 500
+
+
+def scenarios(size, detail_pk):
+    """``(name, path, params, repeat divisor)`` of every measured request."""
+    deep_page = size // 20 // 2 or 1
+    return [
+        ('home', reverse('home'), {}, 1),
+        ('process_list', reverse('processes:process_list'), {}, 1),
+        ('process_list_search', reverse('processes:process_list'),
+         {'search': 'Roberto'}, 1),
+        ('process_list_status', reverse('processes:process_list'),
+         {'status': 'suspended'}, 1),
+        ('process_list_search_status', reverse('processes:process_list'),
+         {'search': '0042', 'status': 'active'}, 1),
+        ('process_list_deep_page', reverse('processes:process_list'),
+         {'page': deep_page}, 1),
+        ('party_list', reverse('parties:party_list'), {}, 1),
+        ('party_list_deep_page', reverse('parties:party_list'),
+         {'page': deep_page}, 1),
+        ('process_detail', reverse('processes:process_detail', args=[detail_pk]),
+         {}, 1),
+        # Exports every row: far fewer rounds.
+        ('export_processes', reverse('processes:export_processes'), {}, 20),
+    ]
+
+
+def detail_process():
+    """The process with many parties shown by the detail scenario."""
+    process = Process.objects.filter(subject_ref__name='Benchmark').first()
+    if process is None:
+        process = ProcessFactory(subject='Benchmark')
+        PartyFactory.create_bulk([process], DETAIL_PARTIES)
+    return process.pk
+
+
+def measure(client, path, params, repeat):
+    """Return the timings in milliseconds and the query count of one request."""
+    timings, queries = [], 0
+    # The first round fills the template, permission and row caches.
+    for _ in range(repeat + 1):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = client.get(path, params)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            timings.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            raise SystemExit(f'{path} {params}: HTTP {response.status_code}')
+        queries = len(captured)
+    timings = timings[1:]
+    return {
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(
+            statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0],
+            2,
+        ),
+        'queries': queries,
+    }
+
+
+def run(sizes, repeat):
+    """Seed each size in turn and measure every scenario."""
+    user = User.objects.filter(username='benchmark').first() or \
+        User.objects.create_superuser(username='benchmark', password=None)
+    client = Client()
+    client.force_login(user)
+    detail_pk = detail_process()
+    results = {}
+    for size in sorted(sizes):
+        print(f'seeding {size} processes', file=sys.stderr)
+        call_command('seed_processes', size, stdout=sys.stderr)
+        caches[settings.LIST_FRAGMENT_CACHE_ALIAS].clear()
+        results[str(size)] = {}
+        for name, path, params, divisor in scenarios(size, detail_pk):
+            result = measure(client, path, params, max(1, repeat // divisor))
+            results[str(size)][name] = result
+            print(f"{size:>9} {name:<28}{result['p50_ms']:>10.2f}"
+                  f"{result['p95_ms']:>10.2f}{result['queries']:>6}")
+    return results
+
+
+def regressions(results, baseline, tolerance):
+    """Describe every scenario that got slower or chattier than the baseline."""
+    found = []
+    for size, measured in results.items():
+        for name, result in measured.items():
+            expected = baseline.get(size, {}).get(name)
+            if expected is None:
+                continue
+            if result['queries'] > expected['queries']:
+                found.append(f"{size} {name}: {result['queries']} queries "
+                             f"(baseline {expected['queries']})")
+            if 'p95_ms' not in expected:
+                continue
+            if result['p95_ms'] > expected['p95_ms'] * (1 + tolerance):
+                found.append(f"{size} {name}: p95 {result['p95_ms']} ms "
+                             f"(baseline {expected['p95_ms']} ms)")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='fail on regressions against this JSON file')
+    parser.add_argument('--save-baseline', metavar='PATH',
+                        help='write the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed p95 growth over the baseline (default 0.25)')
+    parser.add_argument('--keepdb', action='store_true',
+                        help='reuse the seeded benchmark database')
+    args = parser.parse_args()
+    if args.baseline and not os.path.exists(args.baseline):
+        parser.error(f'no baseline at {args.baseline}; record one with --save-baseline')
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    try:
+        results = run(args.sizes, args.repeat)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=args.keepdb)
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for line in found:
+            print(f'REGRESSION {line}', file=sys.stderr)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Build the Font Awesome subset served from ``static/vendor/fontawesome``.
+
+Scans the templates for ``fa-*`` classes and writes a stylesheet with
+only those icons, plus web fonts cut down to their glyphs. Rerun after
+using a new icon in a template.
+
+Requires the development dependencies ``fontawesomefree`` (the source
+of the full CSS and fonts) and ``fonttools`` with ``brotli``.
+
+Usage:
+    python scripts/build_fontawesome_subset.py
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+from fontTools import subset
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+OUTPUT_DIR = BASE_DIR / 'static' / 'vendor' / 'fontawesome'
+TEMPLATE_GLOBS = ['templates/**/*.html', '*/templates/**/*.html']
+
+# Style class -> (stylesheet declaring its @font-face, font file stem)
+STYLES = {
+    'fas': ('solid.css', 'fa-solid-900'),
+    'far': ('regular.css', 'fa-regular-400'),
+    'fab': ('brands.css', 'fa-brands-400'),
+}
+STYLE_ALIASES = {'fa-solid': 'fas', 'fa-regular': 'far', 'fa-brands': 'fab'}
+
+ICON_RULE = re.compile(
+    r'\.fa-([a-z0-9-]+)::before\s*\{\s*content:\s*"\\([0-9a-f]+)";\s*\}\s*'
+)
+CLASS_NAME = re.compile(r'\bfa[srb]?(?:-[a-z0-9]+)+\b|\bfa[srb]\b')
+
+
+def default_source():
+    import fontawesomefree
+    return Path(fontawesomefree.__file__).parent / 'static' / 'fontawesomefree'
+
+
+def used_classes():
+    """Return the Font Awesome classes found in the templates."""
+    classes = set()
+    for pattern in TEMPLATE_GLOBS:
+        for path in BASE_DIR.glob(pattern):
+            classes.update(CLASS_NAME.findall(path.read_text(encoding='utf-8')))
+    return classes
+
+
+def minify(css):
+    """Drop comments and collapse whitespace, keeping the first license."""
+    license = re.search(r'/\*!.*?\*/', css, flags=re.S)
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};:,>])\s*', r'\1', css)
+    css = css.replace(';}', '}').strip()
+    return f'{license.group(0)}\n{css}' if license else css
+
+
+def build(source, output):
+    classes = used_classes()
+    styles = {STYLE_ALIASES.get(name, name) for name in classes} & set(STYLES)
+
+    core = (source / 'css' / 'fontawesome.css').read_text(encoding='utf-8')
+    icons = {name: code for name, code in ICON_RULE.findall(core)}
+    # Icon rules only for the icons in use; keep every other core rule.
+    core = ICON_RULE.sub('', core)
+    names = sorted(name for name in (c[3:] for c in classes) if name in icons)
+    codepoints = sorted({int(icons[name], 16) for name in names})
+
+    parts = [core]
+    (output / 'webfonts').mkdir(parents=True, exist_ok=True)
+    for style in sorted(styles):
+        stylesheet, stem = STYLES[style]
+        css = (source / 'css' / stylesheet).read_text(encoding='utf-8')
+        # Only the subset woff2 is shipped.
+        css = re.sub(r'src:[^;]*;', f'src:url("../webfonts/{stem}.woff2") format("woff2");', css)
+        parts.append(css)
+
+        options = subset.Options()
+        options.flavor = 'woff2'
+        options.layout_features = ['*']
+        font = subset.load_font(str(source / 'webfonts' / f'{stem}.ttf'), options)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        subset.save_font(font, str(output / 'webfonts' / f'{stem}.woff2'), options)
+
+    parts.extend(f'.fa-{name}::before{{content:"\\{icons[name]}"}}' for name in names)
+    (output / 'css').mkdir(parents=True, exist_ok=True)
+    (output / 'css' / 'fontawesome-subset.min.css').write_text(
+        minify('\n'.join(parts)) + '\n', encoding='utf-8'
+    )
+    return names, styles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--source', type=Path, help='Font Awesome Free directory')
+    parser.add_argument('--output', type=Path, default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    names, styles = build(args.source or default_source(), args.output)
+    print(f"{len(names)} icons, styles: {', '.join(sorted(styles))}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
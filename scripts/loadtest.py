@@ -0,0 +1,322 @@
+"""
+HTTP load test for a running site, optionally across a gunicorn matrix.
+
+Virtual users log in with the accounts from ``scripts/create_users.py``
+(``admin`` writes, ``usuario`` only reads) and replay a weighted mix of
+home, list, search, detail, create/update and export requests, each
+followed by ``--think`` seconds of pause. The report shows throughput
+and p50/p95/p99 latency per request kind.
+
+With ``--matrix`` the script drives ``docker-compose.loadtest.yml``
+(nginx, gunicorn and PostgreSQL): for every combination of
+``--workers``, ``--worker-classes`` and ``--conn-max-age`` it recreates
+the ``web`` service, waits for it and runs the same load through nginx.
+
+Requires ``httpx`` (``requirements-dev.txt``).
+
+Usage:
+    python scripts/loadtest.py --url http://localhost:8000 --users 20 --duration 60
+    python scripts/loadtest.py --matrix --workers 2 4 8 \\
+        --worker-classes sync gthread uvicorn --conn-max-age 0 60 \\
+        --output loadtest.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import re
+import statistics
+import subprocess
+import time
+from collections import defaultdict
+
+import httpx
+
+ACCOUNTS = {
+    'admin': ('admin', 'admin123'),
+    'usuario': ('usuario', 'usuario123'),
+}
+
+# Request kind -> weight. Readers skip the kinds in WRITES.
+MIX = {
+    'home': 15,
+    'list': 30,
+    'search': 15,
+    'detail': 25,
+    'create': 3,
+    'update': 5,
+    'export': 2,
+}
+WRITES = {'create', 'update'}
+SEARCH_TERMS = ['Mariana', 'Locação', '2016', '0001', 'Execução']
+
+WORKER_CLASSES = {
+    'sync': ('legal_processes.wsgi:application', 'sync'),
+    'gthread': ('legal_processes.wsgi:application', 'gthread'),
+    'uvicorn': ('legal_processes.asgi:application', 'uvicorn.workers.UvicornWorker'),
+}
+COMPOSE = ['docker', 'compose', '-f', 'docker-compose.loadtest.yml']
+
+CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+DETAIL_LINK = re.compile(r'/processes/(\d+)/"')
+
+
+class VirtualUser:
+    """One logged-in session replaying the request mix."""
+
+    def __init__(self, client, username, stats):
+        self.client = client
+        self.writer = username == 'admin'
+        self.stats = stats
+        self.process_ids = []
+        self.created = []
+        kinds = [kind for kind in MIX if self.writer or kind not in WRITES]
+        self.kinds = kinds
+        self.weights = [MIX[kind] for kind in kinds]
+
+    async def request(self, kind, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.stats[kind]['errors'] += 1
+            return None
+        self.stats[kind]['timings'].append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            self.stats[kind]['errors'] += 1
+        return response
+
+    async def csrf_token(self, url):
+        response = await self.client.get(url)
+        match = CSRF_INPUT.search(response.text)
+        return match.group(1) if match else ''
+
+    async def login(self, username, password):
+        token = await self.csrf_token('/accounts/login/')
+        response = await self.client.post('/accounts/login/', data={
+            'username': username,
+            'password': password,
+            'csrfmiddlewaretoken': token,
+        })
+        if response.status_code != 302:
+            raise SystemExit(f'Login failed for {username}: HTTP {response.status_code}')
+
+    def process_form(self, token):
+        return {
+            'csrfmiddlewaretoken': token,
+            'process_number': f'{random.randrange(10**7):07d}-'
+                              f'{random.randrange(100):02d}.2024.8.26.0001',
+            'status': 'active',
+            'process_type': 'digital',
+            'process_class': 'Procedimento Comum',
+            'subject': 'Contratos',
+            'judge': random.choice(['Mariana', 'Roberto', 'Helena']),
+            'action_value': f'{random.randrange(100, 100000)}.00',
+        }
+
+    async def run_one(self, kind):
+        if kind == 'home':
+            await self.request(kind, 'GET', '/')
+        elif kind == 'list':
+            response = await self.request(
+                kind, 'GET', '/processes/', params={'page': random.randint(1, 5)}
+            )
+            if response is not None:
+                self.process_ids = DETAIL_LINK.findall(response.text) or self.process_ids
+        elif kind == 'search':
+            await self.request(
+                kind, 'GET', '/processes/', params={'search': random.choice(SEARCH_TERMS)}
+            )
+        elif kind == 'detail' and self.process_ids:
+            await self.request(kind, 'GET', f'/processes/{random.choice(self.process_ids)}/')
+        elif kind == 'create':
+            token = await self.csrf_token('/processes/create/')
+            form = self.process_form(token)
+            response = await self.request(kind, 'POST', '/processes/create/', data=form)
+            match = response is not None and re.search(
+                r'/processes/(\d+)/', response.headers.get('location', '')
+            )
+            if match:
+                self.created.append((match.group(1), form['process_number']))
+        elif kind == 'update' and self.created:
+            # Only processes this session created, so sessions never collide.
+            pk, number = random.choice(self.created)
+            token = await self.csrf_token(f'/processes/{pk}/update/')
+            form = dict(self.process_form(token), process_number=number)
+            await self.request(kind, 'POST', f'/processes/{pk}/update/', data=form)
+        elif kind == 'export':
+            await self.request(
+                kind, 'GET', '/processes/export/',
+                params={'search': random.choice(SEARCH_TERMS)},
+            )
+
+    async def run(self, deadline, think):
+        while time.monotonic() < deadline:
+            await self.run_one(random.choices(self.kinds, self.weights)[0])
+            if think:
+                await asyncio.sleep(random.uniform(0, 2 * think))
+
+
+async def run_load(url, users, duration, think, writers):
+    """Run ``users`` sessions against ``url`` for ``duration`` seconds."""
+    stats = defaultdict(lambda: {'timings': [], 'errors': 0})
+    limits = httpx.Limits(max_connections=users)
+    clients = [
+        httpx.AsyncClient(base_url=url, limits=limits, timeout=60)
+        for _ in range(users)
+    ]
+    try:
+        sessions = []
+        for i, client in enumerate(clients):
+            username, password = ACCOUNTS['admin' if i < writers else 'usuario']
+            session = VirtualUser(client, username, stats)
+            await session.login(username, password)
+            sessions.append(session)
+        start = time.monotonic()
+        await asyncio.gather(*(
+            session.run(start + duration, think) for session in sessions
+        ))
+        elapsed = time.monotonic() - start
+    finally:
+        await asyncio.gather(*(client.aclose() for client in clients))
+    return summarize(stats, elapsed)
+
+
+def percentiles(timings):
+    if len(timings) < 2:
+        value = round(timings[0], 2) if timings else None
+        return {'p50_ms': value, 'p95_ms': value, 'p99_ms': value}
+    cuts = statistics.quantiles(timings, n=100)
+    return {
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(cuts[94], 2),
+        'p99_ms': round(cuts[98], 2),
+    }
+
+
+def summarize(stats, elapsed):
+    """Throughput and latency percentiles per request kind and overall."""
+    everything = [t for kind in stats.values() for t in kind['timings']]
+    summary = {'total': {
+        'requests': len(everything),
+        'rps': round(len(everything) / elapsed, 1),
+        'errors': sum(kind['errors'] for kind in stats.values()),
+        **percentiles(everything),
+    }}
+    for name, kind in sorted(stats.items()):
+        summary[name] = {
+            'requests': len(kind['timings']),
+            'rps': round(len(kind['timings']) / elapsed, 1),
+            'errors': kind['errors'],
+            **percentiles(kind['timings']),
+        }
+    return summary
+
+
+def print_summary(summary, title=''):
+    if title:
+        print(f'\n{title}')
+    print(f"{'kind':<10}{'requests':>10}{'rps':>8}{'errors':>8}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, row in summary.items():
+        print(f"{name:<10}{row['requests']:>10}{row['rps']:>8}{row['errors']:>8}"
+              f"{row['p50_ms'] or 0:>10.1f}{row['p95_ms'] or 0:>10.1f}"
+              f"{row['p99_ms'] or 0:>10.1f}")
+
+
+def start_stack(workers, worker_class, conn_max_age, threads):
+    """(Re)create the load-test ``web`` service with one matrix combination."""
+    app, gunicorn_class = WORKER_CLASSES[worker_class]
+    env = dict(
+        os.environ,
+        GUNICORN_APP=app,
+        GUNICORN_WORKERS=str(workers),
+        GUNICORN_WORKER_CLASS=gunicorn_class,
+        GUNICORN_THREADS=str(threads if worker_class == 'gthread' else 1),
+        CONN_MAX_AGE=str(conn_max_age),
+    )
+    subprocess.run(
+        COMPOSE + ['up', '-d', '--force-recreate', '--no-deps', 'web'],
+        env=env, check=True,
+    )
+    subprocess.run(COMPOSE + ['up', '-d', 'nginx'], env=env, check=True)
+
+
+def wait_for(url, timeout=180):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f'{url}/accounts/login/', timeout=5).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(2)
+    raise SystemExit(f'{url} did not come up within {timeout}s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', default='http://localhost:8080')
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--writers', type=int, default=2,
+                        help='sessions logged in as admin (the rest as usuario)')
+    parser.add_argument('--duration', type=int, default=60, help='seconds per run')
+    parser.add_argument('--think', type=float, default=0.5,
+                        help='mean pause between requests of one user, in seconds')
+    parser.add_argument('--matrix', action='store_true',
+                        help='recreate the docker-compose.loadtest.yml stack per combination')
+    parser.add_argument('--workers', type=int, nargs='+', default=[4])
+    parser.add_argument('--worker-classes', nargs='+', default=['sync'],
+                        choices=sorted(WORKER_CLASSES))
+    parser.add_argument('--threads', type=int, default=4, help='threads per gthread worker')
+    parser.add_argument('--conn-max-age', type=int, nargs='+', default=[0])
+    parser.add_argument('--output', help='write the results to this JSON file')
+    args = parser.parse_args()
+
+    results = []
+    if not args.matrix:
+        summary = asyncio.run(run_load(
+            args.url, args.users, args.duration, args.think, args.writers
+        ))
+        print_summary(summary)
+        results.append({'url': args.url, 'summary': summary})
+    else:
+        # Run from the project root, where the compose file lives.
+        os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        subprocess.run(COMPOSE + ['up', '-d', 'db'], check=True)
+        for workers, worker_class, conn_max_age in itertools.product(
+            args.workers, args.worker_classes, args.conn_max_age
+        ):
+            start_stack(workers, worker_class, conn_max_age, args.threads)
+            wait_for(args.url)
+            summary = asyncio.run(run_load(
+                args.url, args.users, args.duration, args.think, args.writers
+            ))
+            print_summary(summary, f'workers={workers} class={worker_class} '
+                                   f'CONN_MAX_AGE={conn_max_age}')
+            results.append({
+                'workers': workers,
+                'worker_class': worker_class,
+                'conn_max_age': conn_max_age,
+                'summary': summary,
+            })
+        print(f"\n{'workers':>8} {'class':<9}{'conn age':>9}{'rps':>8}"
+              f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        for result in results:
+            total = result['summary']['total']
+            print(f"{result['workers']:>8} {result['worker_class']:<9}"
+                  f"{result['conn_max_age']:>9}{total['rps']:>8}"
+                  f"{total['p50_ms'] or 0:>9.1f}{total['p95_ms'] or 0:>9.1f}"
+                  f"{total['p99_ms'] or 0:>9.1f}{total['errors']:>8}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -29,7 +29,8 @@ if Party.objects.exists():  # type: ignore
     print('Já existem partes cadastradas. Nada foi feito.')
     exit(0)
 
-processos = list(Process.objects.all())  # type: ignore
+# Só as chaves: sortear o processo não exige carregar as linhas.
+processos = list(Process.objects.values_list('pk', flat=True))  # type: ignore
 if not processos:
     print('Nenhum processo encontrado. Execute o script de processos antes.')
     exit(1)
@@ -41,6 +42,6 @@ for _ in range(60):
         category=choice(PARTY_CATEGORY_CHOICES),
         email=fake.email(),
         phone=fake.phone_number(),
-        process=choice(processos),
+        process_id=choice(processos),
     )
 print('60 partes criadas com sucesso!') 
\ No newline at end of file